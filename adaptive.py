@@ -0,0 +1,138 @@
+"""Probe each interface at its own interval, adapted to its link state."""
+import heapq
+import time
+from itertools import count
+from threading import Lock
+
+
+class ProbeState:
+    """Probing interval of an interface."""
+
+    __slots__ = ('interval', 'next_probe', 'linked')
+
+    def __init__(self, interval, next_probe):
+        """Create a state to be probed at ``next_probe``."""
+        self.interval = interval
+        self.next_probe = next_probe
+        #: Whether an LLDP packet was received since the last probe.
+        self.linked = False
+
+
+class ProbeScheduler:
+    """Decide which interfaces are due for an LLDP probe.
+
+    New interfaces and interfaces whose port status changed are probed at
+    once and then after ``min_interval`` seconds. After each probe the
+    interval grows ``backoff`` times, up to ``max_interval`` if an LLDP packet
+    was received on the interface since the previous probe, i.e. it has a
+    link, or up to ``edge_interval`` otherwise.
+
+    The next probes are kept in a heap, so each call to :meth:`due` only
+    handles the interfaces that are due. As in the link liveness tracker, a
+    rescheduled probe leaves its old entry in the heap, skipped when popped.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, min_interval, max_interval, edge_interval, backoff=2):
+        """Create a scheduler.
+
+        Args:
+            min_interval (float): Seconds between probes of new or changed
+                interfaces.
+            max_interval (float): Maximum seconds between probes of an
+                interface with a link.
+            edge_interval (float): Maximum seconds between probes of an
+                interface without a link.
+            backoff (float): Factor applied to the interval after each probe.
+
+        Raises:
+            ValueError: If the intervals or the backoff are invalid.
+
+        """
+        if not 0 < min_interval <= min(max_interval, edge_interval):
+            raise ValueError('invalid probe intervals, the minimum must be '
+                             'greater than zero and not exceed the others')
+        if backoff < 1:
+            raise ValueError(f'invalid backoff {backoff}, must be at least 1')
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.edge_interval = edge_interval
+        self.backoff = backoff
+        self._states = {}
+        self._probes = []
+        self._order = count()
+        self._lock = Lock()
+
+    def _schedule(self, interface_id, state):
+        """Push the next probe of an interface, holding the lock."""
+        heapq.heappush(self._probes, (state.next_probe, next(self._order),
+                                      interface_id, state))
+
+    def due(self, get_target, added=(), now=None):
+        """Return the targets to be probed now and schedule their next probe.
+
+        Interfaces that are no longer eligible when their probe is due are
+        forgotten, and those ``added`` to the eligible set start with fast
+        probes again.
+
+        Args:
+            get_target (callable): Return the ``(switch, interface,
+                of_version)`` target of an eligible interface id, or None.
+            added (iterable): Ids of the interfaces that became eligible.
+
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        with self._lock:
+            for interface_id in added:
+                state = self._states[interface_id] = ProbeState(
+                    self.min_interval, now)
+                self._schedule(interface_id, state)
+            while self._probes and self._probes[0][0] <= now:
+                next_probe, _, interface_id, state = heapq.heappop(
+                    self._probes)
+                # Skip the probes of states replaced or rescheduled.
+                if (self._states.get(interface_id) is not state
+                        or state.next_probe != next_probe):
+                    continue
+                target = get_target(interface_id)
+                if target is None:
+                    del self._states[interface_id]
+                    continue
+                due.append(target)
+                state.next_probe = now + state.interval
+                limit = (self.max_interval if state.linked
+                         else self.edge_interval)
+                state.interval = min(state.interval * self.backoff, limit)
+                state.linked = False
+                self._schedule(interface_id, state)
+        return due
+
+    def seen(self, interface_id):
+        """Record that an LLDP packet of a link was received."""
+        state = self._states.get(interface_id)
+        if state is not None:
+            state.linked = True
+
+    def reset(self, interface_id, now=None):
+        """Probe an interface every ``min_interval`` seconds again.
+
+        The next probe is ``min_interval`` seconds from now, since a changed
+        interface is also probed at once by the NApp.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._states.get(interface_id)
+            if state is not None:
+                state.interval = self.min_interval
+                state.next_probe = now + self.min_interval
+                state.linked = False
+                self._schedule(interface_id, state)
+
+    def get_interval(self, interface_id):
+        """Return the current probing interval of an interface, or None."""
+        state = self._states.get(interface_id)
+        return state.interval if state is not None else None
+
+    def __len__(self):
+        return len(self._states)
@@ -0,0 +1,72 @@
+"""Throttle the LLDP PacketOuts while the controller is saturated."""
+import struct
+
+try:
+    import fcntl
+    import termios
+except ImportError:  # Not available on Windows.
+    fcntl = termios = None
+
+#: ioctl that returns the bytes in the send queue of a socket, on Linux.
+SIOCOUTQ = getattr(termios, 'TIOCOUTQ', None)
+
+
+def get_queue_depth(buffer):
+    """Return the number of events waiting in a buffer, or None."""
+    try:
+        return buffer.qsize()
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def get_write_buffer_size(connection):
+    """Return the bytes not yet sent by a connection, or None.
+
+    kytos.core writes the messages straight to the ``socket`` of the
+    connection, so this is the send queue of the socket, the bytes the switch
+    has not received yet. It is read with the ``SIOCOUTQ`` ioctl, so it is
+    only available on Linux.
+    """
+    sock = getattr(connection, 'socket', None)
+    if sock is None or SIOCOUTQ is None:
+        return None
+    try:
+        result = fcntl.ioctl(sock.fileno(), SIOCOUTQ, bytes(4))
+    except (AttributeError, OSError, TypeError, ValueError):
+        return None
+    return struct.unpack('i', result)[0]
+
+
+class Backpressure:
+    """Decide how many LLDP PacketOuts to send from the msg_out depth.
+
+    Throttling starts when the depth reaches the ``high`` watermark and
+    stops when it falls to the ``low`` one, so it does not flap around a
+    single threshold. While throttled, the PacketOuts of an execution are
+    limited to the room left below the high watermark, so none are sent
+    while the depth is above it.
+    """
+
+    def __init__(self, high, low):
+        """Create a backpressure state that is not throttled.
+
+        Raises:
+            ValueError: If the watermarks are invalid.
+
+        """
+        if not 0 <= low < high:
+            raise ValueError(f'invalid watermarks {high} and {low}, the low '
+                             'one must be lower than the high one')
+        self.high = high
+        self.low = low
+        self.throttled = False
+
+    def budget(self, depth):
+        """Return the PacketOuts allowed at a depth, or None for no limit."""
+        if depth >= self.high:
+            self.throttled = True
+        elif depth <= self.low:
+            self.throttled = False
+        if not self.throttled:
+            return None
+        return max(self.high - depth, 0)
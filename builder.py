@@ -0,0 +1,327 @@
+"""Build LLDP PacketOut messages from pre-packed byte templates."""
+import itertools
+import random
+import struct
+
+from pyof.foundation.basic_types import DPID, UBInt16, UBInt32
+from pyof.foundation.network_types import LLDP, VLAN, Ethernet, EtherType
+from pyof.v0x01.common.action import ActionOutput as AO10
+from pyof.v0x01.controller2switch.packet_out import PacketOut as PO10
+from pyof.v0x04.common.action import ActionOutput as AO13
+from pyof.v0x04.controller2switch.packet_out import PacketOut as PO13
+
+from kytos.core import log
+from napps.kytos.of_lldp import constants
+from napps.kytos.of_lldp.linkstats import monotonic_ns
+
+#: Format of the port number for each supported OpenFlow version.
+PORT_FORMATS = {0x01: '!H', 0x04: '!I'}
+
+#: Ethernet header (destination and source) length.
+ETH_ADDRESSES_LEN = 12
+#: Length of the 802.1Q tag added when a VLAN is used.
+VLAN_TAG_LEN = 4
+#: Offset of the DPID inside the LLDP data (chassis TLV header + subtype).
+LLDP_DPID_OFFSET = 3
+#: Offset of the port number inside the LLDP data.
+LLDP_PORT_OFFSET = 14
+#: Offset of the port inside an ActionOutput.
+ACTION_PORT_OFFSET = 4
+#: Length of the End of LLDPDU TLV.
+END_TLV_LEN = 2
+#: Organizationally specific TLV with the send time, in nanoseconds of the
+#: controller monotonic clock, and the sequence number of a probe.
+PROBE_TLV = struct.Struct('!H3sBQI')
+#: Header of the probe TLV: type 127 and length of the OUI, subtype and value.
+PROBE_TLV_HEADER = 127 << 9 | PROBE_TLV.size - 2
+#: Send time and sequence number, at offset 6 of the probe TLV.
+PROBE_VALUE = struct.Struct('!QI')
+PROBE_VALUE_OFFSET = 6
+#: Transaction id of the OpenFlow header, at the same offset in every version.
+XID = struct.Struct('!I')
+XID_OFFSET = 4
+
+# Transaction ids of the PacketOuts, starting at a random one as pyof does.
+_XIDS = itertools.count(random.randint(0, 0xffffffff))
+
+
+def next_xid():
+    """Return the transaction id of the next PacketOut, up to 32 bits."""
+    return next(_XIDS) & 0xffffffff
+
+
+class PackedHeader:
+    """OpenFlow header of a :class:`PackedPacketOut`.
+
+    It has the fields of the pyof header read by kytos.core, so the header of
+    the template is not shared by every message.
+    """
+
+    __slots__ = ('version', 'message_type', 'length', 'xid')
+
+    def __init__(self, header):
+        """Copy the fields of another header."""
+        self.version = header.version
+        self.message_type = header.message_type
+        self.length = header.length
+        self.xid = header.xid
+
+
+class PackedPacketOut:
+    """PacketOut message whose binary representation is already known.
+
+    kytos.core only calls ``pack()`` and reads ``header`` from the messages
+    put in the msg_out buffer, so the bytes of a PacketOut can be sent
+    without building the pyof objects. Each ``pack()`` writes a new
+    transaction id, so the messages built from a template or sent again from
+    the cache can be told apart. kytos.core packs a message right before
+    sending it, so the send time of a probe is written there too.
+    """
+
+    __slots__ = ('header', '_data', 'probe_offset', 'sequence')
+
+    def __init__(self, header, data, probe_offset=None, sequence=None):
+        """Store the message header and its packed bytes.
+
+        Args:
+            header (:class:`~pyof.v0x04.common.header.Header`): Header of the
+                PacketOut, used by kytos.core when logging.
+            data (bytes): Packed PacketOut message.
+            probe_offset (int): Offset of the send time and sequence number
+                of the probe TLV, or None if the message has no probe TLV.
+            sequence (int): Sequence number of the probe, written with the
+                send time by :meth:`pack`, or None to leave the probe TLV as
+                it is.
+
+        """
+        self.header = PackedHeader(header)
+        self._data = data
+        self.probe_offset = probe_offset
+        self.sequence = sequence
+
+    def pack(self):
+        """Return the packed message with a new transaction id.
+
+        If the message has a probe sequence number, the current time is
+        written with it as the send time of the probe.
+        """
+        self.header.xid = next_xid()
+        data = bytearray(self._data)
+        XID.pack_into(data, XID_OFFSET, self.header.xid)
+        if self.sequence is not None:
+            PROBE_VALUE.pack_into(data, self.probe_offset, monotonic_ns(),
+                                  self.sequence)
+        return bytes(data)
+
+    def stamp(self, sequence):
+        """Return a copy of the message with a probe sequence number.
+
+        Args:
+            sequence (int): Sequence number of the probe, up to 32 bits.
+
+        """
+        return PackedPacketOut(self.header, self._data, self.probe_offset,
+                               sequence & 0xffffffff)
+
+    def __len__(self):
+        return len(self._data)
+
+
+def build_lldp_packet_out(version, port_number, data):
+    """Build a LLDP PacketOut message.
+
+    Args:
+        version (int): OpenFlow version
+        port_number (int): Switch port number where the packet must be
+            forwarded to.
+        data (bytes): Binary data to be sent through the port.
+
+    Returns:
+        PacketOut message for the specific given OpenFlow version, if it
+            is supported.
+        None if the OpenFlow version is not supported.
+
+    """
+    if version == 0x01:
+        action_output_class = AO10
+        packet_out_class = PO10
+    elif version == 0x04:
+        action_output_class = AO13
+        packet_out_class = PO13
+    else:
+        log.info('Openflow version %s is not yet supported.', version)
+        return None
+
+    output_action = action_output_class()
+    output_action.port = port_number
+
+    packet_out = packet_out_class()
+    packet_out.data = data
+    packet_out.actions.append(output_action)
+
+    return packet_out
+
+
+def pack_probe_tlv(timestamp=0, sequence=0):
+    """Return the packed probe TLV with a send time and sequence number."""
+    return PROBE_TLV.pack(PROBE_TLV_HEADER, constants.LLDP_PROBE_TLV_OUI,
+                          constants.LLDP_PROBE_TLV_SUBTYPE, timestamp,
+                          sequence)
+
+
+# pylint: disable=too-many-arguments
+def pack_lldp_packet_out(version, vlan_id, dpid, port_number, address,
+                         xid=None, probe=None):
+    """Build a LLDP PacketOut using python-openflow objects.
+
+    This is the reference implementation used to create the templates of
+    :class:`LLDPFrameBuilder`. If ``probe`` is a ``(timestamp, sequence)``
+    tuple, the probe TLV is added before the End of LLDPDU TLV.
+
+    Returns:
+        PacketOut message, or None if the OpenFlow version is not supported.
+
+    """
+    port_type = UBInt16 if version == 0x01 else UBInt32
+
+    lldp = LLDP()
+    lldp.chassis_id.sub_value = DPID(dpid)
+    lldp.port_id.sub_value = port_type(port_number)
+
+    ethernet = Ethernet()
+    ethernet.ether_type = EtherType.LLDP
+    ethernet.source = address
+    ethernet.destination = constants.LLDP_MULTICAST_MAC
+    ethernet.data = lldp.pack()
+    if probe is not None:
+        ethernet.data = (ethernet.data[:-END_TLV_LEN] + pack_probe_tlv(*probe)
+                         + ethernet.data[-END_TLV_LEN:])
+    # vlan_id == None will result in a packet with no VLAN.
+    ethernet.vlans.append(VLAN(vid=vlan_id))
+
+    packet_out = build_lldp_packet_out(version, port_number, ethernet.pack())
+    if packet_out is not None and xid is not None:
+        packet_out.header.xid = xid
+    return packet_out
+
+
+class LLDPFrameTemplate:
+    """Packed LLDP PacketOut of one OpenFlow version and VLAN setting.
+
+    Every LLDP PacketOut sent by this NApp has the same layout. Only the
+    output port, the source MAC address, the DPID and the port number of the
+    LLDP data change between ports, so they are written in a copy of the
+    template at fixed offsets.
+    """
+
+    __slots__ = ('header', '_template', '_port_format', '_action_port',
+                 '_source', '_dpid', '_lldp_port', 'probe_offset')
+
+    def __init__(self, version, vlan_id, probe=False):
+        """Pack the template of a given OpenFlow version and VLAN id.
+
+        Args:
+            version (int): OpenFlow version.
+            vlan_id (int): VLAN of the LLDP packets, or None.
+            probe (bool): Whether to add the probe TLV, whose sequence number
+                is set by :meth:`PackedPacketOut.stamp` and send time by
+                :meth:`PackedPacketOut.pack`.
+
+        Raises:
+            ValueError: If the OpenFlow version is not supported.
+
+        """
+        packet_out = pack_lldp_packet_out(version, vlan_id,
+                                          '00:00:00:00:00:00:00:00', 0,
+                                          '00:00:00:00:00:00',
+                                          probe=(0, 0) if probe else None)
+        if packet_out is None:
+            raise ValueError(f'Unsupported OpenFlow version {version}')
+        self.header = packet_out.header
+        self._template = packet_out.pack()
+        self._port_format = PORT_FORMATS[version]
+
+        data_offset = len(self._template) - len(packet_out.data)
+        action_offset = data_offset - packet_out.actions[0].get_size()
+        lldp_offset = data_offset + ETH_ADDRESSES_LEN + 2
+        if vlan_id is not None:
+            lldp_offset += VLAN_TAG_LEN
+
+        self._action_port = action_offset + ACTION_PORT_OFFSET
+        self._source = data_offset + 6
+        self._dpid = lldp_offset + LLDP_DPID_OFFSET
+        self._lldp_port = lldp_offset + LLDP_PORT_OFFSET
+        self.probe_offset = None
+        if probe:
+            self.probe_offset = (len(self._template) - END_TLV_LEN -
+                                 PROBE_TLV.size + PROBE_VALUE_OFFSET)
+
+    def pack(self, dpid, port_number, address):
+        """Return the packed PacketOut for a given switch port.
+
+        Args:
+            dpid (str): Switch datapath id, e.g. '00:00:00:00:00:00:00:01'.
+            port_number (int): Port where the LLDP packet will be sent.
+            address (str): MAC address of the port. The source address is
+                left zeroed if it is None, as python-openflow does.
+
+        """
+        frame = bytearray(self._template)
+        struct.pack_into(self._port_format, frame, self._action_port,
+                         port_number)
+        struct.pack_into(self._port_format, frame, self._lldp_port,
+                         port_number)
+        if address:
+            frame[self._source:self._source + 6] = bytes.fromhex(
+                address.replace(':', ''))
+        frame[self._dpid:self._dpid + 8] = bytes.fromhex(
+            dpid.replace(':', ''))
+        return bytes(frame)
+
+
+class LLDPFrameBuilder:
+    """Build LLDP PacketOut messages reusing one template per setting."""
+
+    def __init__(self, probe=False):
+        """Create a builder without templates.
+
+        Args:
+            probe (bool): Whether the LLDP packets carry the probe TLV.
+
+        """
+        self.probe = probe
+        self._templates = {}
+
+    def get_template(self, version, vlan_id):
+        """Return the template of an OpenFlow version and VLAN id.
+
+        Returns:
+            :class:`LLDPFrameTemplate`, or None if the OpenFlow version is not
+                supported.
+
+        """
+        key = (version, vlan_id)
+        template = self._templates.get(key)
+        if template is None:
+            if version not in PORT_FORMATS:
+                log.info('Openflow version %s is not yet supported.', version)
+                return None
+            template = self._templates[key] = LLDPFrameTemplate(
+                version, vlan_id, self.probe)
+        return template
+
+    # pylint: disable=too-many-arguments
+    def build(self, version, vlan_id, dpid, port_number, address):
+        """Build the LLDP PacketOut of a switch port.
+
+        Returns:
+            :class:`PackedPacketOut`, or None if the OpenFlow version is not
+                supported.
+
+        """
+        template = self.get_template(version, vlan_id)
+        if template is None:
+            return None
+        return PackedPacketOut(template.header,
+                               template.pack(dpid, port_number, address),
+                               template.probe_offset)
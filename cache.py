@@ -0,0 +1,68 @@
+"""Cache of packed LLDP PacketOut messages."""
+
+
+class LLDPFrameCache:
+    """Packed LLDP PacketOut messages indexed by switch port.
+
+    Each entry is stored with the values that were used to build it: the
+    interface MAC address, the VLAN id and the OpenFlow version of the switch.
+    If any of them changes the entry is considered stale and must be built
+    again, so there is no need to invalidate the cache explicitly. The
+    entries of removed ports and switches are discarded, through the port
+    numbers kept for each switch.
+    """
+
+    def __init__(self):
+        """Create an empty cache."""
+        self._frames = {}
+        #: Port numbers with an entry, by dpid.
+        self._switches = {}
+
+    # pylint: disable=too-many-arguments
+    def get(self, dpid, port_number, address, vlan_id, of_version):
+        """Return the cached PacketOut for a port, if it is still valid.
+
+        Args:
+            dpid (str): Switch datapath id.
+            port_number (int): Port where the LLDP packet will be sent.
+            address (str): MAC address of the port.
+            vlan_id (int): VLAN id of the LLDP packet, or None.
+            of_version (int): OpenFlow version negotiated with the switch.
+
+        Returns:
+            :class:`~napps.kytos.of_lldp.builder.PackedPacketOut` or None if
+                there is no valid entry.
+
+        """
+        entry = self._frames.get((dpid, port_number))
+        if entry is None or entry[0] != (address, vlan_id, of_version):
+            return None
+        return entry[1]
+
+    def put(self, dpid, port_number, address, vlan_id, of_version,
+            packet_out):
+        """Store a packed PacketOut, replacing any previous entry."""
+        self._frames[(dpid, port_number)] = ((address, vlan_id, of_version),
+                                             packet_out)
+        self._switches.setdefault(dpid, set()).add(port_number)
+
+    def discard(self, dpid, port_number=None):
+        """Remove the entries of a port or, if omitted, of a whole switch."""
+        if port_number is not None:
+            self._frames.pop((dpid, port_number), None)
+            ports = self._switches.get(dpid)
+            if ports is not None:
+                ports.discard(port_number)
+                if not ports:
+                    del self._switches[dpid]
+            return
+        for port in self._switches.pop(dpid, ()):
+            del self._frames[(dpid, port)]
+
+    def clear(self):
+        """Remove all entries."""
+        self._frames.clear()
+        self._switches.clear()
+
+    def __len__(self):
+        return len(self._frames)
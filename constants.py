@@ -2,3 +2,8 @@
 
 # Mac Address used by LLDP to multicast messages
 LLDP_MULTICAST_MAC = '01:80:c2:00:00:0e'
+
+# Organizationally specific LLDP TLV with the send time and the sequence
+# number of a probe. The OUI is a locally assigned company id.
+LLDP_PROBE_TLV_OUI = b'\x0aKY'
+LLDP_PROBE_TLV_SUBTYPE = 1
@@ -0,0 +1,163 @@
+"""Decode LLDP packets received by the controller."""
+import struct
+
+from napps.kytos.of_lldp import constants
+
+#: Offset of the ethertype in an Ethernet frame.
+ETHER_TYPE_OFFSET = 12
+#: Length of an 802.1Q tag.
+VLAN_TAG_LEN = 4
+
+
+def is_lldp_frame(data):
+    """Return whether an Ethernet frame carries LLDP, without unpacking it.
+
+    Only the ethertype bytes are read, skipping one 802.1Q tag if present,
+    so most of the PacketIns can be discarded without any allocation.
+
+    Args:
+        data (bytes): Ethernet frame.
+
+    """
+    offset = ETHER_TYPE_OFFSET
+    if len(data) < offset + 2:
+        return False
+    # 0x8100: 802.1Q tagged frame
+    if data[offset] == 0x81 and data[offset + 1] == 0x00:
+        offset += VLAN_TAG_LEN
+        if len(data) < offset + 2:
+            return False
+    # 0x88cc: LLDP
+    return data[offset] == 0x88 and data[offset + 1] == 0xcc
+
+
+#: LLDP TLV header: 7 bits of type and 9 bits of length.
+TLV_TYPE_LENGTH = struct.Struct('!H')
+#: LLDP TLV header (type and length) followed by the TLV subtype.
+TLV_HEADER = struct.Struct('!HB')
+#: Chassis id TLV carrying a DPID: header, subtype and DPID.
+CHASSIS_TLV = struct.Struct('!HBQ')
+#: Port numbers of OpenFlow 1.0 and 1.3, by LLDP port id length.
+PORT_FORMATS = {2: struct.Struct('!H'), 4: struct.Struct('!I')}
+ETHER_TYPE = struct.Struct('!H')
+#: Probe TLV after its header: OUI, subtype, send time and sequence number.
+PROBE_TLV_VALUE = struct.Struct('!3sBQI')
+
+#: TLV types and subtype used by the LLDP packets sent by this NApp.
+TLV_CHASSIS_ID = 1
+TLV_PORT_ID = 2
+TLV_END = 0
+TLV_ORGANIZATIONALLY_SPECIFIC = 127
+SUBTYPE_LOCALLY_ASSIGNED = 7
+#: Header of a chassis id TLV with a subtype and a DPID (length 9).
+CHASSIS_TLV_HEADER = TLV_CHASSIS_ID << 9 | 9
+
+
+def format_dpid(value):
+    """Return a DPID integer in the 'xx:xx:xx:xx:xx:xx:xx:xx' format."""
+    dpid = '%016x' % value
+    return ':'.join((dpid[0:2], dpid[2:4], dpid[4:6], dpid[6:8],
+                     dpid[8:10], dpid[10:12], dpid[12:14], dpid[14:16]))
+
+
+def _decode_ids(data):
+    """Return the DPID, the port number and the offset of the next TLV.
+
+    Raises:
+        struct.error: If the frame is truncated.
+
+    """
+    offset = ETHER_TYPE_OFFSET
+    ether_type, = ETHER_TYPE.unpack_from(data, offset)
+    if ether_type == 0x8100:
+        offset += VLAN_TAG_LEN
+        ether_type, = ETHER_TYPE.unpack_from(data, offset)
+    if ether_type != 0x88cc:
+        return None
+    offset += 2
+
+    header, subtype, dpid = CHASSIS_TLV.unpack_from(data, offset)
+    if header != CHASSIS_TLV_HEADER or subtype != SUBTYPE_LOCALLY_ASSIGNED:
+        return None
+    offset += CHASSIS_TLV.size
+
+    header, subtype = TLV_HEADER.unpack_from(data, offset)
+    length = header & 0x1ff
+    port_format = PORT_FORMATS.get(length - 1)
+    if (header >> 9 != TLV_PORT_ID or port_format is None
+            or subtype != SUBTYPE_LOCALLY_ASSIGNED):
+        return None
+    port_number, = port_format.unpack_from(data, offset + TLV_HEADER.size)
+    return dpid, port_number, offset + 2 + length
+
+
+def decode_lldp(data, strict=False):
+    """Return the DPID and port number carried by an LLDP frame.
+
+    The frame is read in place with :func:`struct.unpack_from`, in a single
+    pass over its TLVs, without creating python-openflow objects.
+
+    Args:
+        data (bytes): Ethernet frame, with or without an 802.1Q tag.
+        strict (bool): Whether to raise :class:`struct.error` for truncated
+            frames instead of returning None.
+
+    Returns:
+        tuple: ``(dpid, port_number)``, or None if the frame is not an LLDP
+            packet sent by this NApp, i.e. it is malformed or its chassis id
+            and port id do not carry a DPID and an OpenFlow port number.
+
+    """
+    try:
+        ids = _decode_ids(data)
+    except struct.error:
+        if strict:
+            raise
+        return None
+    if ids is None:
+        return None
+    return format_dpid(ids[0]), ids[1]
+
+
+def decode_probe(data, strict=False):
+    """Return the DPID, port number, send time and sequence of a probe.
+
+    Like :func:`decode_lldp`, also reading the TLVs after the port id to
+    find the probe TLV added by
+    :class:`~napps.kytos.of_lldp.builder.LLDPFrameBuilder`.
+
+    Returns:
+        tuple: ``(dpid, port_number, timestamp, sequence)``, where the
+            timestamp and the sequence are None if the packet has no probe
+            TLV, or None if the frame is not an LLDP packet sent by this
+            NApp.
+
+    """
+    try:
+        ids = _decode_ids(data)
+    except struct.error:
+        if strict:
+            raise
+        return None
+    if ids is None:
+        return None
+    dpid, port_number, offset = ids
+    dpid = format_dpid(dpid)
+    try:
+        while True:
+            header, = TLV_TYPE_LENGTH.unpack_from(data, offset)
+            tlv_type, length = header >> 9, header & 0x1ff
+            if tlv_type == TLV_END:
+                break
+            if (tlv_type == TLV_ORGANIZATIONALLY_SPECIFIC
+                    and length == PROBE_TLV_VALUE.size):
+                oui, subtype, timestamp, sequence = \
+                    PROBE_TLV_VALUE.unpack_from(data, offset + 2)
+                if (oui == constants.LLDP_PROBE_TLV_OUI
+                        and subtype == constants.LLDP_PROBE_TLV_SUBTYPE):
+                    return dpid, port_number, timestamp, sequence
+            offset += 2 + length
+    except struct.error:
+        # The frame ends without an End of LLDPDU TLV.
+        pass
+    return dpid, port_number, None, None
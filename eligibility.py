@@ -0,0 +1,179 @@
+"""Set of the interfaces that must receive LLDP PacketOuts."""
+from threading import Lock
+
+from pyof.v0x01.common.phy_port import Port as Port10
+from pyof.v0x04.common.port import PortNo as Port13
+
+from napps.kytos.of_lldp.index import get_of_version
+
+#: Port that connects each OpenFlow version to the controller.
+LOCAL_PORTS = {0x01: Port10.OFPP_LOCAL, 0x04: Port13.OFPP_LOCAL}
+
+
+def is_eligible(switch, interface, of_version):
+    """Return whether an interface must receive LLDP PacketOuts.
+
+    The switch must be connected with a supported OpenFlow version and the
+    interface must have LLDP enabled, be active and enabled, and not be the
+    port that connects to the controller.
+    """
+    local_port = LOCAL_PORTS.get(of_version)
+    return (local_port is not None and switch.is_connected()
+            and interface.lldp and interface.is_active()
+            and interface.is_enabled()
+            and interface.port_number != local_port)
+
+
+class EligibleInterfaces:
+    """Map the id of each eligible interface to its LLDP target.
+
+    The targets are ``(switch, interface, of_version)`` tuples. The set is
+    updated from switch and interface events, so each polling round does not
+    need to check every interface of every switch. :meth:`reconcile`
+    rebuilds it from scratch to catch the changes no event reported.
+    """
+
+    def __init__(self, track_added=False):
+        """Create an empty set.
+
+        Args:
+            track_added (bool): Whether to keep the ids of the interfaces
+                added to the set until :meth:`pop_added`.
+
+        """
+        self._targets = {}
+        self._added = set() if track_added else None
+        #: Ids of the eligible interfaces of each switch, by dpid.
+        self._switches = {}
+        self._lock = Lock()
+
+    def _add(self, interface_id, target):
+        """Add or replace a target, holding the lock."""
+        previous = self._targets.get(interface_id)
+        if previous is None:
+            if self._added is not None:
+                self._added.add(interface_id)
+        elif previous[0].dpid != target[0].dpid:
+            self._discard(interface_id)
+        self._targets[interface_id] = target
+        self._switches.setdefault(target[0].dpid, set()).add(interface_id)
+
+    def _discard(self, interface_id):
+        """Remove a target, if present, holding the lock."""
+        target = self._targets.pop(interface_id, None)
+        if self._added is not None:
+            self._added.discard(interface_id)
+        if target is not None:
+            dpid = target[0].dpid
+            interface_ids = self._switches.get(dpid)
+            if interface_ids is not None:
+                interface_ids.discard(interface_id)
+                if not interface_ids:
+                    del self._switches[dpid]
+
+    def update_interface(self, interface):
+        """Add or remove an interface, according to its current state."""
+        self.update_interfaces([interface])
+
+    def update_interfaces(self, interfaces):
+        """Add or remove many interfaces, holding the lock once."""
+        versions = {}
+        targets = []
+        for interface in interfaces:
+            switch = interface.switch
+            if switch.dpid not in versions:
+                versions[switch.dpid] = get_of_version(switch)
+            of_version = versions[switch.dpid]
+            targets.append((interface.id, (switch, interface, of_version)
+                            if is_eligible(switch, interface, of_version)
+                            else None))
+        with self._lock:
+            for interface_id, target in targets:
+                if target is None:
+                    self._discard(interface_id)
+                else:
+                    self._add(interface_id, target)
+
+    def remove_interface(self, interface):
+        """Remove an interface, if present."""
+        with self._lock:
+            self._discard(interface.id)
+
+    def update_switch(self, switch):
+        """Add or remove every interface of a switch."""
+        targets = self._get_switch_targets(switch)
+        with self._lock:
+            self._remove_switch(switch.dpid)
+            for interface_id, target in targets.items():
+                self._add(interface_id, target)
+
+    def remove_switch(self, dpid):
+        """Remove every interface of a switch."""
+        with self._lock:
+            self._remove_switch(dpid)
+
+    def _remove_switch(self, dpid):
+        """Remove every interface of a switch, holding the lock."""
+        for interface_id in self._switches.pop(dpid, ()):
+            self._targets.pop(interface_id, None)
+            if self._added is not None:
+                self._added.discard(interface_id)
+
+    def reconcile(self, switches):
+        """Rebuild the set from the given switches.
+
+        Returns:
+            int: Number of interfaces added or removed, i.e. the changes
+                missed by the events.
+
+        """
+        targets = {}
+        for switch in switches:
+            targets.update(self._get_switch_targets(switch))
+        by_switch = {}
+        for interface_id, target in targets.items():
+            by_switch.setdefault(target[0].dpid, set()).add(interface_id)
+        with self._lock:
+            drift = len(targets.keys() ^ self._targets.keys())
+            if self._added is not None:
+                self._added &= targets.keys()
+                self._added |= targets.keys() - self._targets.keys()
+            self._targets = targets
+            self._switches = by_switch
+        return drift
+
+    @staticmethod
+    def _get_switch_targets(switch):
+        """Return the eligible interfaces of a switch by id."""
+        of_version = get_of_version(switch)
+        return {interface.id: (switch, interface, of_version)
+                for interface in list(switch.interfaces.values())
+                if is_eligible(switch, interface, of_version)}
+
+    def pop_added(self):
+        """Return and forget the ids of the interfaces added to the set.
+
+        Only the interfaces not in the set when added are returned, i.e.
+        those new or eligible again. Nothing is kept without
+        ``track_added``.
+        """
+        with self._lock:
+            if not self._added:
+                return set()
+            added, self._added = self._added, set()
+        return added
+
+    def get(self, interface_id):
+        """Return the target of an eligible interface, or None."""
+        return self._targets.get(interface_id)
+
+    def targets(self):
+        """Return the list of ``(switch, interface, of_version)``."""
+        with self._lock:
+            return list(self._targets.values())
+
+    def __contains__(self, interface_id):
+        return interface_id in self._targets
+
+    def __len__(self):
+        return len(self._targets)
@@ -0,0 +1,267 @@
+"""Client of the kytos/flow_manager REST API."""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Timer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from kytos.core import log
+
+
+class FlowManagerClient:
+    """Send flows to flow_manager without blocking the event handlers.
+
+    Requests run in a bounded pool of threads sharing a ``requests.Session``,
+    so the connections to flow_manager are reused. Connection errors, timeouts
+    and 5xx responses are retried with exponential backoff.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, url, metrics, timeout=10, retries=3, backoff=0.5,
+                 max_workers=4):
+        """Create the client and its connection pool.
+
+        Args:
+            url (str): Base URL of the flow_manager API.
+            metrics (:class:`~napps.kytos.of_lldp.metrics.Metrics`): Registry
+                of the request metrics.
+            timeout (float): Timeout of each request, in seconds.
+            retries (int): Retries after the first attempt of a request.
+            backoff (float): Seconds before the first retry, doubled on each
+                retry.
+            max_workers (int): Maximum number of concurrent requests.
+
+        """
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='of_lldp_flows')
+        self._latency = metrics.histogram(
+            'of_lldp_flow_manager_request_seconds',
+            'Latency of the requests to flow_manager, including retries.')
+        self._failures = metrics.counter(
+            'of_lldp_flow_manager_failures_total',
+            'Requests to flow_manager that failed after all the retries.')
+        self._retries = metrics.counter(
+            'of_lldp_flow_manager_retries_total',
+            'Requests to flow_manager that were retried.')
+
+    def install(self, dpid, flows):
+        """Install flows in a switch, or in every switch if dpid is None.
+
+        Returns:
+            :class:`~concurrent.futures.Future`: Future of the response, or
+                None if all the attempts failed.
+
+        """
+        return self._executor.submit(self.request, 'POST', dpid, flows)
+
+    def remove(self, dpid, flows):
+        """Remove flows from a switch, or from every switch if dpid is None.
+
+        Returns:
+            :class:`~concurrent.futures.Future`: Future of the response, or
+                None if all the attempts failed.
+
+        """
+        return self._executor.submit(self.request, 'DELETE', dpid, flows)
+
+    def request(self, method, dpid, flows):
+        """Send a request to flow_manager, retrying it if needed.
+
+        Returns:
+            :class:`requests.Response` or None if all the attempts failed.
+
+        """
+        endpoint = (f'{self.url}/flows' if dpid is None
+                    else f'{self.url}/flows/{dpid}')
+        start = time.monotonic()
+        response = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._retries.inc()
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                response = self._session.request(method, endpoint,
+                                                 json={'flows': flows},
+                                                 timeout=self.timeout)
+            except requests.RequestException as error:
+                log.warning('Error sending %s %s to flow_manager: %s',
+                            method, endpoint, error)
+                response = None
+                continue
+            if response.status_code < 500:
+                break
+        self._latency.observe(time.monotonic() - start)
+
+        if response is None or not response.ok:
+            self._failures.inc()
+            log.error('Failed to %s LLDP flows on %s: %s', method,
+                      dpid or 'every switch',
+                      response.text if response is not None else 'no answer')
+            return None
+        return response
+
+    def shutdown(self, wait=False):
+        """Stop the pool of threads and close the connections."""
+        self._executor.shutdown(wait=wait)
+        self._session.close()
+
+
+class FlowBatcher:
+    """Coalesce the LLDP flow changes of many switches.
+
+    Changes are held for ``window`` seconds after the first one arrives and
+    then sent together. Repeated changes of a switch are sent once and a
+    removal cancels a pending installation of the same switch, and vice
+    versa, so nothing is sent for a switch that flapped within the window.
+
+    flow_manager only accepts flows for one switch or for every switch. When
+    the same change of the same flows covers every switch returned by
+    ``get_dpids``, e.g. all the switches connecting at once with one
+    OpenFlow version, it is sent as a single request for every switch.
+    Otherwise the batch is sent as one request per switch, concurrently
+    through the :class:`FlowManagerClient` pool.
+    """
+
+    def __init__(self, client, metrics, window=0.5, get_dpids=None):
+        """Create a batcher.
+
+        Args:
+            client (:class:`FlowManagerClient`): Client sending the batches.
+            metrics (:class:`~napps.kytos.of_lldp.metrics.Metrics`): Registry
+                of the batch metrics.
+            window (float): Seconds to hold the changes before sending them.
+                With 0 every change is sent at once.
+            get_dpids (callable): Return the dpids of the switches a request
+                for every switch goes to. Without it a batch is always sent
+                switch by switch.
+
+        """
+        self.client = client
+        self.window = window
+        self.get_dpids = get_dpids
+        self._pending = {}
+        self._timer = None
+        self._lock = Lock()
+        self._install_time = metrics.histogram(
+            'of_lldp_flow_install_seconds',
+            'Time from switch connection to its LLDP flow installed.')
+        self._cancelled = metrics.counter(
+            'of_lldp_flow_changes_cancelled_total',
+            'LLDP flow changes cancelled by an opposite change in a batch.')
+        self._batch_size = metrics.histogram(
+            'of_lldp_flow_batch_size', 'Switches in each batch of LLDP flows.',
+            (1, 10, 100, 1000))
+        self._fabric_requests = metrics.counter(
+            'of_lldp_flow_fabric_requests_total',
+            'Batches of LLDP flows sent as a single request for every '
+            'switch.')
+
+    def install(self, dpid, flows, since=None):
+        """Install flows in a switch in the next batch.
+
+        Args:
+            dpid (str): Switch datapath id.
+            flows (list(dict)): Flows to be installed.
+            since (float): ``time.monotonic()`` of the switch connection, to
+                measure the time until the flows are installed. Defaults to
+                now.
+
+        """
+        self._add(dpid, 'POST', flows, since)
+
+    def remove(self, dpid, flows):
+        """Remove flows from a switch in the next batch."""
+        self._add(dpid, 'DELETE', flows, None)
+
+    def _add(self, dpid, method, flows, since):
+        """Add a change to the pending batch, starting its timer."""
+        since = time.monotonic() if since is None else since
+        with self._lock:
+            pending = self._pending.get(dpid)
+            if pending is not None:
+                if pending[0] != method:
+                    del self._pending[dpid]
+                    self._cancelled.inc(2)
+                    return
+                since = min(since, pending[2])
+            self._pending[dpid] = (method, flows, since)
+            if self.window <= 0:
+                start_timer = False
+            else:
+                start_timer = self._timer is None
+                if start_timer:
+                    self._timer = Timer(self.window, self.flush)
+                    self._timer.daemon = True
+        if self.window <= 0:
+            self.flush()
+        elif start_timer:
+            self._timer.start()
+
+    def flush(self):
+        """Send the pending changes now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._timer = None
+        if not pending:
+            return
+        self._batch_size.observe(len(pending))
+        for (method, _), changes in self._group(pending).items():
+            flows = pending[changes[0]][1]
+            if len(changes) > 1 and self._covers_every_switch(changes):
+                self._fabric_requests.inc()
+                self._send(method, None, flows,
+                           [pending[dpid][2] for dpid in changes])
+                continue
+            for dpid in changes:
+                self._send(method, dpid, flows, [pending[dpid][2]])
+
+    @staticmethod
+    def _group(pending):
+        """Return the dpids of the pending changes by method and flows."""
+        groups = {}
+        for dpid, (method, flows, _) in pending.items():
+            key = (method, json.dumps(flows, sort_keys=True))
+            groups.setdefault(key, []).append(dpid)
+        return groups
+
+    def _covers_every_switch(self, dpids):
+        """Return whether a request for every switch only goes to dpids."""
+        return (self.get_dpids is not None
+                and set(self.get_dpids()) == set(dpids))
+
+    def _send(self, method, dpid, flows, since):
+        """Send a change, measuring the install time of each switch."""
+        if method == 'POST':
+            future = self.client.install(dpid, flows)
+            future.add_done_callback(
+                lambda future: self._installed(future, since))
+        else:
+            self.client.remove(dpid, flows)
+
+    def _installed(self, future, since):
+        """Measure the time to install the flows of the switches."""
+        if not future.cancelled() and future.result() is not None:
+            now = time.monotonic()
+            for connected in since:
+                self._install_time.observe(now - connected)
+
+    def shutdown(self):
+        """Cancel the timer and send the pending changes."""
+        with self._lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+        self.flush()
+
+    def __len__(self):
+        return len(self._pending)
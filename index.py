@@ -0,0 +1,109 @@
+"""Index of the switch interfaces by datapath id and port number."""
+import re
+from fnmatch import translate
+
+
+def get_of_version(switch):
+    """Return the OpenFlow version negotiated with a switch, if connected."""
+    try:
+        return switch.connection.protocol.version
+    except AttributeError:
+        return None
+
+
+class InterfaceIndex:
+    """Map ``(dpid, port_number)`` to ``(interface, of_version)``.
+
+    The index is updated from switch and interface events, so the LLDP
+    receive path finds both interfaces of a link with a dict lookup each.
+    The interfaces are also indexed by id and by switch, to select them for
+    the bulk LLDP changes without going through every switch.
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        self._ports = {}
+        #: Interfaces by id, grouped by the dpid of their switch.
+        self._switches = {}
+
+    def get(self, dpid, port_number):
+        """Return ``(interface, of_version)`` of a port, or None."""
+        return self._ports.get((dpid, port_number))
+
+    def add_interface(self, interface):
+        """Add or update an interface."""
+        switch = interface.switch
+        self._ports[(switch.dpid, interface.port_number)] = (
+            interface, get_of_version(switch))
+        self._switches.setdefault(switch.dpid, {})[interface.id] = interface
+
+    def remove_interface(self, interface):
+        """Remove an interface, if present."""
+        dpid = interface.switch.dpid
+        self._ports.pop((dpid, interface.port_number), None)
+        self._switches.get(dpid, {}).pop(interface.id, None)
+
+    def add_switch(self, switch):
+        """Add or update all the interfaces of a switch."""
+        self.remove_switch(switch.dpid)
+        of_version = get_of_version(switch)
+        interfaces = list(switch.interfaces.values())
+        for interface in interfaces:
+            self._ports[(switch.dpid, interface.port_number)] = (interface,
+                                                                 of_version)
+        self._switches[switch.dpid] = {interface.id: interface
+                                       for interface in interfaces}
+
+    def remove_switch(self, dpid):
+        """Remove all the interfaces of a switch."""
+        for interface in self._switches.pop(dpid, {}).values():
+            self._ports.pop((dpid, interface.port_number), None)
+
+    def rebuild(self, switches):
+        """Index again all the interfaces of the given switches."""
+        self._ports.clear()
+        self._switches.clear()
+        for switch in switches:
+            self.add_switch(switch)
+
+    def get_interface(self, interface_id):
+        """Return an interface by id, or None."""
+        dpid = interface_id.rpartition(':')[0]
+        return self._switches.get(dpid, {}).get(interface_id)
+
+    def get_switch_interfaces(self, dpid):
+        """Return the interfaces of a switch, or None if not indexed."""
+        interfaces = self._switches.get(dpid)
+        return None if interfaces is None else list(interfaces.values())
+
+    def interfaces(self):
+        """Return every interface."""
+        return [interface for interfaces in list(self._switches.values())
+                for interface in list(interfaces.values())]
+
+    def match(self, pattern=None, regex=None):
+        """Return the interfaces whose id matches a glob or a regex.
+
+        An interface is returned if either the shell-style ``pattern`` or
+        the ``regex`` match its whole id, e.g. ``00:00:00:00:00:00:00:0?:1``
+        or ``.*:(1|2)``.
+
+        Raises:
+            re.error: If the regex is invalid.
+
+        """
+        expressions = []
+        if pattern is not None:
+            expressions.append(translate(pattern))
+        if regex is not None:
+            expressions.append(regex)
+        if not expressions:
+            return []
+        fullmatch = re.compile('|'.join(f'(?:{expression})'
+                                        for expression in expressions)
+                               ).fullmatch
+        return [interface for interface in self.interfaces()
+                if fullmatch(interface.id)]
+
+    def __len__(self):
+        return len(self._ports)
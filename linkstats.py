@@ -0,0 +1,190 @@
+"""Statistics of the links measured with LLDP probes."""
+import math
+import time
+from array import array
+
+
+def monotonic_ns():
+    """Return the monotonic clock in nanoseconds.
+
+    ``time.monotonic_ns`` is only available from Python 3.7.
+    """
+    return int(time.monotonic() * 1e9)
+
+
+class RingBuffer:
+    """Keep the last ``size`` values in a preallocated array.
+
+    The values are stored with an :mod:`array` type code, e.g. ``'d'`` for
+    floats or ``'L'`` for unsigned integers, so a buffer takes a fixed
+    amount of memory.
+    """
+
+    __slots__ = ('_values', '_next', '_count')
+
+    def __init__(self, size, typecode='d'):
+        """Create an empty buffer of ``size`` values."""
+        self._values = array(typecode, bytes(size * array(typecode).itemsize))
+        self._next = 0
+        self._count = 0
+
+    def append(self, value):
+        """Add a value, replacing the oldest one if the buffer is full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+
+    def values(self):
+        """Return the values, from the oldest to the newest."""
+        if self._count < len(self._values):
+            return self._values[:self._count].tolist()
+        return (self._values[self._next:] + self._values[:self._next]).tolist()
+
+    def __len__(self):
+        return self._count
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of sorted values."""
+    index = max(math.ceil(fraction * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class LatencyStats:
+    """Round-trip time of the probes of a link, in seconds.
+
+    Besides the last, minimum and maximum values, an exponentially weighted
+    moving average is kept, and the percentiles are computed from the last
+    ``window`` samples.
+    """
+
+    __slots__ = ('alpha', 'last', 'ewma', 'min', 'max', 'count', '_samples')
+
+    def __init__(self, alpha=0.2, window=64):
+        """Create empty statistics.
+
+        Args:
+            alpha (float): Weight of each new sample in the moving average.
+            window (int): Number of samples used for the percentiles.
+
+        """
+        self.alpha = alpha
+        self.last = None
+        self.ewma = None
+        self.min = None
+        self.max = None
+        self.count = 0
+        self._samples = RingBuffer(window)
+
+    def add(self, rtt):
+        """Add a round-trip time sample."""
+        if self.count:
+            self.ewma += self.alpha * (rtt - self.ewma)
+            self.min = min(self.min, rtt)
+            self.max = max(self.max, rtt)
+        else:
+            self.ewma = self.min = self.max = rtt
+        self.last = rtt
+        self.count += 1
+        self._samples.append(rtt)
+
+    def as_dict(self):
+        """Return the statistics, with the 50th, 90th and 99th percentiles."""
+        samples = sorted(self._samples.values())
+        stats = {'last': self.last, 'ewma': self.ewma, 'min': self.min,
+                 'max': self.max, 'count': self.count}
+        for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+            stats[name] = percentile(samples, fraction) if samples else None
+        return stats
+
+
+class SequenceStats:
+    """Loss and jitter of the probes sent through one interface of a link.
+
+    The probes carry a 32-bit sequence number, incremented on each probe
+    sent through the interface. The probes sent since the first one received
+    are counted from the sequence number of the last one sent, given by the
+    sender, so the probes lost after the last one received are counted too.
+    The jitter is estimated from the variation of the round-trip time, as
+    the RTP interarrival jitter of RFC 3550. The last ``window`` sequence
+    numbers are kept to compute the recent loss.
+    """
+
+    __slots__ = ('first_sequence', 'received', 'reordered', 'jitter',
+                 'last_sequence', '_last_rtt', '_history')
+
+    def __init__(self, window=64):
+        """Create empty statistics."""
+        self.first_sequence = None
+        self.received = 0
+        self.reordered = 0
+        self.jitter = 0.0
+        self.last_sequence = None
+        self._last_rtt = None
+        self._history = RingBuffer(window, 'L')
+
+    def add(self, sequence, rtt):
+        """Add a probe received with its sequence number and round-trip time.
+
+        Sequence numbers that go back, i.e. probes received out of order or
+        duplicated, are counted as received and reordered.
+        """
+        if self.last_sequence is None:
+            self.first_sequence = self.last_sequence = sequence
+        else:
+            delta = (sequence - self.last_sequence) & 0xffffffff
+            if 0 < delta < 0x80000000:
+                self.last_sequence = sequence
+            else:
+                self.reordered += 1
+        self.received += 1
+        self._history.append(sequence)
+        if self._last_rtt is not None:
+            self.jitter += (abs(rtt - self._last_rtt) - self.jitter) / 16
+        self._last_rtt = rtt
+
+    def sent(self, last_sent=None):
+        """Return the probes sent since the first one received.
+
+        Args:
+            last_sent (int): Sequence number of the last probe sent through
+                the interface. Defaults to the last one received, which
+                misses the probes lost after it.
+
+        """
+        if self.first_sequence is None:
+            return 0
+        last = self.last_sequence
+        if last_sent is not None:
+            # Ignore a sender behind the probes received, e.g. restarted.
+            delta = (last_sent - self.last_sequence) & 0xffffffff
+            if delta < 0x80000000:
+                last = last_sent
+        return ((last - self.first_sequence) & 0xffffffff) + 1
+
+    def window_loss(self):
+        """Return the fraction of probes lost among the last ones received."""
+        history = self._history.values()
+        if not history:
+            return None
+        expected = ((self.last_sequence - history[0]) & 0xffffffff) + 1
+        if expected > 0x80000000:
+            return 0.0
+        return max(0.0, 1 - len(set(history)) / expected)
+
+    def as_dict(self, last_sent=None):
+        """Return the counters, the loss and the jitter in seconds.
+
+        Args:
+            last_sent (int): Sequence number of the last probe sent through
+                the interface, see :meth:`sent`.
+
+        """
+        sent = self.sent(last_sent)
+        received = min(self.received, sent)
+        return {'sent': sent, 'received': self.received,
+                'reordered': self.reordered,
+                'loss': (sent - received) / sent if sent else None,
+                'window_loss': self.window_loss(), 'jitter': self.jitter,
+                'last_sequence': self.last_sequence}
@@ -0,0 +1,146 @@
+"""Pages of the interface ids by LLDP state, cached by version."""
+import json
+from bisect import bisect_left, bisect_right
+from threading import Lock
+from uuid import uuid4
+
+#: Values of the LLDP state filter.
+STATES = ('enabled', 'disabled', 'all')
+
+
+def _get_entries(switches):
+    """Return the sorted ``(interface_id, lldp)`` of every interface."""
+    return sorted((interface.id, bool(interface.lldp))
+                  for switch in switches
+                  for interface in list(switch.interfaces.values()))
+
+
+class InterfaceListing:
+    """Serve the interface ids by LLDP state, a page at a time.
+
+    The ids are kept sorted, so a page starts right after the ``cursor``,
+    the last id of the previous one, and the ids of a switch are contiguous.
+    Both the sorted ids and the serialized pages are cached until the
+    :attr:`version` changes, which the callers do with :meth:`invalidate`
+    whenever an interface is added or removed or its LLDP state changes.
+    :meth:`reconcile` catches the changes without an event.
+    """
+
+    def __init__(self, max_pages=256):
+        """Create an empty listing.
+
+        Args:
+            max_pages (int): Maximum number of serialized pages cached.
+
+        """
+        self.max_pages = max_pages
+        #: Incremented on each change of the listed interfaces.
+        self.version = 0
+        # Tells apart the versions of each run of the NApp.
+        self._run = uuid4().hex[:8]
+        self._ids = None
+        self._entries = None
+        self._pages = {}
+        self._lock = Lock()
+
+    @property
+    def etag(self):
+        """Return the HTTP entity tag of the current version, unquoted."""
+        return f'{self._run}-{self.version}'
+
+    def invalidate(self):
+        """Start a new version, discarding the cached ids and pages."""
+        with self._lock:
+            self._invalidate()
+
+    def _invalidate(self):
+        """Start a new version, holding the lock."""
+        self.version += 1
+        self._ids = None
+        self._entries = None
+        self._pages.clear()
+
+    def reconcile(self, switches):
+        """Start a new version if the interfaces changed without an event.
+
+        Returns:
+            bool: Whether the interfaces or their LLDP state changed.
+
+        """
+        entries = _get_entries(switches)
+        with self._lock:
+            changed = self._entries is not None and entries != self._entries
+            if changed:
+                self._invalidate()
+        return changed
+
+    def _get_ids(self, switches):
+        """Return the sorted interface ids by LLDP state."""
+        with self._lock:
+            ids, version = self._ids, self.version
+        if ids is not None:
+            return ids
+        entries = _get_entries(switches)
+        ids = {'all': [interface_id for interface_id, _ in entries],
+               'enabled': [interface_id for interface_id, lldp in entries
+                           if lldp],
+               'disabled': [interface_id for interface_id, lldp in entries
+                            if not lldp]}
+        with self._lock:
+            # Only keep them if nothing changed while they were listed.
+            if version == self.version:
+                self._ids, self._entries = ids, entries
+        return ids
+
+    # pylint: disable=too-many-arguments
+    def page(self, switches, state='enabled', dpid=None, limit=None,
+             cursor=None):
+        """Return a page of interface ids serialized as JSON.
+
+        Args:
+            switches (list): Switches whose interfaces are listed.
+            state (str): One of :data:`STATES`.
+            dpid (str): Only list the interfaces of this switch.
+            limit (int): Maximum number of ids, or None for all of them.
+            cursor (str): Last id of the previous page.
+
+        Returns:
+            str: JSON object with the ``interfaces`` ids and, if there is a
+                limit, the ``next`` cursor, null on the last page.
+
+        Raises:
+            ValueError: If the state or the limit are invalid.
+
+        """
+        if state not in STATES:
+            raise ValueError(f'invalid LLDP state {state}, must be one of '
+                             f'{", ".join(STATES)}')
+        if limit is not None and limit < 1:
+            raise ValueError(f'invalid limit {limit}, must be greater than '
+                             'zero')
+        key = (state, dpid, limit, cursor)
+        page = self._pages.get(key)
+        if page is not None:
+            return page
+
+        with self._lock:
+            version = self.version
+        ids = self._get_ids(switches)[state]
+        start, end = 0, len(ids)
+        if dpid is not None:
+            # The ids of a switch are "<dpid>:<port>", and ";" follows ":".
+            start = bisect_left(ids, f'{dpid}:')
+            end = bisect_left(ids, f'{dpid};')
+        if cursor is not None:
+            start = max(start, bisect_right(ids, cursor))
+        content = {'interfaces': ids[start:end if limit is None
+                                     else min(end, start + limit)]}
+        if limit is not None:
+            content['next'] = (content['interfaces'][-1]
+                               if start + limit < end else None)
+        page = json.dumps(content)
+
+        with self._lock:
+            if version == self.version and len(self._pages) < self.max_pages:
+                self._pages[key] = page
+        return page
@@ -0,0 +1,199 @@
+"""Track when each link was last seen and detect the expired ones."""
+import hashlib
+import heapq
+import time
+from threading import Lock
+
+
+def link_key(interface_a, interface_b):
+    """Return the key of a link, regardless of its direction."""
+    if interface_a.id <= interface_b.id:
+        return (interface_a.id, interface_b.id)
+    return (interface_b.id, interface_a.id)
+
+
+def link_id(interface_a, interface_b):
+    """Return the id kytos.core gives to the link of two interfaces."""
+    elements = sorted(((interface_a.switch.dpid, interface_a.port_number),
+                       (interface_b.switch.dpid, interface_b.port_number)))
+    str_id = '%s:%s:%s:%s' % (elements[0] + elements[1])
+    return hashlib.sha256(str_id.encode('utf-8')).hexdigest()
+
+
+def sort_interfaces(interface_a, interface_b):
+    """Return the interfaces of a link in the order of its key."""
+    if interface_a.id <= interface_b.id:
+        return interface_a, interface_b
+    return interface_b, interface_a
+
+
+class LinkState:
+    """Link discovered through LLDP."""
+
+    __slots__ = ('id', 'interface_a', 'interface_b', 'first_seen',
+                 'last_seen', 'last_announced', 'deadline', 'latency',
+                 'probes')
+
+    def __init__(self, interface_a, interface_b, now):
+        """Create a link seen at ``now``."""
+        # pylint: disable=invalid-name
+        self.id = link_id(interface_a, interface_b)
+        self.interface_a, self.interface_b = sort_interfaces(interface_a,
+                                                             interface_b)
+        #: :class:`~napps.kytos.of_lldp.linkstats.LatencyStats` of the link,
+        #: if its probes carry a send time.
+        self.latency = None
+        #: :class:`~napps.kytos.of_lldp.linkstats.SequenceStats` of the
+        #: probes sent through each interface of the link, by interface id.
+        self.probes = {}
+        self.first_seen = now
+        self.last_seen = now
+        self.last_announced = now
+        #: Deadline of the link in the heap of the tracker.
+        self.deadline = None
+
+
+class LinkLivenessTracker:
+    """Table of the links seen and the time they were last seen.
+
+    The table tells whether a link seen must be announced, so known links
+    are only announced again every ``heartbeat`` seconds.
+
+    Links expire when they are not seen for ``timeout`` seconds. Instead of
+    scanning the whole table, the expiration deadlines are kept in a heap.
+    A link seen again is not pushed again; when its old deadline is popped
+    it is pushed back with the new one. So each check only handles the
+    deadlines that are due, at most one per link per ``timeout``.
+    """
+
+    def __init__(self, timeout, heartbeat=0):
+        """Create an empty table.
+
+        Args:
+            timeout (float): Seconds without seeing a link before it expires.
+            heartbeat (float): Seconds between announcements of a known link.
+                With 0 a link is announced every time it is seen.
+
+        """
+        self.timeout = timeout
+        self.heartbeat = heartbeat
+        self._links = {}
+        #: Key of the link of each interface, by interface id.
+        self._interfaces = {}
+        #: Key of each link, by kytos.core link id.
+        self._ids = {}
+        self._deadlines = []
+        self._lock = Lock()
+
+    def seen(self, interface_a, interface_b, now=None):
+        """Record that a link was seen.
+
+        Returns:
+            bool: True if the link must be announced, i.e. it is new, one of
+                its interfaces changed or it was last announced at least
+                ``heartbeat`` seconds ago.
+
+        """
+        now = time.monotonic() if now is None else now
+        key = link_key(interface_a, interface_b)
+        with self._lock:
+            link = self._links.get(key)
+            if link is None:
+                link = self._links[key] = LinkState(interface_a, interface_b,
+                                                    now)
+                self._interfaces[key[0]] = self._interfaces[key[1]] = key
+                self._ids[link.id] = key
+                self._schedule(link, key, now + self.timeout)
+                return True
+
+            link.last_seen = now
+            interface_a, interface_b = sort_interfaces(interface_a,
+                                                       interface_b)
+            if (link.interface_a is not interface_a
+                    or link.interface_b is not interface_b):
+                link.interface_a = interface_a
+                link.interface_b = interface_b
+            elif now - link.last_announced < self.heartbeat:
+                return False
+            link.last_announced = now
+            return True
+
+    def expire(self, now=None):
+        """Remove and return the links not seen for ``timeout`` seconds.
+
+        Returns:
+            list(:class:`LinkState`): The expired links.
+
+        """
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                deadline, key = heapq.heappop(self._deadlines)
+                link = self._links.get(key)
+                # Skip deadlines of links removed or added again.
+                if link is None or link.deadline != deadline:
+                    continue
+                deadline = link.last_seen + self.timeout
+                if deadline <= now:
+                    self._remove(key)
+                    expired.append(link)
+                else:
+                    self._schedule(link, key, deadline)
+        return expired
+
+    def _schedule(self, link, key, deadline):
+        """Push the deadline of a link to the heap."""
+        link.deadline = deadline
+        heapq.heappush(self._deadlines, (deadline, key))
+
+    def _remove(self, key):
+        """Remove a link and its interfaces, holding the lock."""
+        link = self._links.pop(key, None)
+        if link is not None and self._ids.get(link.id) == key:
+            del self._ids[link.id]
+        for interface_id in key:
+            if self._interfaces.get(interface_id) == key:
+                del self._interfaces[interface_id]
+
+    def get(self, interface_a, interface_b):
+        """Return the state of a link, or None if it is not known."""
+        return self._links.get(link_key(interface_a, interface_b))
+
+    def find(self, id_):
+        """Return the state of a link by its kytos.core id, or None."""
+        with self._lock:
+            key = self._ids.get(id_)
+            return None if key is None else self._links.get(key)
+
+    def has_link(self, interface_id):
+        """Return whether an interface has a known link."""
+        return interface_id in self._interfaces
+
+    def links(self):
+        """Return the state of every known link."""
+        with self._lock:
+            return list(self._links.values())
+
+    def remove(self, interface_a, interface_b):
+        """Forget a link. Its pending deadline is discarded when due."""
+        with self._lock:
+            self._remove(link_key(interface_a, interface_b))
+
+    def remove_interface(self, interface_id):
+        """Forget the link of an interface, so it is announced once seen.
+
+        Returns:
+            :class:`LinkState`: The link removed, or None.
+
+        """
+        with self._lock:
+            key = self._interfaces.get(interface_id)
+            if key is None:
+                return None
+            link = self._links.get(key)
+            self._remove(key)
+            return link
+
+    def __len__(self):
+        return len(self._links)
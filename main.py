@@ -1,109 +1,242 @@
 """NApp responsible to discover new switches and hosts."""
+# pylint: disable=too-many-lines
+import math
+import re
 import struct
+import time
 
-import requests
-from flask import jsonify, request
-from pyof.foundation.basic_types import DPID, UBInt16, UBInt32
-from pyof.foundation.network_types import LLDP, VLAN, Ethernet, EtherType
-from pyof.v0x01.common.action import ActionOutput as AO10
+from flask import Response, jsonify, request
+from pyof.foundation.network_types import EtherType
 from pyof.v0x01.common.phy_port import Port as Port10
-from pyof.v0x01.controller2switch.packet_out import PacketOut as PO10
-from pyof.v0x04.common.action import ActionOutput as AO13
 from pyof.v0x04.common.port import PortNo as Port13
-from pyof.v0x04.controller2switch.packet_out import PacketOut as PO13
 
 from kytos.core import KytosEvent, KytosNApp, log, rest
 from kytos.core.helpers import listen_to
-from napps.kytos.of_lldp import constants, settings
+from napps.kytos.of_lldp import settings
+from napps.kytos.of_lldp.adaptive import ProbeScheduler
+from napps.kytos.of_lldp.backpressure import (Backpressure, get_queue_depth,
+                                              get_write_buffer_size)
+from napps.kytos.of_lldp.builder import LLDPFrameBuilder
+from napps.kytos.of_lldp.cache import LLDPFrameCache
+from napps.kytos.of_lldp.decoder import (decode_lldp, decode_probe,
+                                         is_lldp_frame)
+from napps.kytos.of_lldp.eligibility import EligibleInterfaces
+from napps.kytos.of_lldp.flow_client import FlowBatcher, FlowManagerClient
+from napps.kytos.of_lldp.index import InterfaceIndex, get_of_version
+from napps.kytos.of_lldp.linkstats import (LatencyStats, SequenceStats,
+                                           monotonic_ns)
+from napps.kytos.of_lldp.listing import InterfaceListing
+from napps.kytos.of_lldp.liveness import LinkLivenessTracker
+from napps.kytos.of_lldp.metrics import TEXT_CONTENT_TYPE, Metrics
+from napps.kytos.of_lldp.pacing import SendPacer
+from napps.kytos.of_lldp.persistence import SavedState, open_store
+from napps.kytos.of_lldp.profiling import Profiler
+from napps.kytos.of_lldp.ratelimit import GlobalRateLimiter, RateLimiter
+from napps.kytos.of_lldp.tracing import Tracer
 
 
 class Main(KytosNApp):
     """Main OF_LLDP NApp Class."""
 
+    # pylint: disable=too-many-public-methods
+
     def setup(self):
         """Make this NApp run in a loop."""
+        # pylint: disable=too-many-statements
         self.vlan_id = None
         self.polling_time = settings.POLLING_TIME
+        self.state_store, state = None, SavedState()
+        if settings.STATE_FILE is not None:
+            self.state_store, state = open_store(settings.STATE_FILE)
+        self.polling_time = state.settings.get('polling_time',
+                                               self.polling_time)
+        #: LLDP flags saved of the interfaces not restored yet, by id.
+        self._saved_lldp = state.lldp
+        self.frame_builder = LLDPFrameBuilder(settings.LLDP_TIMESTAMP)
+        #: Sequence number of the last probe sent through each interface.
+        self._sequences = {}
+        self.frame_cache = LLDPFrameCache()
+        self.interface_index = InterfaceIndex()
+        self.interface_index.rebuild(list(self.controller.switches.values()))
+        self._restore_lldp(self.interface_index.interfaces())
+        self.eligible_interfaces = EligibleInterfaces(
+            track_added=settings.ADAPTIVE_PROBING)
+        self.eligible_interfaces.reconcile(
+            list(self.controller.switches.values()))
+        self.interface_listing = InterfaceListing()
+        self._ticks = 0
+        self.pacer = SendPacer(settings.POLLING_SLOTS,
+                               settings.POLLING_SLOT_MODE,
+                               settings.POLLING_MAX_BATCH)
+        self.probe_scheduler = None
+        if settings.ADAPTIVE_PROBING:
+            self.probe_scheduler = ProbeScheduler(
+                settings.PROBE_MIN_INTERVAL, settings.PROBE_MAX_INTERVAL,
+                settings.PROBE_EDGE_INTERVAL, settings.PROBE_BACKOFF)
+        self.link_tracker = LinkLivenessTracker(self._get_link_timeout(),
+                                                settings.NNI_HEARTBEAT)
+        #: Interfaces of the links saved, probed first until found again.
+        self._warm_interfaces = {interface_id for link in state.links
+                                 for interface_id in link}
+        self._warm_until = time.monotonic() + self._get_link_timeout()
+        self._saved_links = set(state.links)
+        self._next_save = time.monotonic() + settings.STATE_SAVE_INTERVAL
+        self.metrics = Metrics()
+        self.packet_in_counter = self.metrics.counter(
+            'of_lldp_packet_in_total', 'PacketIns received.')
+        self.lldp_parsed_counter = self.metrics.counter(
+            'of_lldp_packet_in_lldp_parsed_total',
+            'LLDP PacketIns sent by of_lldp and decoded.')
+        self.lldp_malformed_counter = self.metrics.counter(
+            'of_lldp_packet_in_lldp_malformed_total',
+            'LLDP PacketIns discarded because they were truncated.')
+        self.unknown_dpid_counter = self.metrics.counter(
+            'of_lldp_packet_in_unknown_dpid_total',
+            'LLDP PacketIns discarded because a switch was not found.')
+        self.not_lldp_counter = self.metrics.counter(
+            'of_lldp_packet_in_not_lldp_total',
+            'PacketIns discarded because their ethertype is not LLDP.')
+        self.lldp_rejected_counter = self.metrics.counter(
+            'of_lldp_packet_in_lldp_rejected_total',
+            'LLDP PacketIns discarded because they were not sent by of_lldp.')
+        self.nni_counter = self.metrics.counter(
+            'of_lldp_nni_events_total',
+            'kytos/of_lldp.interface.is.nni events dispatched.')
+        self.nni_suppressed_counter = self.metrics.counter(
+            'of_lldp_nni_events_suppressed_total',
+            'LLDP packets of known links that were not announced again.')
+        self.eligibility_drift_counter = self.metrics.counter(
+            'of_lldp_eligibility_drift_total',
+            'Eligible interfaces fixed by a reconciliation, missed by events.')
+        self.flow_client = FlowManagerClient(
+            settings.FLOW_MANAGER_URL, self.metrics,
+            timeout=settings.FLOW_MANAGER_TIMEOUT,
+            retries=settings.FLOW_MANAGER_RETRIES,
+            backoff=settings.FLOW_MANAGER_BACKOFF,
+            max_workers=settings.FLOW_MANAGER_MAX_WORKERS)
+        self.flow_batcher = FlowBatcher(
+            self.flow_client, self.metrics, settings.FLOW_BATCH_WINDOW,
+            lambda: list(self.controller.switches))
+        #: Time each switch connected, to measure its LLDP flow installation.
+        self._connected_at = {}
+        self.probe_limiter = RateLimiter(settings.PROBE_RATE,
+                                         settings.PROBE_BURST)
+        self.probe_limited_counter = self.metrics.counter(
+            'of_lldp_probes_rate_limited_total',
+            'Immediate LLDP probes skipped by the per switch rate limit.')
+        self.discovery_histogram = self.metrics.histogram(
+            'of_lldp_discovery_seconds',
+            'Time from an immediate LLDP probe to its NNI event.')
+        self.packet_out_built_counter = self.metrics.counter(
+            'of_lldp_packet_out_built_total',
+            'LLDP PacketOuts built, i.e. not found in the cache.')
+        self.packet_out_sent_counter = self.metrics.counter(
+            'of_lldp_packet_out_sent_total',
+            'LLDP PacketOuts put in the msg_out buffer.')
+        self.packet_out_cycle_histogram = self.metrics.histogram(
+            'of_lldp_packet_out_per_cycle',
+            'LLDP PacketOuts sent by each execution of the polling loop.',
+            (0, 1, 10, 100, 1000, 10000))
+        self.execute_histogram = self.metrics.histogram(
+            'of_lldp_execute_seconds',
+            'Duration of each execution of the polling loop.')
+        self.execute_overrun_counter = self.metrics.counter(
+            'of_lldp_execute_overruns_total',
+            'Executions of the polling loop longer than its interval.')
+        self.packet_out_deferred_counter = self.metrics.counter(
+            'of_lldp_packet_out_deferred_total',
+            'LLDP PacketOuts deferred to the next execution of the polling '
+            'loop because it ran out of time.')
+        #: Targets not sent by the last execution of the polling loop.
+        self._deferred = []
+        #: Time the targets not sent since were first dropped by the
+        #: PacketOut rate limits, by interface id.
+        self._dropped = {}
+        self.packet_out_limiter = None
+        if (settings.PACKET_OUT_RATE is not None
+                or settings.PACKET_OUT_SWITCH_RATE is not None):
+            self.packet_out_limiter = GlobalRateLimiter(
+                settings.PACKET_OUT_RATE, settings.PACKET_OUT_BURST,
+                settings.PACKET_OUT_SWITCH_RATE,
+                settings.PACKET_OUT_SWITCH_BURST)
+        self.packet_out_limited_counter = self.metrics.counter(
+            'of_lldp_packet_out_rate_limited_total',
+            'LLDP PacketOuts deferred to the next execution of the polling '
+            'loop by the PacketOut rate limits.')
+        self.packet_out_dropped_counter = self.metrics.counter(
+            'of_lldp_packet_out_dropped_total',
+            'Deferred LLDP PacketOuts dropped by the PacketOut rate limits.')
+        self.backpressure = None
+        if settings.BACKPRESSURE_HIGH is not None:
+            self.backpressure = Backpressure(settings.BACKPRESSURE_HIGH,
+                                             settings.BACKPRESSURE_LOW)
+        self.msg_out_depth_histogram = self.metrics.histogram(
+            'of_lldp_msg_out_depth',
+            'Events in the msg_out buffer at each execution of the polling '
+            'loop.', (0, 10, 100, 1000, 10000, 100000))
+        self.throttled_cycles_counter = self.metrics.counter(
+            'of_lldp_backpressure_cycles_total',
+            'Executions of the polling loop throttled by the msg_out depth.')
+        self.throttled_counter = self.metrics.counter(
+            'of_lldp_backpressure_skipped_total',
+            'LLDP PacketOuts skipped because the msg_out buffer or the switch '
+            'connection were too busy.')
+        self.profiler = Profiler()
+        #: Time of the immediate probes, to measure the discovery latency.
+        self._probed_at = {}
+        self.tracer = Tracer(settings.TRACE_SAMPLE_RATE,
+                             settings.TRACE_SUMMARY)
         if hasattr(settings, "FLOW_VLAN_VID"):
             self.vlan_id = settings.FLOW_VLAN_VID
-        self.execute_as_loop(self.polling_time)
+        self.execute_as_loop(self.pacer.interval(self.polling_time))
 
     def execute(self):
-        """Send LLDP Packets every 'POLLING_TIME' seconds to all switches."""
-        switches = list(self.controller.switches.values())
-        for switch in switches:
-            try:
-                of_version = switch.connection.protocol.version
-            except AttributeError:
-                of_version = None
-
-            if not switch.is_connected():
-                continue
-
-            if of_version == 0x01:
-                port_type = UBInt16
-                local_port = Port10.OFPP_LOCAL
-            elif of_version == 0x04:
-                port_type = UBInt32
-                local_port = Port13.OFPP_LOCAL
+        """Send LLDP Packets every 'POLLING_TIME' seconds to all switches.
+
+        The PacketOuts of a polling interval are spread across
+        ``settings.POLLING_SLOTS`` executions of this method, which also
+        notifies the links that were not seen for a while. With
+        ``settings.ADAPTIVE_PROBING`` each execution sends the PacketOuts of
+        the interfaces whose own probing interval elapsed instead.
+
+        Executions that take longer than their interval are counted as
+        overruns. With ``settings.EXECUTE_DEFER`` the PacketOuts not sent
+        within ``settings.EXECUTE_BUDGET`` times the interval are deferred
+        to the next execution.
+        """
+        with self.profiler.profile(cycle=True):
+            started = time.monotonic()
+            interval = self.pacer.interval(self.polling_time)
+            self.notify_expired_links()
+            self._prune_probed_at(started)
+            self._reconcile_eligible_interfaces()
+            if self.probe_scheduler is not None:
+                targets = self.probe_scheduler.due(
+                    self.eligible_interfaces.get,
+                    self.eligible_interfaces.pop_added())
             else:
-                # skip the current switch with unsupported OF version
-                continue
-
-            interfaces = list(switch.interfaces.values())
-            for interface in interfaces:
-                # Interface marked to receive lldp packet
-                # Only send LLDP packet to active interface
-                if(not interface.lldp or not interface.is_active()
-                   or not interface.is_enabled()):
-                    continue
-                # Avoid the interface that connects to the controller.
-                if interface.port_number == local_port:
-                    continue
-
-                lldp = LLDP()
-                lldp.chassis_id.sub_value = DPID(switch.dpid)
-                lldp.port_id.sub_value = port_type(interface.port_number)
-
-                ethernet = Ethernet()
-                ethernet.ether_type = EtherType.LLDP
-                ethernet.source = interface.address
-                ethernet.destination = constants.LLDP_MULTICAST_MAC
-                ethernet.data = lldp.pack()
-                # self.vlan_id == None will result in a packet with no VLAN.
-                ethernet.vlans.append(VLAN(vid=self.vlan_id))
-
-                packet_out = self._build_lldp_packet_out(
-                                    of_version,
-                                    interface.port_number, ethernet.pack())
-
-                if packet_out is None:
-                    continue
-
-                event_out = KytosEvent(
-                    name='kytos/of_lldp.messages.out.ofpt_packet_out',
-                    content={
-                            'destination': switch.connection,
-                            'message': packet_out})
-                self.controller.buffers.msg_out.put(event_out)
-                log.debug(
-                    "Sending a LLDP PacketOut to the switch %s",
-                    switch.dpid)
-
-                msg = '\n'
-                msg += 'Switch: %s (%s)\n'
-                msg += ' Interfaces: %s\n'
-                msg += ' -- LLDP PacketOut --\n'
-                msg += ' Ethernet: eth_type (%s) | src (%s) | dst (%s)'
-                msg += '\n'
-                msg += ' LLDP: Switch (%s) | port (%s)'
-
-                log.debug(
-                    msg,
-                    switch.connection.address, switch.dpid,
-                    switch.interfaces, ethernet.ether_type,
-                    ethernet.source, ethernet.destination,
-                    switch.dpid, interface.port_number)
+                targets = self.pacer.next_batch(self._get_lldp_targets)
+                self.link_tracker.timeout = self._get_link_timeout()
+            if self._warm_interfaces:
+                targets = self._add_warm_targets(targets)
+            deadline = None
+            if settings.EXECUTE_DEFER:
+                deadline = started + interval * settings.EXECUTE_BUDGET
+            targets, deferred = self._merge_deferred(targets)
+            if self.backpressure is not None:
+                targets = self._apply_backpressure(targets)
+            sent = self._send_lldp_packet_outs(targets, deadline, deferred)
+            duration = time.monotonic() - started
+            self.packet_out_cycle_histogram.observe(sent)
+            self.execute_histogram.observe(duration)
+            self.tracer.cycle(len(targets), sent, duration)
+            if self.state_store is not None:
+                self._save_links(started)
+            if duration > interval:
+                self.execute_overrun_counter.inc()
+                log.warning('Sending the LLDP packets took %.3f seconds, '
+                            'more than the polling loop interval of %s '
+                            'seconds.', duration, interval)
 
     @listen_to('kytos/topology.switch.(enabled|disabled)')
     def handle_lldp_flows(self, event):
@@ -111,7 +244,9 @@ class Main(KytosNApp):
 
         Install a flow to send LLDP packets to the controller. The proactive
         flow is installed whenever a switch is enabled. If the switch is
-        disabled the flow is removed.
+        disabled the flow is removed. The changes of
+        ``settings.FLOW_BATCH_WINDOW`` seconds are sent together by
+        :class:`FlowBatcher`, and opposite changes of a switch cancel out.
 
         Args:
             event (:class:`~kytos.core.events.KytosEvent`):
@@ -128,67 +263,198 @@ class Main(KytosNApp):
 
         flow = self._build_lldp_flow(of_version)
         if flow:
-            destination = switch.id
-            endpoint = f'{settings.FLOW_MANAGER_URL}/flows/{destination}'
-            data = {'flows': [flow]}
+            since = self._connected_at.pop(switch.id, None)
             if event.name == 'kytos/topology.switch.enabled':
-                requests.post(endpoint, json=data)
+                self.flow_batcher.install(switch.id, [flow], since)
             else:
-                requests.delete(endpoint, json=data)
+                self.flow_batcher.remove(switch.id, [flow])
 
     @listen_to('kytos/of_core.v0x0[14].messages.in.ofpt_packet_in')
     def notify_uplink_detected(self, event):
         """Dispatch two KytosEvents to notify identified NNI interfaces.
 
+        Known links are only notified again every ``settings.NNI_HEARTBEAT``
+        seconds, unless one of their interfaces changed. With
+        ``settings.LLDP_TIMESTAMP`` the round-trip time of the probe is added
+        to the latency statistics of the link, which are also notified.
+
         Args:
             event (:class:`~kytos.core.events.KytosEvent`):
                 Event with an LLDP packet as data.
 
         """
-        ethernet = self._unpack_non_empty(Ethernet, event.message.data)
-        if ethernet.ether_type == EtherType.LLDP:
-            try:
-                lldp = self._unpack_non_empty(LLDP, ethernet.data)
-                dpid = self._unpack_non_empty(DPID, lldp.chassis_id.sub_value)
-            except struct.error:
-                #: If we have a LLDP packet but we cannot unpack it, or the
-                #: unpacked packet does not contain the dpid attribute, then
-                #: we are dealing with a LLDP generated by someone else. Thus
-                #: this packet is not useful for us and we may just ignore it.
+        with self.profiler.profile():
+            self.packet_in_counter.inc()
+            data = event.message.data
+            if hasattr(data, 'value'):
+                data = data.value
+            if not is_lldp_frame(data):
+                self.not_lldp_counter.inc()
                 return
 
-            switch_a = event.source.switch
-            port_a = event.message.in_port
-            switch_b = None
-            port_b = None
+            decoded = self._decode_lldp(data)
+            if decoded is None:
+                return
+            dpid, port_b = decoded[:2]
 
+            switch_a = event.source.switch
             # in_port is currently a UBInt16 in v0x01 and an Int in v0x04.
-            if isinstance(port_a, int):
-                port_a = UBInt32(port_a)
-
-            try:
-                switch_b = self.controller.get_switch_by_dpid(dpid.value)
-                of_version = switch_b.connection.protocol.version
-                port_type = UBInt16 if of_version == 0x01 else UBInt32
-                port_b = self._unpack_non_empty(port_type,
-                                                lldp.port_id.sub_value)
-            except AttributeError:
-                log.debug("Couldn't find datapath %s.", dpid.value)
+            port_a = getattr(event.message.in_port, 'value',
+                             event.message.in_port)
 
             # Return if any of the needed information are not available
-            if not (switch_a and port_a and switch_b and port_b):
+            if not (switch_a and port_a and port_b):
                 return
 
-            interface_a = switch_a.get_interface_by_port_no(port_a.value)
-            interface_b = switch_b.get_interface_by_port_no(port_b.value)
+            interface_a = self._get_interface(switch_a.dpid, port_a)
+            interface_b = self._get_interface(dpid, port_b)
+            if interface_a is None or interface_b is None:
+                return
 
+            if self.probe_scheduler is not None:
+                self.probe_scheduler.seen(interface_a.id)
+                self.probe_scheduler.seen(interface_b.id)
+            probed_at = self._probed_at.pop(interface_b.id, None)
+            announce = self.link_tracker.seen(interface_a, interface_b)
+            latency = None
+            if len(decoded) > 2 and decoded[2] is not None:
+                latency = self._add_probe(interface_a, interface_b,
+                                          *decoded[2:])
+            if not announce:
+                self.nni_suppressed_counter.inc()
+                return
+            if probed_at is not None:
+                elapsed = time.monotonic() - probed_at
+                if elapsed <= self.link_tracker.timeout:
+                    self.discovery_histogram.observe(elapsed)
+
+            content = {'interface_a': interface_a, 'interface_b': interface_b}
+            if latency is not None:
+                content['latency'] = latency.as_dict()
             event_out = KytosEvent(name='kytos/of_lldp.interface.is.nni',
-                                   content={'interface_a': interface_a,
-                                            'interface_b': interface_b})
+                                   content=content)
+            self.controller.buffers.app.put(event_out)
+            self.nni_counter.inc()
+
+    @listen_to('kytos/of_core.handshake.completed')
+    def handle_switch_connected(self, event):
+        """Index the interfaces of a switch once it is connected.
+
+        Its interfaces become eligible to receive LLDP packets and are probed
+        right away. If the switch is enabled its LLDP flow is installed,
+        without waiting for ``kytos/topology.switch.enabled``. Otherwise the
+        connection time is kept to measure how long it takes to install it.
+
+        Args:
+            event (:class:`~kytos.core.events.KytosEvent`):
+                Event with the connected switch.
+
+        """
+        switch = event.content['switch']
+        self._connected_at[switch.id] = time.monotonic()
+        interfaces = list(switch.interfaces.values())
+        self._restore_lldp(interfaces)
+        self.interface_index.add_switch(switch)
+        self.eligible_interfaces.update_switch(switch)
+        self.interface_listing.invalidate()
+        if switch.is_enabled():
+            flow = self._build_lldp_flow(get_of_version(switch))
+            if flow:
+                self.flow_batcher.install(switch.id, [flow],
+                                          self._connected_at.pop(switch.id))
+        if self._warm_interfaces:
+            interfaces.sort(key=lambda interface:
+                            interface.id not in self._warm_interfaces)
+        self._probe_interfaces(switch, interfaces)
+
+    @listen_to('kytos/core.openflow.connection.lost')
+    def handle_connection_lost(self, event):
+        """Stop sending LLDP packets to a disconnected switch.
+
+        Its cached PacketOuts are discarded, as it may come back with other
+        ports or OpenFlow version.
+
+        Args:
+            event (:class:`~kytos.core.events.KytosEvent`):
+                Event with the lost connection as source.
+
+        """
+        switch = getattr(event.content['source'], 'switch', None)
+        if switch is not None:
+            self.eligible_interfaces.remove_switch(switch.dpid)
+            self.frame_cache.discard(switch.dpid)
+            self.probe_limiter.remove(switch.dpid)
+            if self.packet_out_limiter is not None:
+                self.packet_out_limiter.remove(switch.dpid)
+
+    @listen_to('kytos/topology.(switch|interface).(enabled|disabled)')
+    def handle_admin_status_changed(self, event):
+        """Update the eligible interfaces of a switch or an interface.
+
+        Args:
+            event (:class:`~kytos.core.events.KytosEvent`):
+                Event with the dpid of a switch or an interface.
+
+        """
+        interface = event.content.get('interface')
+        if interface is not None:
+            self.eligible_interfaces.update_interface(interface)
+            return
+        switch = self.controller.get_switch_by_dpid(event.content.get('dpid'))
+        if switch is not None:
+            self.eligible_interfaces.update_switch(switch)
+
+    @listen_to('kytos/of_core.switch.interface.'
+               '(created|modified|deleted|link_up|link_down)')
+    def handle_interface_changed(self, event):
+        """Update the index and the eligible interfaces.
+
+        The cached PacketOut of a deleted interface is discarded. The link
+        of an interface deleted or down is forgotten, so it is announced
+        again as soon as it is seen. An interface that is up and eligible is
+        probed right away.
+
+        Args:
+            event (:class:`~kytos.core.events.KytosEvent`):
+                Event with the created, modified or deleted interface.
+
+        """
+        interface = event.content['interface']
+        if event.name.endswith(('created', 'deleted')):
+            self.interface_listing.invalidate()
+        if event.name.endswith(('deleted', 'link_down')):
+            self.link_tracker.remove_interface(interface.id)
+        if event.name.endswith('created'):
+            self._restore_lldp([interface])
+        if event.name.endswith('deleted'):
+            self.interface_index.remove_interface(interface)
+            self.eligible_interfaces.remove_interface(interface)
+            self.frame_cache.discard(interface.switch.dpid,
+                                     interface.port_number)
+            self._sequences.pop(interface.id, None)
+            self._dropped.pop(interface.id, None)
+        else:
+            self.interface_index.add_interface(interface)
+            self.eligible_interfaces.update_interface(interface)
+            if self.probe_scheduler is not None:
+                self.probe_scheduler.reset(interface.id)
+            if not event.name.endswith('link_down'):
+                self._probe_interfaces(interface.switch, [interface])
+
+    def notify_expired_links(self):
+        """Dispatch a KytosEvent for each link that is no longer seen."""
+        for link in self.link_tracker.expire():
+            log.info('Link between %s and %s was not seen for %s seconds.',
+                     link.interface_a.id, link.interface_b.id,
+                     self.link_tracker.timeout)
+            event_out = KytosEvent(name='kytos/of_lldp.link.down',
+                                   content={'interface_a': link.interface_a,
+                                            'interface_b': link.interface_b})
             self.controller.buffers.app.put(event_out)
 
     def notify_lldp_change(self, state, interface_ids):
         """Dispatch a KytosEvent to notify changes to the LLDP status."""
+        self.interface_listing.invalidate()
         content = {'attribute': 'LLDP',
                    'state': state,
                    'interface_ids': interface_ids}
@@ -199,40 +465,379 @@ class Main(KytosNApp):
     def shutdown(self):
         """End of the application."""
         log.debug('Shutting down...')
-
-    @staticmethod
-    def _build_lldp_packet_out(version, port_number, data):
-        """Build a LLDP PacketOut message.
+        self.flow_batcher.shutdown()
+        self.flow_client.shutdown()
+        if self.state_store is not None:
+            self._save_links()
+            self.state_store.close()
+
+    def _restore_lldp(self, interfaces):
+        """Set the LLDP flag saved of some interfaces, if any."""
+        if not self._saved_lldp:
+            return
+        for interface in interfaces:
+            lldp = self._saved_lldp.pop(interface.id, None)
+            if lldp is not None:
+                interface.lldp = lldp
+
+    def _save_links(self, now=None):
+        """Save the links known, if they changed since the last save.
 
         Args:
-            version (int): OpenFlow version
-            port_number (int): Switch port number where the packet must be
-                forwarded to.
-            data (bytes): Binary data to be sent through the port.
+            now (float): Monotonic time of a periodic save, done every
+                ``settings.STATE_SAVE_INTERVAL`` seconds. None saves now.
+
+        """
+        # pylint: disable=attribute-defined-outside-init
+        if now is not None:
+            if now < self._next_save:
+                return
+            self._next_save = now + settings.STATE_SAVE_INTERVAL
+        links = {(link.interface_a.id, link.interface_b.id)
+                 for link in self.link_tracker.links()}
+        if links != self._saved_links:
+            self.state_store.save_links(links)
+            self._saved_links = links
+
+    def _add_warm_targets(self, targets):
+        """Add the interfaces of the links saved to the targets.
+
+        At startup, the eligible interfaces of the links saved in
+        ``settings.STATE_FILE`` are probed once ahead of the paced ones, so
+        the links known before a restart are found again in the first
+        execution after their switches connect. Those not eligible within
+        the link timeout are forgotten.
+        """
+        if time.monotonic() >= self._warm_until:
+            self._warm_interfaces.clear()
+            return targets
+        warm = []
+        for interface_id in list(self._warm_interfaces):
+            target = self.eligible_interfaces.get(interface_id)
+            if target is not None:
+                self._warm_interfaces.discard(interface_id)
+                if not self.link_tracker.has_link(interface_id):
+                    warm.append(target)
+        if not warm:
+            return targets
+        ids = {target[1].id for target in warm}
+        return warm + [target for target in targets
+                       if target[1].id not in ids]
+
+    def _decode_lldp(self, data):
+        """Return the ids, and the probe if enabled, of an LLDP frame.
 
         Returns:
-            PacketOut message for the specific given OpenFlow version, if it
-                is supported.
-            None if the OpenFlow version is not supported.
+            tuple: As returned by :func:`decode_lldp` or :func:`decode_probe`,
+                or None if the frame is truncated or was not sent by this
+                NApp.
 
         """
-        if version == 0x01:
-            action_output_class = AO10
-            packet_out_class = PO10
-        elif version == 0x04:
-            action_output_class = AO13
-            packet_out_class = PO13
+        try:
+            if self.frame_builder.probe:
+                decoded = decode_probe(data, strict=True)
+            else:
+                decoded = decode_lldp(data, strict=True)
+        except struct.error:
+            self.lldp_malformed_counter.inc()
+            return None
+        if decoded is None:
+            #: If we have a LLDP packet but we cannot decode it, or it does
+            #: not contain a dpid and a port number, then we are dealing with
+            #: a LLDP generated by someone else. Thus this packet is not
+            #: useful for us and we may just ignore it.
+            self.lldp_rejected_counter.inc()
+            return None
+        self.lldp_parsed_counter.inc()
+        return decoded
+
+    def _get_interface(self, dpid, port_number):
+        """Return the interface of a switch port.
+
+        Interfaces missing from the index are looked up in the controller and
+        added to it, so the index does not depend on receiving every event.
+        """
+        entry = self.interface_index.get(dpid, port_number)
+        if entry is not None:
+            return entry[0]
+
+        switch = self.controller.get_switch_by_dpid(dpid)
+        if switch is None:
+            log.debug("Couldn't find datapath %s.", dpid)
+            self.unknown_dpid_counter.inc()
+            return None
+        interface = switch.get_interface_by_port_no(port_number)
+        if interface is not None:
+            self.interface_index.add_interface(interface)
+        return interface
+
+    def _reconcile_eligible_interfaces(self):
+        """Rebuild the eligible interfaces from time to time.
+
+        The eligible interfaces are kept up to date by events. Every
+        ``settings.ELIGIBILITY_RECONCILE_ROUNDS`` polling intervals they are
+        rebuilt from the switches, to catch any change without an event.
+        """
+        # pylint: disable=attribute-defined-outside-init
+        self._ticks += 1
+        if self._ticks < (settings.ELIGIBILITY_RECONCILE_ROUNDS *
+                          self.pacer.slots):
+            return
+        self._ticks = 0
+        switches = list(self.controller.switches.values())
+        drift = self.eligible_interfaces.reconcile(switches)
+        self.interface_listing.reconcile(switches)
+        if drift:
+            log.info('%s LLDP eligible interfaces were out of date.', drift)
+            self.eligibility_drift_counter.inc(drift)
+
+    def _get_lldp_targets(self):
+        """Return the interfaces that must receive a LLDP PacketOut.
+
+        Returns:
+            list: Tuples of ``(switch, interface, of_version)``.
+
+        """
+        return self.eligible_interfaces.targets()
+
+    def _get_link_timeout(self):
+        """Return the seconds without LLDP packets before a link expires.
+
+        With adaptive probing a link may only be probed every
+        ``settings.PROBE_MAX_INTERVAL`` seconds. Otherwise it is probed once
+        per round of the pacer, which lasts longer than the polling interval
+        when the round needs extra slots for ``settings.POLLING_MAX_BATCH``.
+        """
+        if self.probe_scheduler is not None:
+            interval = max(self.polling_time,
+                           self.probe_scheduler.max_interval)
         else:
-            log.info('Openflow version %s is not yet supported.', version)
+            interval = self.pacer.round_time(self.polling_time)
+        return interval * settings.LINK_TIMEOUT_INTERVALS
+
+    def _probe_interfaces(self, switch, interfaces):
+        """Send LLDP PacketOuts to some interfaces of a switch right away.
+
+        The interfaces that are not eligible are skipped. The probes are
+        limited to ``settings.PROBE_RATE`` per second for each switch, with
+        bursts of ``settings.PROBE_BURST``, and count against the PacketOut
+        rate limits; the interfaces over the limits are probed by
+        :meth:`execute`. No token is taken from a limit unless both allow the
+        probe.
+        """
+        for interface in interfaces:
+            target = self.eligible_interfaces.get(interface.id)
+            if target is None:
+                continue
+            if not self.probe_limiter.check(switch.dpid) or (
+                    self.packet_out_limiter is not None
+                    and not self.packet_out_limiter.allow(switch.dpid)):
+                self.probe_limited_counter.inc()
+                continue
+            self.probe_limiter.allow(switch.dpid)
+            # Keep the times in order, so the old ones are pruned first.
+            self._probed_at.pop(interface.id, None)
+            self._probed_at[interface.id] = time.monotonic()
+            self._send_lldp_packet_out(*target)
+
+    def _prune_probed_at(self, now):
+        """Forget the immediate probes older than the link timeout.
+
+        The probes of interfaces without a link are never answered, and a
+        link found again later must not be measured from them.
+        """
+        timeout = self.link_tracker.timeout
+        while self._probed_at:
+            interface_id, probed_at = next(iter(self._probed_at.items()))
+            if now - probed_at <= timeout:
+                break
+            self._probed_at.pop(interface_id, None)
+
+    def _add_probe(self, interface_a, interface_b, timestamp, sequence):
+        """Add a probe received to the stats of its link.
+
+        The round-trip time is added to the latency of the link and the
+        sequence number to the loss and jitter of the probes sent through
+        ``interface_b``. Probes sent before the NApp started, or older than
+        the link timeout, are ignored.
+
+        Returns:
+            :class:`LatencyStats` of the link, or None if the probe was
+                ignored.
+
+        """
+        link = self.link_tracker.get(interface_a, interface_b)
+        rtt = (monotonic_ns() - timestamp) / 1e9
+        if link is None or not 0 <= rtt <= self.link_tracker.timeout:
             return None
+        if link.latency is None:
+            link.latency = LatencyStats(settings.LATENCY_EWMA_ALPHA,
+                                        settings.LATENCY_WINDOW)
+        link.latency.add(rtt)
+        probes = link.probes.get(interface_b.id)
+        if probes is None:
+            probes = link.probes[interface_b.id] = SequenceStats(
+                settings.LATENCY_WINDOW)
+        probes.add(sequence, rtt)
+        return link.latency
+
+    def _apply_backpressure(self, targets):
+        """Return the targets to be sent given the controller load.
+
+        While the msg_out buffer is over ``settings.BACKPRESSURE_HIGH``
+        events, and until it falls to ``settings.BACKPRESSURE_LOW``, only the
+        room left below the high watermark is used, by the interfaces
+        without a known link first, and the targets over it are deferred to
+        the next execution. The switches whose connection has more than
+        ``settings.BACKPRESSURE_CONNECTION_HIGH`` bytes to write are also
+        skipped, if that size is available, and probed in their next round.
+        """
+        depth = get_queue_depth(self.controller.buffers.msg_out)
+        if depth is not None:
+            self.msg_out_depth_histogram.observe(depth)
+            budget = self.backpressure.budget(depth)
+        else:
+            budget = None
+        busy = {}
+        allowed = []
+        for target in targets:
+            switch = target[0]
+            if switch.dpid not in busy:
+                size = get_write_buffer_size(switch.connection)
+                busy[switch.dpid] = (
+                    size is not None
+                    and size > settings.BACKPRESSURE_CONNECTION_HIGH)
+            if not busy[switch.dpid]:
+                allowed.append(target)
+        if budget is not None:
+            self.throttled_cycles_counter.inc()
+            allowed.sort(
+                key=lambda target: self.link_tracker.has_link(target[1].id))
+            self._deferred.extend(allowed[budget:])
+            del allowed[budget:]
+        if len(allowed) < len(targets):
+            self.throttled_counter.inc(len(targets) - len(allowed))
+        return allowed
+
+    def _merge_deferred(self, targets):
+        """Return the targets deferred by the previous execution first.
+
+        The deferred targets also in ``targets`` are only kept once, in
+        their new place. The targets dropped by the PacketOut rate limits
+        go right after the deferred ones, the ones dropped first before, so
+        the same targets are not dropped round after round.
 
-        output_action = action_output_class()
-        output_action.port = port_number
+        Returns:
+            tuple: The merged targets and the set of the interface ids of
+                the deferred ones.
+
+        """
+        targets = list(targets)
+        if self._dropped:
+            dropped = self._dropped
+            targets.sort(key=lambda target: dropped.get(target[1].id,
+                                                        math.inf))
+        # pylint: disable=attribute-defined-outside-init
+        deferred, self._deferred = self._deferred, []
+        if not deferred:
+            return targets, set()
+        interface_ids = {target[1].id for target in targets}
+        deferred = [target for target in deferred
+                    if target[1].id not in interface_ids]
+        return deferred + targets, {target[1].id for target in deferred}
+
+    def _send_lldp_packet_outs(self, targets, deadline=None, deferred=()):
+        """Send the LLDP PacketOuts of the targets.
+
+        If the monotonic ``deadline`` passes, the targets not sent yet are
+        deferred to the next execution. The targets over the PacketOut rate
+        limits are also deferred, once; if they were already ``deferred``,
+        by interface id, they are dropped, as they will be probed again
+        anyway, first in their next round.
+
+        Returns:
+            int: Number of PacketOuts sent.
+
+        """
+        sent = 0
+        for index, target in enumerate(targets):
+            if deadline is not None and time.monotonic() > deadline:
+                self._deferred.extend(targets[index:])
+                self.packet_out_deferred_counter.inc(len(targets) - index)
+                break
+            switch = target[0]
+            if not switch.is_connected():
+                continue
+            if (self.packet_out_limiter is not None
+                    and not self.packet_out_limiter.allow(switch.dpid)):
+                if target[1].id in deferred:
+                    self._dropped.setdefault(target[1].id, time.monotonic())
+                    self.packet_out_dropped_counter.inc()
+                else:
+                    self._deferred.append(target)
+                    self.packet_out_limited_counter.inc()
+                continue
+            if self._dropped:
+                self._dropped.pop(target[1].id, None)
+            sent += self._send_lldp_packet_out(*target)
+        return sent
 
-        packet_out = packet_out_class()
-        packet_out.data = data
-        packet_out.actions.append(output_action)
+    def _send_lldp_packet_out(self, switch, interface, of_version):
+        """Put the LLDP PacketOut of an interface in the msg_out buffer.
 
+        If the packet carries a probe TLV, a copy of it gets the next
+        sequence number of the interface. Its send time is written when
+        kytos.core packs it, right before sending it, so the round-trip time
+        does not include the wait in the msg_out buffer.
+
+        Returns:
+            bool: Whether the PacketOut was sent.
+
+        """
+        packet_out = self._get_lldp_packet_out(switch, interface, of_version)
+        if packet_out is None:
+            return False
+        sequence = None
+        if packet_out.probe_offset is not None:
+            sequence = self._sequences.get(interface.id, 0) + 1
+            self._sequences[interface.id] = sequence
+            packet_out = packet_out.stamp(sequence)
+
+        event_out = KytosEvent(
+            name='kytos/of_lldp.messages.out.ofpt_packet_out',
+            content={
+                    'destination': switch.connection,
+                    'message': packet_out})
+        self.controller.buffers.msg_out.put(event_out)
+        self.packet_out_sent_counter.inc()
+        if self.tracer.sampling:
+            self.tracer.packet_out(switch, interface, self.vlan_id, sequence)
+        return True
+
+    def _get_lldp_packet_out(self, switch, interface, of_version):
+        """Return the LLDP PacketOut of an interface, packing it if needed.
+
+        The message is built from a byte template and cached, so it is only
+        built again when the interface address, the VLAN or the switch
+        OpenFlow version change.
+        """
+        packet_out = self.frame_cache.get(switch.dpid, interface.port_number,
+                                          interface.address, self.vlan_id,
+                                          of_version)
+        if packet_out is not None:
+            return packet_out
+
+        packet_out = self.frame_builder.build(of_version, self.vlan_id,
+                                              switch.dpid,
+                                              interface.port_number,
+                                              interface.address)
+        if packet_out is None:
+            return None
+        self.packet_out_built_counter.inc()
+
+        self.frame_cache.put(switch.dpid, interface.port_number,
+                             interface.address, self.vlan_id, of_version,
+                             packet_out)
         return packet_out
 
     def _build_lldp_flow(self, version):
@@ -267,114 +872,260 @@ class Main(KytosNApp):
 
         return flow
 
-    @staticmethod
-    def _unpack_non_empty(desired_class, data):
-        """Unpack data using an instance of desired_class.
+    @rest('v1/interfaces', methods=['GET'])
+    def get_lldp_interfaces(self):
+        """Return the interfaces that have LLDP traffic enabled.
+
+        The optional ``lldp`` query argument lists the interfaces with LLDP
+        ``enabled``, the default, ``disabled`` or ``all``, and ``dpid`` those
+        of a single switch. With a ``limit`` the response also has the
+        ``next`` cursor, to be sent as ``cursor`` to get the next page. The
+        response has an ``ETag`` that only changes with the interfaces and
+        their LLDP state, so ``If-None-Match`` gets a 304 if nothing changed.
+        """
+        listing = self.interface_listing
+        etag = listing.etag
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        try:
+            limit = request.args.get('limit')
+            page = listing.page(list(self.controller.switches.values()),
+                                request.args.get('lldp', 'enabled'),
+                                request.args.get('dpid'),
+                                int(limit) if limit is not None else None,
+                                request.args.get('cursor'))
+        except ValueError as error:
+            msg = f"This operation is not completed: {error}"
+            return jsonify(msg), 400
+        response = Response(page, status=200, mimetype='application/json')
+        response.set_etag(etag)
+        return response
 
-        Args:
-            desired_class (class): The class to be used to unpack data.
-            data (bytes): bytes to be unpacked.
+    def _select_interfaces(self, data):
+        """Return the interfaces selected by a payload and the unmatched.
 
-        Return:
-            An instance of desired_class class with data unpacked into it.
+        The payload lists ``interfaces`` by id and ``switches`` by dpid,
+        has a glob ``pattern`` or a ``regex`` that match the whole interface
+        id, or ``all`` set to true. The interfaces are looked up in the
+        interface index. The ids, dpids, pattern or regex that select no
+        interface are returned as unmatched.
 
         Raises:
-            UnpackException if the unpack could not be performed.
+            re.error: If the regex is invalid.
 
         """
-        obj = desired_class()
-
-        if hasattr(data, 'value'):
-            data = data.value
-
-        obj.unpack(data)
-
-        return obj
-
-    @staticmethod
-    def _get_data(req):
-        """Get request data."""
-        data = req.get_json()  # Valid format { "interfaces": [...] }
-        return data.get('interfaces', [])
-
-    def _get_interfaces(self):
-        """Get all interfaces."""
-        interfaces = []
-        for switch in list(self.controller.switches.values()):
-            interfaces += list(switch.interfaces.values())
-        return interfaces
-
-    @staticmethod
-    def _get_interfaces_dict(interfaces):
-        """Return a dict of interfaces."""
-        return {inter.id: inter for inter in interfaces}
-
-    def _get_lldp_interfaces(self):
-        """Get interfaces enabled to receive LLDP packets."""
-        return [inter.id for inter in self._get_interfaces() if inter.lldp]
-
-    @rest('v1/interfaces', methods=['GET'])
-    def get_lldp_interfaces(self):
-        """Return all the interfaces that have LLDP traffic enabled."""
-        return jsonify({"interfaces": self._get_lldp_interfaces()}), 200
-
-    @rest('v1/interfaces/disable', methods=['POST'])
-    def disable_lldp(self):
-        """Disables an interface to receive LLDP packets."""
-        interface_ids = self._get_data(request)
-        error_list = []  # List of interfaces that were not activated.
-        changed_interfaces = []
-        interface_ids = filter(None, interface_ids)
-        interfaces = self._get_interfaces()
-        if not interfaces:
-            return jsonify("No interfaces were found."), 404
-        interfaces = self._get_interfaces_dict(interfaces)
-        for id_ in interface_ids:
-            interface = interfaces.get(id_)
+        index = self.interface_index
+        if data.get('all'):
+            return index.interfaces(), []
+        selected = {}
+        not_found = []
+        for id_ in filter(None, data.get('interfaces', [])):
+            interface = index.get_interface(id_) or self._find_interface(id_)
             if interface:
-                interface.lldp = False
-                changed_interfaces.append(id_)
+                selected[id_] = interface
             else:
-                error_list.append(id_)
-        if changed_interfaces:
-            self.notify_lldp_change('disabled', changed_interfaces)
+                not_found.append(id_)
+        for dpid in filter(None, data.get('switches', [])):
+            interfaces = index.get_switch_interfaces(dpid)
+            if not interfaces:
+                not_found.append(dpid)
+                continue
+            selected.update((interface.id, interface)
+                            for interface in interfaces)
+        for name in ('pattern', 'regex'):
+            expression = data.get(name)
+            if expression is None:
+                continue
+            interfaces = index.match(**{name: expression})
+            if not interfaces:
+                not_found.append(expression)
+            selected.update((interface.id, interface)
+                            for interface in interfaces)
+        return list(selected.values()), not_found
+
+    def _find_interface(self, interface_id):
+        """Return an interface missing from the index, indexing it."""
+        switch = self.controller.get_switch_by_dpid(
+            interface_id.rpartition(':')[0])
+        interface = switch and switch.interfaces.get(interface_id)
+        if interface:
+            self.interface_index.add_interface(interface)
+        return interface
+
+    def _change_lldp(self, lldp):
+        """Enable or disable LLDP on the interfaces selected by a request.
+
+        A single event notifies the change of every interface.
+        """
+        state, verb = ('enabled', 'activated') if lldp else ('disabled',
+                                                             'deactivated')
+        if not any(switch.interfaces
+                   for switch in list(self.controller.switches.values())):
+            return jsonify("No interfaces were found."), 404
+        try:
+            interfaces, error_list = self._select_interfaces(
+                request.get_json())
+        except re.error as error:
+            msg = f"This operation is not completed: {error}"
+            return jsonify(msg), 400
+        for interface in interfaces:
+            interface.lldp = lldp
+        self.eligible_interfaces.update_interfaces(interfaces)
+        if interfaces:
+            interface_ids = [interface.id for interface in interfaces]
+            if self.state_store is not None:
+                self.state_store.save_lldp(interface_ids, lldp)
+            self.notify_lldp_change(state, interface_ids)
         if not error_list:
             return jsonify(
-                "All the requested interfaces have been disabled."), 200
+                f"All the requested interfaces have been {state}."), 200
 
-        # Return a list of interfaces that couldn't be disabled
-        msg_error = "Some interfaces couldn't be found and deactivated: "
+        # Return a list of interfaces that couldn't be changed
+        msg_error = f"Some interfaces couldn't be found and {verb}: "
         return jsonify({msg_error:
                         error_list}), 400
 
+    @rest('v1/interfaces/disable', methods=['POST'])
+    def disable_lldp(self):
+        """Disables an interface to receive LLDP packets.
+
+        Besides the ``interfaces`` ids, the payload may select ``switches``
+        by dpid, a glob ``pattern`` or a ``regex`` of the interface ids, or
+        ``all`` the interfaces.
+        """
+        return self._change_lldp(False)
+
     @rest('v1/interfaces/enable', methods=['POST'])
     def enable_lldp(self):
-        """Enable an interface to receive LLDP packets."""
-        interface_ids = self._get_data(request)
-        error_list = []  # List of interfaces that were not activated.
-        changed_interfaces = []
-        interface_ids = filter(None, interface_ids)
-        interfaces = self._get_interfaces()
-        if not interfaces:
-            return jsonify("No interfaces were found."), 404
-        interfaces = self._get_interfaces_dict(interfaces)
-        for id_ in interface_ids:
-            interface = interfaces.get(id_)
-            if interface:
-                interface.lldp = True
-                changed_interfaces.append(id_)
-            else:
-                error_list.append(id_)
-        if changed_interfaces:
-            self.notify_lldp_change('enabled', changed_interfaces)
-        if not error_list:
-            return jsonify(
-                "All the requested interfaces have been enabled."), 200
+        """Enable an interface to receive LLDP packets.
 
-        # Return a list of interfaces that couldn't be enabled
-        msg_error = "Some interfaces couldn't be found and activated: "
-        return jsonify({msg_error:
-                        error_list}), 400
+        Besides the ``interfaces`` ids, the payload may select ``switches``
+        by dpid, a glob ``pattern`` or a ``regex`` of the interface ids, or
+        ``all`` the interfaces.
+        """
+        return self._change_lldp(True)
+
+    @rest('v1/links/latency', methods=['GET'])
+    def get_links_latency(self):
+        """Return the round-trip time statistics of the links, by link id.
+
+        Only links whose probes carry a send time, enabled by
+        ``settings.LLDP_TIMESTAMP``, have statistics. Times are in seconds.
+        """
+        links = {}
+        for link in self.link_tracker.links():
+            latency = link.latency
+            if latency is not None:
+                links[link.id] = {'interface_a': link.interface_a.id,
+                                  'interface_b': link.interface_b.id,
+                                  'latency': latency.as_dict()}
+        return jsonify({'links': links}), 200
+
+    @rest('v1/links/<link_id>/stats', methods=['GET'])
+    def get_link_stats(self, link_id):
+        """Return the statistics of the probes of a link.
+
+        The loss and the jitter are given for the probes sent through each
+        interface of the link. They need ``settings.LLDP_TIMESTAMP``. The
+        probes sent are counted up to the last one sent through the
+        interface, so the loss includes the probes not received yet.
+        """
+        link = self.link_tracker.find(link_id)
+        if link is None:
+            return jsonify(f'Link {link_id} not found.'), 404
+        now = time.monotonic()
+        latency = link.latency.as_dict() if link.latency else None
+        probes = {interface_id: stats.as_dict(
+                      self._sequences.get(interface_id))
+                  for interface_id, stats in list(link.probes.items())}
+        return jsonify({'id': link.id,
+                        'interface_a': link.interface_a.id,
+                        'interface_b': link.interface_b.id,
+                        'age': now - link.first_seen,
+                        'last_seen': now - link.last_seen,
+                        'latency': latency, 'probes': probes}), 200
+
+    @rest('v1/metrics', methods=['GET'])
+    def get_metrics(self):
+        """Return the counters and histograms of the NApp.
+
+        They are returned in the Prometheus text format, or as JSON if the
+        request accepts ``application/json`` but not ``text/plain``.
+        """
+        mimetype = request.accept_mimetypes.best_match(['text/plain',
+                                                        'application/json'])
+        if mimetype == 'application/json':
+            return jsonify(self.metrics.as_dict()), 200
+        return Response(self.metrics.as_text(), status=200,
+                        content_type=TEXT_CONTENT_TYPE)
+
+    @rest('v1/tracing', methods=['GET'])
+    def get_tracing(self):
+        """Get the tracing options of the LLDP PacketOuts."""
+        return jsonify(self.tracer.as_dict()), 200
+
+    @rest('v1/tracing', methods=['POST'])
+    def set_tracing(self):
+        """Set the tracing options of the LLDP PacketOuts.
+
+        The payload may have a ``sample_rate``, the fraction of the
+        PacketOuts to be logged, and ``summary``, whether to log a summary
+        of each polling loop.
+        """
+        try:
+            payload = request.get_json()
+            if not isinstance(payload, dict):
+                raise ValueError("expected a JSON object")
+            sample_rate = float(payload.get('sample_rate',
+                                            self.tracer.sample_rate))
+            summary = payload.get('summary', self.tracer.summary)
+            if not isinstance(summary, bool):
+                raise ValueError(f"invalid summary {summary}, "
+                                 "must be a boolean")
+            self.tracer.set_sample_rate(sample_rate)
+            self.tracer.summary = summary
+            log.info("LLDP tracing has been updated to %s, but this change "
+                     "will not be saved permanently.", self.tracer.as_dict())
+            return jsonify(self.tracer.as_dict()), 200
+        except (TypeError, ValueError) as error:
+            msg = f"This operation is not completed: {error}"
+            return jsonify(msg), 400
+
+    @rest('v1/profile', methods=['GET'])
+    def get_profile(self):
+        """Get the cProfile stats of the last cycles profiled.
+
+        The optional ``sort`` and ``limit`` query arguments choose the
+        :mod:`pstats` sort key, ``cumulative`` by default, and the maximum
+        number of functions, 50 by default.
+        """
+        try:
+            limit = int(request.args.get('limit', 50))
+            profile = self.profiler.as_dict(
+                request.args.get('sort', 'cumulative'), limit)
+            return jsonify(profile), 200
+        except (KeyError, ValueError) as error:
+            msg = f"This operation is not completed: {error}"
+            return jsonify(msg), 400
+
+    @rest('v1/profile', methods=['POST'])
+    def start_profile(self):
+        """Profile the next cycles of the polling loop.
+
+        The payload has the number of ``cycles``. The PacketIns handled
+        meanwhile are also profiled.
+        """
+        try:
+            payload = request.get_json()
+            self.profiler.start(int(payload['cycles']))
+            log.info("Profiling the next %s cycles of the LLDP polling "
+                     "loop.", self.profiler.remaining)
+            return jsonify("Profiling has been started."), 200
+        except (TypeError, ValueError, KeyError) as error:
+            msg = f"This operation is not completed: {error}"
+            return jsonify(msg), 400
 
     @rest('v1/polling_time', methods=['GET'])
     def get_time(self):
@@ -392,10 +1143,17 @@ class Main(KytosNApp):
                 raise ValueError(f"invalid polling_time {polling_time}, "
                                  "must be greater than zero")
             self.polling_time = polling_time
-            self.execute_as_loop(self.polling_time)
-            log.info("Polling time has been updated to %s"
-                     " second(s), but this change will not be saved"
-                     " permanently.", self.polling_time)
+            self.link_tracker.timeout = self._get_link_timeout()
+            self.execute_as_loop(self.pacer.interval(self.polling_time))
+            if self.state_store is not None:
+                self.state_store.save_setting('polling_time',
+                                              self.polling_time)
+                log.info("Polling time has been updated to %s second(s).",
+                         self.polling_time)
+            else:
+                log.info("Polling time has been updated to %s"
+                         " second(s), but this change will not be saved"
+                         " permanently.", self.polling_time)
             return jsonify("Polling time has been updated."), 200
         except (ValueError, KeyError) as error:
             msg = f"This operation is not completed: {error}"
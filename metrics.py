@@ -0,0 +1,130 @@
+"""Counters and histograms of the of_lldp NApp."""
+from bisect import bisect_left
+
+#: Content type of the Prometheus text exposition format.
+TEXT_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+#: Default histogram buckets for latencies, in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Counter:
+    """Monotonic counter.
+
+    Counters are created once and kept by their users, so incrementing one
+    in a hot path is a single attribute update.
+    """
+
+    __slots__ = ('name', 'description', 'value')
+
+    kind = 'counter'
+
+    def __init__(self, name, description):
+        """Create a counter starting at zero."""
+        self.name = name
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Increment the counter."""
+        self.value += amount
+
+    def samples(self):
+        """Return the lines of the counter in the Prometheus text format."""
+        return [f'{self.name} {format_value(self.value)}']
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets."""
+
+    __slots__ = ('name', 'description', 'bounds', 'counts', 'sum', 'count')
+
+    kind = 'histogram'
+
+    def __init__(self, name, description, bounds):
+        """Create a histogram with the given bucket upper bounds."""
+        self.name = name
+        self.description = description
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Add a value to the histogram."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def value(self):
+        """Return the histogram as a dict with cumulative bucket counts."""
+        buckets = {}
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            buckets[str(bound)] = total
+        buckets['+Inf'] = self.count
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+    def samples(self):
+        """Return the lines of the histogram in the Prometheus text format."""
+        lines = []
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            lines.append(f'{self.name}_bucket{{le="{format_value(bound)}"}} '
+                         f'{total}')
+        total += self.counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {total}')
+        lines.append(f'{self.name}_sum {format_value(self.sum)}')
+        lines.append(f'{self.name}_count {total}')
+        return lines
+
+
+def format_value(value):
+    """Return a number as written in the Prometheus text format."""
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metrics:
+    """Registry of the NApp counters and histograms."""
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._metrics = {}
+
+    def counter(self, name, description):
+        """Return the counter with the given name, creating it if needed."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name, description)
+        return metric
+
+    def histogram(self, name, description, bounds=LATENCY_BUCKETS):
+        """Return the histogram with the given name, creating it if needed."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(name, description,
+                                                     bounds)
+        return metric
+
+    def as_dict(self):
+        """Return the current value of every metric by name."""
+        return {name: metric.value for name, metric in self._metrics.items()}
+
+    def as_text(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            description = metric.description.replace('\\', r'\\')
+            description = description.replace('\n', r'\n')
+            lines.append(f'# HELP {metric.name} {description}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
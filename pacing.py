@@ -0,0 +1,101 @@
+"""Spread the LLDP PacketOuts of a polling interval across time slots."""
+import zlib
+
+#: Spread the interfaces evenly, regardless of their switch.
+EVEN = 'even'
+#: Send all the interfaces of a switch in the same slot, chosen by dpid hash.
+DPID_HASH = 'dpid'
+
+
+class SendPacer:
+    """Split the LLDP targets of a polling interval in batches.
+
+    The polling interval is divided in ``slots`` executions. The targets are
+    collected once at the beginning of each round and each execution sends
+    only its batch, so the controller load is flat along the interval. With
+    a single slot every target is sent at once, as a burst.
+
+    With ``max_batch``, the targets over it in a slot spill into the next
+    slots with room. If every slot is full, the round gets extra slots, so
+    it lasts longer than the polling interval instead of sending a burst.
+    """
+
+    def __init__(self, slots=1, mode=EVEN, max_batch=None):
+        """Create a pacer.
+
+        Args:
+            slots (int): Number of executions per polling interval.
+            mode (str): :data:`EVEN` or :data:`DPID_HASH`.
+            max_batch (int): Maximum number of targets per execution, or
+                None for no limit.
+
+        Raises:
+            ValueError: If the number of slots, the mode or the maximum batch
+                are invalid.
+
+        """
+        if slots < 1:
+            raise ValueError(f'invalid number of slots {slots}, '
+                             'must be greater than zero')
+        if mode not in (EVEN, DPID_HASH):
+            raise ValueError(f'invalid pacing mode {mode}')
+        if max_batch is not None and max_batch < 1:
+            raise ValueError(f'invalid maximum batch {max_batch}, '
+                             'must be greater than zero')
+        self.slots = slots
+        self.mode = mode
+        self.max_batch = max_batch
+        self._slot = 0
+        self._batches = [[] for _ in range(slots)]
+
+    def interval(self, polling_time):
+        """Return the time between executions for a polling interval."""
+        return polling_time / self.slots
+
+    def round_time(self, polling_time):
+        """Return the time the current round takes for a polling interval.
+
+        It is the polling interval, unless the round has extra slots for the
+        targets over ``max_batch``.
+        """
+        return self.interval(polling_time) * len(self._batches)
+
+    def next_batch(self, get_targets):
+        """Return the targets to be sent in the current slot.
+
+        Args:
+            get_targets (callable): Called at the beginning of each round to
+                return an iterable of ``(switch, interface, of_version)``.
+
+        """
+        if self._slot == 0:
+            self._plan(get_targets())
+        batch = self._batches[self._slot]
+        self._slot = (self._slot + 1) % len(self._batches)
+        return batch
+
+    def _plan(self, targets):
+        """Distribute the targets of a round among the slots."""
+        batches = [[] for _ in range(self.slots)]
+        if self.mode == DPID_HASH:
+            for target in targets:
+                slot = zlib.crc32(target[0].dpid.encode()) % self.slots
+                batches[slot].append(target)
+        else:
+            for index, target in enumerate(targets):
+                batches[index % self.slots].append(target)
+        if self.max_batch is not None:
+            self._spill(batches)
+        self._batches = batches
+
+    def _spill(self, batches):
+        """Move the targets over the maximum batch to the next slots."""
+        overflow = []
+        # The second pass moves the overflow of the last slots to the first.
+        for batch in batches + batches:
+            batch.extend(overflow)
+            overflow = batch[self.max_batch:]
+            del batch[self.max_batch:]
+        while overflow:
+            batches.append(overflow[:self.max_batch])
+            del overflow[:self.max_batch]
@@ -0,0 +1,125 @@
+"""Keep the LLDP state of the NApp across restarts in an SQLite file."""
+import json
+import sqlite3
+from threading import Lock
+
+from kytos.core import log
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS interfaces (
+    id TEXT PRIMARY KEY,
+    lldp INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    interface_a TEXT NOT NULL,
+    interface_b TEXT NOT NULL,
+    PRIMARY KEY (interface_a, interface_b)
+);
+'''
+
+
+class SavedState:
+    """State loaded from a :class:`StateStore`."""
+
+    __slots__ = ('lldp', 'settings', 'links')
+
+    def __init__(self, lldp=None, settings=None, links=None):
+        """Create a state, empty by default."""
+        #: LLDP flag of the interfaces changed through the REST API, by id.
+        self.lldp = lldp or {}
+        #: Values of the settings changed through the REST API, by name.
+        self.settings = settings or {}
+        #: Interface ids of the links last known, as pairs.
+        self.links = links or []
+
+
+class StateStore:
+    """SQLite file with the LLDP flags, settings and links of the NApp.
+
+    The flags and settings are written when they change and the links are
+    replaced by a snapshot of the link table. The writes come from the REST
+    and polling loop threads, so they share a connection under a lock. The
+    database errors are logged and the NApp goes on without that change.
+    """
+
+    def __init__(self, path):
+        """Open or create the file.
+
+        Raises:
+            sqlite3.Error: If the file cannot be opened.
+
+        """
+        self.path = path
+        self._connection = sqlite3.connect(str(path),
+                                           check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = Lock()
+
+    def load(self):
+        """Return the :class:`SavedState`, empty if it cannot be read."""
+        try:
+            with self._lock:
+                cursor = self._connection.cursor()
+                lldp = {interface_id: bool(lldp) for interface_id, lldp in
+                        cursor.execute('SELECT id, lldp FROM interfaces')}
+                settings = {name: json.loads(value) for name, value in
+                            cursor.execute('SELECT name, value FROM settings')}
+                links = cursor.execute(
+                    'SELECT interface_a, interface_b FROM links').fetchall()
+        except (sqlite3.Error, ValueError) as error:
+            log.error('Could not load the LLDP state from %s: %s',
+                      self.path, error)
+            return SavedState()
+        return SavedState(lldp, settings, links)
+
+    def _write(self, statements):
+        """Run ``(sql, rows)`` statements in a single transaction."""
+        try:
+            with self._lock, self._connection:
+                for sql, rows in statements:
+                    self._connection.executemany(sql, rows)
+        except sqlite3.Error as error:
+            log.error('Could not save the LLDP state to %s: %s', self.path,
+                      error)
+
+    def save_lldp(self, interface_ids, lldp):
+        """Save the LLDP flag of some interfaces."""
+        self._write([('INSERT OR REPLACE INTO interfaces VALUES (?, ?)',
+                      ((interface_id, int(lldp))
+                       for interface_id in interface_ids))])
+
+    def save_setting(self, name, value):
+        """Save the value of a setting."""
+        self._write([('INSERT OR REPLACE INTO settings VALUES (?, ?)',
+                      [(name, json.dumps(value))])])
+
+    def save_links(self, links):
+        """Replace the links by pairs of interface ids."""
+        self._write([('DELETE FROM links', [()]),
+                     ('INSERT INTO links VALUES (?, ?)', links)])
+
+    def close(self):
+        """Close the file."""
+        with self._lock:
+            self._connection.close()
+
+
+def open_store(path):
+    """Return the :class:`StateStore` of a file and its state.
+
+    Returns:
+        tuple: The store, or None if the file cannot be opened, and the
+            :class:`SavedState`.
+
+    """
+    try:
+        store = StateStore(path)
+    except sqlite3.Error as error:
+        log.error('Could not open %s, the LLDP state will not be saved: %s',
+                  path, error)
+        return None, SavedState()
+    return store, store.load()
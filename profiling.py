@@ -0,0 +1,121 @@
+"""Profile the polling loop and the PacketIns on demand."""
+import cProfile
+import io
+import pstats
+from threading import Lock
+
+
+class _NotProfiling:
+    """Context manager that does nothing, used while not profiling."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOT_PROFILING = _NotProfiling()
+
+
+class _Profiling:
+    """Profile the block of code run in the current thread."""
+
+    __slots__ = ('profiler', 'cycle', 'profile')
+
+    def __init__(self, profiler, cycle):
+        self.profiler = profiler
+        self.cycle = cycle
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.profiler.add(self.profile, self.cycle)
+        return False
+
+
+class Profiler:
+    """Aggregate the cProfile stats of the next cycles of the polling loop.
+
+    Every block run with :meth:`profile` while there are cycles remaining is
+    profiled, e.g. the PacketIns handled in other threads meanwhile, and the
+    stats are added together. While not profiling, :meth:`profile` returns a
+    shared context manager that does nothing.
+    """
+
+    def __init__(self):
+        """Create a profiler that is not profiling."""
+        #: Cycles of the polling loop still to be profiled.
+        self.remaining = 0
+        #: Cycles of the polling loop profiled so far.
+        self.cycles = 0
+        self._stats = None
+        self._lock = Lock()
+
+    def start(self, cycles):
+        """Profile the next cycles, discarding the previous stats.
+
+        Raises:
+            ValueError: If the number of cycles is not positive.
+
+        """
+        if cycles < 1:
+            raise ValueError(f'invalid number of cycles {cycles}, '
+                             'must be greater than zero')
+        with self._lock:
+            self.remaining = cycles
+            self.cycles = 0
+            self._stats = None
+
+    def profile(self, cycle=False):
+        """Return a context manager that profiles its block if needed.
+
+        Args:
+            cycle (bool): Whether the block is a cycle of the polling loop,
+                counted when it ends.
+
+        """
+        if not self.remaining:
+            return NOT_PROFILING
+        return _Profiling(self, cycle)
+
+    def add(self, profile, cycle=False):
+        """Add the stats of a :class:`cProfile.Profile`."""
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            if cycle and self.remaining:
+                self.remaining -= 1
+                self.cycles += 1
+
+    def report(self, sort='cumulative', limit=50):
+        """Return the stats as text, or None if nothing was profiled.
+
+        Args:
+            sort (str): :meth:`pstats.Stats.sort_stats` key.
+            limit (int): Maximum number of functions.
+
+        Raises:
+            KeyError: If the sort key is invalid.
+
+        """
+        with self._lock:
+            if self._stats is None:
+                return None
+            stream = io.StringIO()
+            self._stats.stream = stream
+            self._stats.sort_stats(sort).print_stats(limit)
+            return stream.getvalue()
+
+    def as_dict(self, sort='cumulative', limit=50):
+        """Return the cycles profiled and remaining, and the stats."""
+        return {'cycles': self.cycles, 'remaining': self.remaining,
+                'stats': self.report(sort, limit)}
@@ -0,0 +1,151 @@
+"""Token bucket rate limiting."""
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """Allow ``rate`` operations per second, with bursts up to ``capacity``.
+
+    The bucket starts full and is refilled lazily when tokens are taken, so
+    it needs no timer.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity, now=None):
+        """Create a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def refill(self, now=None):
+        """Add the tokens earned since the last update and return them all."""
+        now = time.monotonic() if now is None else now
+        elapsed = max(now - self.updated, 0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def consume(self, tokens=1, now=None):
+        """Take tokens from the bucket.
+
+        Returns:
+            bool: True if there were enough tokens, False otherwise, in which
+                case no token is taken.
+
+        """
+        if self.refill(now) < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+
+class RateLimiter:
+    """Keep a :class:`TokenBucket` for each key, e.g. each switch."""
+
+    def __init__(self, rate, burst):
+        """Create a rate limiter.
+
+        Args:
+            rate (float): Operations per second allowed for each key.
+            burst (float): Operations allowed at once for each key.
+
+        Raises:
+            ValueError: If the rate or the burst are not positive.
+
+        """
+        if rate <= 0 or burst <= 0:
+            raise ValueError(f'invalid rate {rate} or burst {burst}, '
+                             'must be greater than zero')
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = Lock()
+
+    def allow(self, key, tokens=1, now=None):
+        """Return whether ``tokens`` operations are allowed now for a key."""
+        with self._lock:
+            return self._get_bucket(key, now).consume(tokens, now)
+
+    def check(self, key, tokens=1, now=None):
+        """Return whether ``tokens`` operations are allowed, taking none."""
+        with self._lock:
+            return self._get_bucket(key, now).refill(now) >= tokens
+
+    def get_bucket(self, key, now=None):
+        """Return the bucket of a key, creating it if needed."""
+        with self._lock:
+            return self._get_bucket(key, now)
+
+    def _get_bucket(self, key, now=None):
+        """Return the bucket of a key, holding the lock."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst,
+                                                      now)
+        return bucket
+
+    def remove(self, key):
+        """Forget the bucket of a key."""
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class GlobalRateLimiter:
+    """Limit the operations of each key and of all the keys together.
+
+    An operation is allowed only if both the bucket of its key and the
+    global bucket have enough tokens, and otherwise no token is taken.
+    Either limit is turned off by a None rate.
+    """
+
+    def __init__(self, rate=None, burst=None, key_rate=None, key_burst=None):
+        """Create a rate limiter.
+
+        Args:
+            rate (float): Operations per second allowed for all the keys, or
+                None for no global limit.
+            burst (float): Operations allowed at once for all the keys.
+            key_rate (float): Operations per second allowed for each key, or
+                None for no limit per key.
+            key_burst (float): Operations allowed at once for each key.
+
+        Raises:
+            ValueError: If a rate or a burst are not positive.
+
+        """
+        self._global = None
+        if rate is not None:
+            if rate <= 0 or burst is None or burst <= 0:
+                raise ValueError(f'invalid rate {rate} or burst {burst}, '
+                                 'must be greater than zero')
+            self._global = TokenBucket(rate, burst)
+        self._keys = None
+        if key_rate is not None:
+            self._keys = RateLimiter(key_rate, key_burst)
+        self._lock = Lock()
+
+    def allow(self, key, tokens=1, now=None):
+        """Return whether ``tokens`` operations are allowed now for a key."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            buckets = [] if self._global is None else [self._global]
+            if self._keys is not None:
+                buckets.append(self._keys.get_bucket(key, now))
+            if any(bucket.refill(now) < tokens for bucket in buckets):
+                return False
+            for bucket in buckets:
+                bucket.tokens -= tokens
+            return True
+
+    def remove(self, key):
+        """Forget the bucket of a key."""
+        if self._keys is not None:
+            self._keys.remove(key)
+
+    def __len__(self):
+        return len(self._keys) if self._keys is not None else 0
@@ -3,5 +3,111 @@ FLOW_VLAN_VID = 3799
 FLOW_PRIORITY = 1000
 TABLE_ID = 0
 POLLING_TIME = 3
+# The LLDP PacketOuts of each polling interval are spread across
+# POLLING_SLOTS sends, 'POLLING_TIME / POLLING_SLOTS' seconds apart.
+# Use 1 to send all of them at once, in a single burst.
+POLLING_SLOTS = 10
+# How the interfaces are distributed among the slots: 'even' spreads them
+# evenly and 'dpid' sends all the interfaces of a switch in the same slot,
+# chosen by the hash of its dpid.
+POLLING_SLOT_MODE = 'even'
+# Maximum number of LLDP PacketOuts of a slot. The ones over it are sent in
+# the next slots with room, and if every slot is full the polling interval
+# gets extra slots, taking longer instead of sending bigger bursts, and the
+# link timeout grows with it. Use None for no limit.
+POLLING_MAX_BATCH = 1000
+# A link is considered down after LINK_TIMEOUT_INTERVALS polling intervals
+# without receiving its LLDP packets.
+LINK_TIMEOUT_INTERVALS = 3
+# A known link is announced again, through kytos/of_lldp.interface.is.nni,
+# every NNI_HEARTBEAT seconds. Use 0 to announce it on every LLDP received.
+NNI_HEARTBEAT = 60
 
 FLOW_MANAGER_URL = 'http://localhost:8181/api/kytos/flow_manager/v2'
+# Requests to flow_manager: timeout in seconds, number of retries after the
+# first attempt, seconds before the first retry (doubled on each retry) and
+# maximum number of concurrent requests.
+FLOW_MANAGER_TIMEOUT = 10
+FLOW_MANAGER_RETRIES = 3
+FLOW_MANAGER_BACKOFF = 0.5
+FLOW_MANAGER_MAX_WORKERS = 4
+# Seconds to hold the LLDP flow changes of switches enabled or disabled, so
+# they are sent together. With 0 each change is sent at once.
+FLOW_BATCH_WINDOW = 0.5
+
+# The interfaces eligible to receive LLDP packets are updated by events and
+# rebuilt from all the switches every ELIGIBILITY_RECONCILE_ROUNDS polling
+# intervals, to fix any drift.
+ELIGIBILITY_RECONCILE_ROUNDS = 10
+
+# With ADAPTIVE_PROBING each interface is probed at its own interval instead
+# of every POLLING_TIME seconds. New interfaces and interfaces whose port
+# status changed are probed every PROBE_MIN_INTERVAL seconds. The interval
+# grows PROBE_BACKOFF times after each probe, up to PROBE_MAX_INTERVAL for
+# interfaces with a link and PROBE_EDGE_INTERVAL for interfaces without one.
+# Links then expire after LINK_TIMEOUT_INTERVALS times PROBE_MAX_INTERVAL.
+ADAPTIVE_PROBING = False
+PROBE_MIN_INTERVAL = 1
+PROBE_MAX_INTERVAL = 30
+PROBE_EDGE_INTERVAL = 120
+PROBE_BACKOFF = 2
+
+# Interfaces are probed right away when their switch connects or their port
+# comes up, at most PROBE_RATE probes per second for each switch, with bursts
+# of PROBE_BURST. The rest are probed at the next polling interval.
+PROBE_RATE = 20
+PROBE_BURST = 50
+
+# With LLDP_TIMESTAMP the LLDP packets carry an organizationally specific TLV
+# with their send time and a sequence number, used to measure the round-trip
+# time of each link. Its moving average gives each new sample a weight of
+# LATENCY_EWMA_ALPHA and its percentiles use the last LATENCY_WINDOW samples.
+LLDP_TIMESTAMP = False
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_WINDOW = 64
+
+# A summary of each polling loop is logged at the debug level if
+# TRACE_SUMMARY is set, and a fraction TRACE_SAMPLE_RATE of the LLDP
+# PacketOuts is logged at the info level. Both can be changed at runtime
+# through the v1/tracing endpoint.
+TRACE_SUMMARY = True
+TRACE_SAMPLE_RATE = 0
+
+# Each execution of the polling loop should take less than its interval,
+# POLLING_TIME / POLLING_SLOTS, and longer ones are counted as overruns. With
+# EXECUTE_DEFER the LLDP PacketOuts not sent within EXECUTE_BUDGET times the
+# interval are deferred to the next execution.
+EXECUTE_DEFER = False
+EXECUTE_BUDGET = 0.8
+
+# The LLDP PacketOuts sent to each switch connection are limited to
+# PACKET_OUT_SWITCH_RATE per second, with bursts of PACKET_OUT_SWITCH_BURST,
+# and those sent to all the switches to PACKET_OUT_RATE per second, with
+# bursts of PACKET_OUT_BURST. None turns a limit off. PacketOuts over the
+# limits are deferred to the next execution of the polling loop, and dropped
+# if they are over the limits again. The dropped ones go first in their next
+# round, so every interface is probed in turn.
+PACKET_OUT_RATE = None
+PACKET_OUT_BURST = None
+PACKET_OUT_SWITCH_RATE = 200
+PACKET_OUT_SWITCH_BURST = 200
+
+# While the msg_out buffer of the controller has BACKPRESSURE_HIGH events or
+# more, and until it falls to BACKPRESSURE_LOW, the LLDP PacketOuts of each
+# execution of the polling loop are limited to the room left below
+# BACKPRESSURE_HIGH, those of interfaces without a known link first. None
+# turns it off. Switches whose connection socket has more than
+# BACKPRESSURE_CONNECTION_HIGH bytes in its send queue, not received by the
+# switch yet, are skipped. That size is only available on Linux.
+BACKPRESSURE_HIGH = 10000
+BACKPRESSURE_LOW = 1000
+BACKPRESSURE_CONNECTION_HIGH = 65536
+
+# SQLite file where the LLDP flags and the polling time set through the REST
+# API and the links discovered are kept across restarts, e.g.
+# '/var/lib/kytos/of_lldp.sqlite3'. None keeps nothing. At startup the
+# interfaces of the links saved are probed first, so they are found again
+# in the first polling loop. The links are saved every STATE_SAVE_INTERVAL
+# seconds, if they changed, and on shutdown.
+STATE_FILE = None
+STATE_SAVE_INTERVAL = 60
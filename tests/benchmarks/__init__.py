@@ -0,0 +1 @@
+"""Benchmarks of the of_lldp NApp."""
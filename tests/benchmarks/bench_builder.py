@@ -0,0 +1,50 @@
+"""Compare the LLDP template builder with python-openflow packing.
+
+Run with ``python -m tests.benchmarks.bench_builder`` from the NApp folder.
+"""
+import sys
+import timeit
+
+from napps.kytos.of_lldp.builder import (LLDPFrameBuilder,
+                                         pack_lldp_packet_out)
+
+#: Minimum speedup expected from the template builder.
+MIN_SPEEDUP = 10
+NUMBER = 2000
+DPID = '00:00:00:00:00:00:00:01'
+ADDRESS = 'aa:bb:cc:dd:ee:ff'
+
+
+def bench(version, vlan_id):
+    """Return the time per frame of both builders, in microseconds."""
+    builder = LLDPFrameBuilder()
+    builder.get_template(version, vlan_id)
+
+    def pyof():
+        pack_lldp_packet_out(version, vlan_id, DPID, 1, ADDRESS).pack()
+
+    def template():
+        builder.build(version, vlan_id, DPID, 1, ADDRESS).pack()
+
+    pyof_time = min(timeit.repeat(pyof, number=NUMBER, repeat=3))
+    template_time = min(timeit.repeat(template, number=NUMBER, repeat=3))
+    return pyof_time / NUMBER * 1e6, template_time / NUMBER * 1e6
+
+
+def main():
+    """Print the results and fail if the speedup is below MIN_SPEEDUP."""
+    failed = False
+    print(f"{'version':>8} {'vlan':>5} {'pyof (us)':>10} "
+          f"{'template (us)':>14} {'speedup':>8}")
+    for version in (0x01, 0x04):
+        for vlan_id in (None, 3799):
+            pyof_us, template_us = bench(version, vlan_id)
+            speedup = pyof_us / template_us
+            failed |= speedup < MIN_SPEEDUP
+            print(f'{version:>#8x} {str(vlan_id):>5} {pyof_us:>10.2f} '
+                  f'{template_us:>14.2f} {speedup:>7.1f}x')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Compare the struct LLDP decoder with python-openflow unpacking.
+
+Run with ``python -m tests.benchmarks.bench_decoder`` from the NApp folder.
+"""
+import sys
+import timeit
+
+from pyof.foundation.basic_types import DPID, UBInt16, UBInt32
+from pyof.foundation.network_types import LLDP, Ethernet
+
+from napps.kytos.of_lldp.decoder import decode_lldp
+from tests.helpers import get_lldp_frame
+
+NUMBER = 2000
+DPID_VALUE = '00:00:00:00:00:00:00:01'
+
+
+def decode_pyof(data, of_version):
+    """Decode a LLDP frame the way of_lldp did before the struct decoder."""
+    ethernet = Ethernet()
+    ethernet.unpack(data)
+    lldp = LLDP()
+    lldp.unpack(ethernet.data.value)
+    dpid = DPID()
+    dpid.unpack(lldp.chassis_id.sub_value.value)
+    port = UBInt16() if of_version == 0x01 else UBInt32()
+    port.unpack(lldp.port_id.sub_value.value)
+    return dpid.value, port.value
+
+
+def bench(of_version, vlan_id):
+    """Return the time per frame of both decoders, in microseconds."""
+    frame = get_lldp_frame(DPID_VALUE, 1, of_version, vlan_id)
+    assert decode_pyof(frame, of_version) == decode_lldp(frame)
+
+    pyof_time = min(timeit.repeat(lambda: decode_pyof(frame, of_version),
+                                  number=NUMBER, repeat=3))
+    struct_time = min(timeit.repeat(lambda: decode_lldp(frame),
+                                    number=NUMBER, repeat=3))
+    return pyof_time / NUMBER * 1e6, struct_time / NUMBER * 1e6
+
+
+def main():
+    """Print the time per frame of both decoders."""
+    print(f"{'version':>8} {'vlan':>5} {'pyof (us)':>10} "
+          f"{'struct (us)':>12} {'speedup':>8}")
+    for of_version in (0x01, 0x04):
+        for vlan_id in (None, 3799):
+            pyof_us, struct_us = bench(of_version, vlan_id)
+            print(f'{of_version:>#8x} {str(vlan_id):>5} {pyof_us:>10.2f} '
+                  f'{struct_us:>12.2f} {pyof_us / struct_us:>7.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
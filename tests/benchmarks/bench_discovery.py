@@ -0,0 +1,284 @@
+"""Simulate the discovery of a fabric of switches, end to end.
+
+Run with ``python -m tests.benchmarks.bench_discovery`` from the NApp folder.
+
+The msg_out buffer of the controller is replaced by a simulated fabric that
+turns each LLDP PacketOut into a PacketIn on the peer port of the link, after
+a delay and unless it is lost. The simulation runs on a virtual clock, so
+thousands of switches are discovered in seconds. It reports the time until
+every link was notified as an NNI and the PacketIn load on the controller,
+and writes the results as JSON to ``--output``.
+"""
+import argparse
+import heapq
+import json
+import platform
+import random
+import struct
+import sys
+import time
+from itertools import count
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from kytos.lib.helpers import get_controller_mock
+from napps.kytos.of_lldp import settings
+from napps.kytos.of_lldp.decoder import decode_lldp
+from tests.benchmarks.fabric import fat_tree, random_graph, ring
+
+#: Topology generators by name, called with the size.
+TOPOLOGIES = {'fat-tree': fat_tree, 'ring': ring, 'random': random_graph}
+#: Length of the fixed part of a PacketOut and offset of its actions length,
+#: by OpenFlow version.
+PACKET_OUT_HEADERS = {0x01: (16, 14), 0x04: (24, 16)}
+ACTIONS_LEN = struct.Struct('!H')
+
+
+def get_packet_out_frame(data):
+    """Return the Ethernet frame carried by a packed PacketOut."""
+    header_len, actions_len_offset = PACKET_OUT_HEADERS[data[0]]
+    actions_len, = ACTIONS_LEN.unpack_from(data, actions_len_offset)
+    return data[header_len + actions_len:]
+
+
+class VirtualClock:
+    """Monotonic clock that only moves when the simulation says so."""
+
+    def __init__(self):
+        """Create a clock at zero."""
+        self.now = 0.0
+
+    def monotonic(self):
+        """Return the current virtual time in seconds."""
+        return self.now
+
+
+class SimulatedFabric:
+    """Stand-in for the msg_out buffer that delivers LLDP to link peers.
+
+    Each PacketOut is decoded to find its source port and, unless it is
+    lost, a PacketIn from the peer port is scheduled ``delay`` seconds later,
+    plus a uniform random ``jitter``.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, links, clock, delay=0.001, jitter=0.0, loss=0.0,
+                 seed=None):
+        """Create a fabric with the given links and link conditions."""
+        self.clock = clock
+        self.delay = delay
+        self.jitter = jitter
+        self.loss = loss
+        self._random = random.Random(seed)
+        self._peers = {}
+        for interface_a, interface_b in links:
+            self._peers[(interface_a.switch.dpid,
+                         interface_a.port_number)] = interface_b
+            self._peers[(interface_b.switch.dpid,
+                         interface_b.port_number)] = interface_a
+        self._queue = []
+        self._order = count()
+        self.packet_outs = 0
+        self.lost = 0
+        self.edge = 0
+
+    def put(self, event):
+        """Schedule the PacketIn of a PacketOut sent to the fabric."""
+        self.packet_outs += 1
+        frame = get_packet_out_frame(event.content['message'].pack())
+        peer = self._peers.get(decode_lldp(frame))
+        if peer is None:
+            self.edge += 1
+            return
+        if self._random.random() < self.loss:
+            self.lost += 1
+            return
+        message = SimpleNamespace(data=frame, in_port=peer.port_number)
+        packet_in = SimpleNamespace(message=message,
+                                    source=peer.switch.connection)
+        delivery = (self.clock.now + self.delay +
+                    self._random.uniform(0, self.jitter))
+        heapq.heappush(self._queue, (delivery, next(self._order), packet_in))
+
+    def next_delivery(self):
+        """Return the time of the next PacketIn, or None."""
+        return self._queue[0][0] if self._queue else None
+
+    def pop(self):
+        """Return the next PacketIn."""
+        return heapq.heappop(self._queue)[2]
+
+
+class DiscoveryRecorder:
+    """Stand-in for the app buffer that records the links discovered."""
+
+    def __init__(self, clock):
+        """Create a recorder without links."""
+        self.clock = clock
+        #: Virtual time each link was first notified, by interface ids.
+        self.discovered = {}
+        self.events = 0
+
+    def put(self, event):
+        """Record the link of an NNI event."""
+        self.events += 1
+        if event.name != 'kytos/of_lldp.interface.is.nni':
+            return
+        link = frozenset((event.content['interface_a'].id,
+                          event.content['interface_b'].id))
+        self.discovered.setdefault(link, self.clock.now)
+
+
+def create_napp(main_class, switches, fabric, recorder):
+    """Return the NApp of a controller with the simulated buffers."""
+    controller = get_controller_mock()
+    controller.switches = switches
+    napp = main_class(controller)
+    controller.buffers.msg_out = fabric
+    controller.buffers.app = recorder
+    return napp
+
+
+# pylint: disable=too-many-locals
+def simulate(main_class, switches, links, args):
+    """Run the discovery of a fabric and return its results."""
+    clock = VirtualClock()
+    fabric = SimulatedFabric(links, clock, args.delay, args.jitter,
+                             args.loss, args.seed)
+    recorder = DiscoveryRecorder(clock)
+    expected = {frozenset((interface_a.id, interface_b.id))
+                for interface_a, interface_b in links}
+    with patch('time.monotonic', clock.monotonic):
+        napp = create_napp(main_class, switches, fabric, recorder)
+        interval = napp.pacer.interval(napp.polling_time)
+        next_execute = 0.0
+        executions = packet_ins = 0
+        execute_seconds = packet_in_seconds = 0.0
+        load = {}
+        try:
+            while (clock.now <= args.max_time
+                   and not expected <= recorder.discovered.keys()):
+                delivery = fabric.next_delivery()
+                if delivery is None or next_execute <= delivery:
+                    clock.now = next_execute
+                    started = time.perf_counter()
+                    napp.execute()
+                    execute_seconds += time.perf_counter() - started
+                    executions += 1
+                    next_execute += interval
+                    continue
+                clock.now = delivery
+                event = fabric.pop()
+                started = time.perf_counter()
+                napp.notify_uplink_detected(event)
+                packet_in_seconds += time.perf_counter() - started
+                packet_ins += 1
+                second = int(clock.now)
+                load[second] = load.get(second, 0) + 1
+        finally:
+            napp.shutdown()
+
+    discovered = expected & recorder.discovered.keys()
+    converged = len(discovered) == len(expected)
+    return {'links': len(expected),
+            'links_discovered': len(discovered),
+            'converged': converged,
+            'discovery_seconds': (max(recorder.discovered[link]
+                                      for link in discovered)
+                                  if converged and discovered else None),
+            'simulated_seconds': clock.now,
+            'executions': executions,
+            'packet_outs': fabric.packet_outs,
+            'packet_outs_lost': fabric.lost,
+            'packet_outs_to_edge_ports': fabric.edge,
+            'packet_ins': packet_ins,
+            'packet_ins_per_second': (packet_ins / clock.now
+                                      if clock.now else None),
+            'peak_packet_ins_per_second': max(load.values(), default=0),
+            'nni_events': recorder.events,
+            'execute_cpu_seconds': execute_seconds,
+            'packet_in_cpu_seconds': packet_in_seconds,
+            'packet_in_cpu_us': (packet_in_seconds / packet_ins * 1e6
+                                 if packet_ins else None)}
+
+
+def parse_args(argv):
+    """Return the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--topology', choices=sorted(TOPOLOGIES),
+                        default='fat-tree')
+    parser.add_argument('--size', type=int, default=16,
+                        help='pods of a fat-tree or switches of the others')
+    parser.add_argument('--degree', type=int, default=4,
+                        help='links of each switch of a random fabric')
+    parser.add_argument('--delay', type=float, default=0.001,
+                        help='seconds from PacketOut to PacketIn')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='maximum random seconds added to the delay')
+    parser.add_argument('--loss', type=float, default=0.0,
+                        help='fraction of the LLDP packets lost')
+    parser.add_argument('--max-time', type=float, default=600,
+                        help='maximum simulated seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='SETTING=VALUE',
+                        help='override a setting, e.g. POLLING_SLOTS=1')
+    parser.add_argument('--output', default='bench_discovery.json',
+                        help='JSON file with the results')
+    return parser.parse_args(argv)
+
+
+def get_settings(overrides):
+    """Return the settings to override, with python literal values."""
+    values = {}
+    for override in overrides:
+        name, _, value = override.partition('=')
+        if not hasattr(settings, name):
+            raise SystemExit(f'Unknown setting {name}')
+        values[name] = json.loads(value)
+    return values
+
+
+def main(argv=None):
+    """Run the simulation, print a summary and write the JSON results."""
+    args = parse_args(argv)
+    overrides = get_settings(args.set)
+    if args.topology == 'random':
+        switches, links = random_graph(args.size, args.degree, args.seed)
+    else:
+        switches, links = TOPOLOGIES[args.topology](args.size)
+
+    # Handle the events in the calling thread, as in the unit tests, and do
+    # not pass the simulation arguments to the kytos configuration.
+    with patch('kytos.core.helpers.run_on_thread', lambda x: x), \
+            patch('sys.argv', sys.argv[:1]), \
+            patch.dict(vars(settings), overrides):
+        # pylint: disable=import-outside-toplevel
+        from napps.kytos.of_lldp.main import Main
+        result = simulate(Main, switches, links, args)
+
+    report = {'python': platform.python_version(),
+              'platform': platform.platform(),
+              'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+              'topology': args.topology, 'size': args.size,
+              'switches': len(switches),
+              'interfaces': sum(len(switch.interfaces)
+                                for switch in switches.values()),
+              'delay': args.delay, 'jitter': args.jitter,
+              'loss': args.loss, 'settings': overrides, **result}
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    print(f"{report['topology']} of {report['switches']} switches, "
+          f"{report['links']} links: {report['links_discovered']} "
+          f"discovered in {report['simulated_seconds']:.3f} s "
+          f"({report['executions']} executions)")
+    print(f"PacketIns: {report['packet_ins']}, "
+          f"peak {report['peak_packet_ins_per_second']} per second, "
+          f"{report['packet_in_cpu_us'] or 0:.1f} us each")
+    print(f'Results written to {args.output}')
+    return 0 if report['converged'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Measure the installation of the LLDP flows of many switches at once.
+
+Run with ``python -m tests.benchmarks.bench_flows`` from the NApp folder.
+Every switch of a synthetic fabric connects at once, as after a controller
+restart, and the NApp installs their LLDP flows in a local stand-in of
+flow_manager that answers each request after ``--latency`` seconds. It
+reports the time until every switch has its flow and the requests sent,
+without batching and with ``settings.FLOW_BATCH_WINDOW``, and writes the
+results as JSON to ``--output``.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from threading import Condition, Thread
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from kytos.lib.helpers import get_controller_mock
+from napps.kytos.of_lldp import settings
+from tests.benchmarks.fabric import CountingBuffer, build_fabric
+
+#: Number of switches of the default fabric.
+SWITCHES = 1000
+
+
+class FlowManagerServer(ThreadingMixIn, HTTPServer):
+    """Stand-in for flow_manager that records the switches with flows."""
+
+    daemon_threads = True
+
+    def __init__(self, latency):
+        """Listen on a free local port."""
+        super().__init__(('127.0.0.1', 0), FlowManagerHandler)
+        self.latency = latency
+        self.requests = 0
+        self.installed = set()
+        self.dpids = set()
+        self.done = Condition()
+
+    @property
+    def url(self):
+        """Return the base URL of the flow_manager API."""
+        return f'http://127.0.0.1:{self.server_port}/api/kytos/flow_manager/v2'
+
+    def install(self, dpid):
+        """Record the flows of a switch, or of every switch if None."""
+        with self.done:
+            self.requests += 1
+            if dpid is None:
+                self.installed |= self.dpids
+            else:
+                self.installed.add(dpid)
+            if self.installed >= self.dpids:
+                self.done.notify_all()
+
+    def wait(self, timeout):
+        """Wait until every switch has its flows."""
+        with self.done:
+            return self.done.wait_for(lambda: self.installed >= self.dpids,
+                                      timeout)
+
+
+class FlowManagerHandler(BaseHTTPRequestHandler):
+    """Answer the flow requests after the server latency."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Install the flows of the switch in the path, if any."""
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.server.latency)
+        dpid = self.path.split('/flows', 1)[1].lstrip('/') or None
+        self.server.install(dpid)
+        data = b'{"response": "FlowMod Messages Sent"}'
+        self.send_response(202)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Do not log the requests."""
+
+
+def bench(main_class, switches, window, latency, timeout):
+    """Return the results of connecting ``switches`` switches at once."""
+    server = FlowManagerServer(latency)
+    Thread(target=server.serve_forever, daemon=True).start()
+    fabric = build_fabric(switches, 2)
+    server.dpids = set(fabric)
+    overrides = {'FLOW_BATCH_WINDOW': window,
+                 'FLOW_MANAGER_URL': server.url}
+    try:
+        with patch.dict(vars(settings), overrides):
+            controller = get_controller_mock()
+            controller.switches = fabric
+            napp = main_class(controller)
+        controller.buffers.msg_out = CountingBuffer()
+        controller.buffers.app = CountingBuffer()
+        try:
+            started = time.perf_counter()
+            for switch in fabric.values():
+                napp.handle_switch_connected(
+                    SimpleNamespace(content={'switch': switch}))
+            dispatched = time.perf_counter() - started
+            installed = server.wait(timeout)
+            elapsed = time.perf_counter() - started
+            # Let the client measure the install time of the last answers.
+            napp.flow_client.shutdown(wait=True)
+            histogram = napp.metrics.as_dict()['of_lldp_flow_install_seconds']
+        finally:
+            napp.shutdown()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {'window': window,
+            'installed': installed,
+            'switches_installed': len(server.installed & server.dpids),
+            'requests': server.requests,
+            'dispatch_seconds': dispatched,
+            'install_all_seconds': elapsed if installed else None,
+            'mean_install_seconds': (histogram['sum'] / histogram['count']
+                                     if histogram['count'] else None)}
+
+
+def parse_args(argv):
+    """Return the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--switches', type=int, default=SWITCHES)
+    parser.add_argument('--latency', type=float, default=0.002,
+                        help='seconds flow_manager takes per request')
+    parser.add_argument('--window', type=float,
+                        default=settings.FLOW_BATCH_WINDOW,
+                        help='FLOW_BATCH_WINDOW of the batched run')
+    parser.add_argument('--timeout', type=float, default=120,
+                        help='maximum seconds to wait for every flow')
+    parser.add_argument('--output', default='bench_flows.json',
+                        help='JSON file with the results')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the benchmark, print a summary and write the JSON results."""
+    args = parse_args(argv)
+    # Handle the events in the calling thread, as in the unit tests, and do
+    # not pass the benchmark arguments to the kytos configuration.
+    with patch('kytos.core.helpers.run_on_thread', lambda x: x), \
+            patch('sys.argv', sys.argv[:1]):
+        # pylint: disable=import-outside-toplevel
+        from napps.kytos.of_lldp.main import Main
+        results = [bench(Main, args.switches, window, args.latency,
+                         args.timeout)
+                   for window in (0, args.window)]
+
+    report = {'python': platform.python_version(),
+              'platform': platform.platform(),
+              'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+              'switches': args.switches, 'latency': args.latency,
+              'max_workers': settings.FLOW_MANAGER_MAX_WORKERS,
+              'results': results}
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    print(f"{'window (s)':>10} {'requests':>9} {'all installed (s)':>18} "
+          f"{'mean install (s)':>17}")
+    for result in results:
+        print(f"{result['window']:>10} {result['requests']:>9} "
+              f"{result['install_all_seconds'] or float('nan'):>18.3f} "
+              f"{result['mean_install_seconds'] or float('nan'):>17.3f}")
+    print(f'Results written to {args.output}')
+    return 0 if all(result['installed'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
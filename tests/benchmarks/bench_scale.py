@@ -0,0 +1,212 @@
+"""Measure the NApp hot paths on synthetic fabrics of growing size.
+
+Run with ``python -m tests.benchmarks.bench_scale`` from the NApp folder.
+For each number of switches it measures the LLDP PacketOuts sent per second
+by ``execute``, the time ``notify_uplink_detected`` takes per PacketIn and
+the cost of the REST calls that enable and disable LLDP. The results are
+written as JSON to ``--output``, to compare releases.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from kytos.lib.helpers import get_controller_mock, get_test_client
+from napps.kytos.of_lldp.pacing import SendPacer
+from tests.benchmarks.fabric import CountingBuffer, build_fabric
+from tests.helpers import get_lldp_frame
+
+#: Numbers of switches of the default fabrics.
+SWITCHES = (10, 1000, 10000)
+#: Ports of each switch of the default fabrics.
+PORTS = 20
+#: Maximum number of PacketIns measured for each fabric.
+PACKET_INS = 10000
+REPEAT = 3
+URL = 'http://127.0.0.1:8181/api/kytos/of_lldp/v1'
+
+
+def create_napp(main_class, fabric):
+    """Return the NApp of a controller with the synthetic switches.
+
+    The msg_out and app buffers are replaced by :class:`CountingBuffer`, so
+    only the NApp itself is measured, and all the PacketOuts are sent in a
+    single execution.
+    """
+    controller = get_controller_mock()
+    controller.switches = fabric
+    napp = main_class(controller)
+    controller.buffers.msg_out = CountingBuffer()
+    controller.buffers.app = CountingBuffer()
+    napp.pacer = SendPacer(1)
+    return napp
+
+
+def bench_execute(napp):
+    """Return the duration of the first and later executions.
+
+    The first execution packs every PacketOut, the next ones find them in
+    the frame cache.
+    """
+    msg_out = napp.controller.buffers.msg_out
+    started = time.perf_counter()
+    napp.execute()
+    cold = time.perf_counter() - started
+    sent = msg_out.count
+
+    durations = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        napp.execute()
+        durations.append(time.perf_counter() - started)
+    warm = min(durations)
+    return {'packet_outs': sent, 'cold_seconds': cold,
+            'warm_seconds': warm,
+            'cold_frames_per_second': sent / cold if cold else None,
+            'frames_per_second': sent / warm if warm else None}
+
+
+def get_packet_in_events(fabric, count):
+    """Return PacketIn events of links between consecutive switches.
+
+    Port ``n`` of each switch is linked to port ``n`` of the next one, so
+    each event is an LLDP packet sent by a switch received by the previous.
+    """
+    switches = list(fabric.values())
+    events = []
+    for index, switch_b in enumerate(switches):
+        switch_a = switches[index - 1]
+        for interface in switch_b.interfaces.values():
+            if len(events) == count:
+                return events
+            version = switch_b.connection.protocol.version
+            message = SimpleNamespace(
+                data=get_lldp_frame(switch_b.dpid, interface.port_number,
+                                    version),
+                in_port=interface.port_number)
+            events.append(SimpleNamespace(message=message,
+                                          source=switch_a.connection))
+    return events
+
+
+def summarize(durations):
+    """Return the mean, median and 99th percentile in microseconds."""
+    durations = sorted(durations)
+    return {'mean_us': statistics.mean(durations) * 1e6,
+            'median_us': statistics.median(durations) * 1e6,
+            'p99_us': durations[int(0.99 * (len(durations) - 1))] * 1e6}
+
+
+def bench_packet_in(napp, events):
+    """Return the time per PacketIn of new and of already known links."""
+    results = {'packet_ins': len(events)}
+    for name in ('new_links', 'known_links'):
+        durations = []
+        for event in events:
+            started = time.perf_counter()
+            napp.notify_uplink_detected(event)
+            durations.append(time.perf_counter() - started)
+        results[name] = summarize(durations)
+    return results
+
+
+def bench_rest(napp, fabric):
+    """Return the duration of the LLDP enable and disable REST calls."""
+    api = get_test_client(napp.controller, napp)
+    interface_ids = [interface.id for switch in fabric.values()
+                     for interface in switch.interfaces.values()]
+    results = {}
+    for name, ids in (('one', interface_ids[:1]), ('all', interface_ids)):
+        for action in ('disable', 'enable'):
+            durations = []
+            for _ in range(REPEAT):
+                started = time.perf_counter()
+                response = api.open(f'{URL}/interfaces/{action}',
+                                    method='POST', json={'interfaces': ids})
+                durations.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.json
+            results[f'{action}_{name}_seconds'] = min(durations)
+    started = time.perf_counter()
+    api.open(f'{URL}/interfaces', method='GET')
+    results['get_interfaces_seconds'] = time.perf_counter() - started
+    return results
+
+
+def bench(main_class, switches, ports, packet_ins):
+    """Return the results of a fabric of ``switches`` switches."""
+    fabric = build_fabric(switches, ports)
+    napp = create_napp(main_class, fabric)
+    try:
+        started = time.perf_counter()
+        napp.eligible_interfaces.reconcile(list(fabric.values()))
+        reconcile = time.perf_counter() - started
+        return {'switches': switches,
+                'interfaces': switches * ports,
+                'reconcile_seconds': reconcile,
+                'execute': bench_execute(napp),
+                'packet_in': bench_packet_in(
+                    napp, get_packet_in_events(fabric, packet_ins)),
+                'rest': bench_rest(napp, fabric)}
+    finally:
+        napp.shutdown()
+
+
+def get_version():
+    """Return the NApp version, from kytos.json."""
+    path = Path(__file__).resolve().parents[2] / 'kytos.json'
+    return json.loads(path.read_text())['version']
+
+
+def parse_args(argv):
+    """Return the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--switches', type=int, nargs='+',
+                        default=list(SWITCHES),
+                        help='numbers of switches of the fabrics')
+    parser.add_argument('--ports', type=int, default=PORTS,
+                        help='ports of each switch')
+    parser.add_argument('--packet-ins', type=int, default=PACKET_INS,
+                        help='maximum number of PacketIns measured')
+    parser.add_argument('--output', default='bench_scale.json',
+                        help='JSON file with the results')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the benchmarks, print a summary and write the JSON results."""
+    args = parse_args(argv)
+    # Handle the events in the calling thread, as in the unit tests, and do
+    # not pass the benchmark arguments to the kytos configuration.
+    with patch('kytos.core.helpers.run_on_thread', lambda x: x), \
+            patch('sys.argv', sys.argv[:1]):
+        # pylint: disable=import-outside-toplevel
+        from napps.kytos.of_lldp.main import Main
+        results = [bench(Main, switches, args.ports, args.packet_ins)
+                   for switches in args.switches]
+
+    report = {'napp_version': get_version(),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+              'ports': args.ports,
+              'results': results}
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    print(f"{'switches':>9} {'interfaces':>10} {'frames/s':>10} "
+          f"{'packet in (us)':>15} {'disable all (s)':>16}")
+    for result in results:
+        print(f"{result['switches']:>9} {result['interfaces']:>10} "
+              f"{result['execute']['frames_per_second']:>10.0f} "
+              f"{result['packet_in']['known_links']['mean_us']:>15.1f} "
+              f"{result['rest']['disable_all_seconds']:>16.3f}")
+    print(f'Results written to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
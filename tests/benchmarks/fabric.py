@@ -0,0 +1,204 @@
+"""Synthetic switches and interfaces to run the NApp at scale.
+
+The classes have the attributes and methods of the kytos.core switches,
+interfaces and connections used by the NApp, without the cost of mocks, so
+fabrics of hundreds of thousands of interfaces fit in memory.
+
+The topology generators return the switches by DPID and the links, as
+pairs of interfaces, of fat-tree, ring and random fabrics.
+"""
+import random
+
+from napps.kytos.of_lldp.decoder import format_dpid
+
+
+class Protocol:
+    """OpenFlow protocol negotiated with a switch."""
+
+    __slots__ = ('version',)
+
+    def __init__(self, version):
+        """Create a protocol of an OpenFlow version."""
+        self.version = version
+
+
+class Connection:
+    """Connection of a switch to the controller."""
+
+    __slots__ = ('address', 'protocol', 'switch')
+
+    def __init__(self, switch, of_version, address):
+        """Create the connection of a switch from an address."""
+        self.switch = switch
+        self.protocol = Protocol(of_version)
+        self.address = address
+
+
+class Interface:
+    """Port of a synthetic switch, eligible for LLDP by default."""
+
+    __slots__ = ('id', 'name', 'port_number', 'address', 'switch', 'lldp',
+                 'enabled', 'active')
+
+    def __init__(self, switch, port_number):
+        """Create the interface of a switch port."""
+        self.switch = switch
+        self.port_number = port_number
+        # pylint: disable=invalid-name
+        self.id = f'{switch.dpid}:{port_number}'
+        self.name = f's{switch.number}-eth{port_number}'
+        self.address = ':'.join(
+            f'{byte:02x}' for byte in
+            (switch.number << 16 | port_number).to_bytes(6, 'big'))
+        self.lldp = True
+        self.enabled = True
+        self.active = True
+
+    def is_active(self):
+        """Return whether the port is up."""
+        return self.active
+
+    def is_enabled(self):
+        """Return whether the interface is administratively enabled."""
+        return self.enabled
+
+
+class Switch:
+    """Connected and enabled synthetic switch."""
+
+    def __init__(self, number, of_version=0x04):
+        """Create a switch without interfaces, with a DPID from a number."""
+        self.number = number
+        self.dpid = format_dpid(number)
+        self.id = self.dpid  # pylint: disable=invalid-name
+        self.connection = Connection(self, of_version,
+                                     f'10.{number >> 16 & 255}.'
+                                     f'{number >> 8 & 255}.{number & 255}')
+        self.interfaces = {}
+        self.connected = True
+        self.enabled = True
+        self._ports = {}
+
+    def add_interface(self, port_number=None):
+        """Create an interface on a port, by default the next one."""
+        if port_number is None:
+            port_number = len(self._ports) + 1
+        interface = Interface(self, port_number)
+        self.interfaces[interface.id] = interface
+        self._ports[port_number] = interface
+        return interface
+
+    def get_interface_by_port_no(self, port_number):
+        """Return the interface of a port, or None."""
+        return self._ports.get(port_number)
+
+    def is_connected(self):
+        """Return whether the switch is connected."""
+        return self.connected
+
+    def is_enabled(self):
+        """Return whether the switch is administratively enabled."""
+        return self.enabled
+
+
+class CountingBuffer:
+    """Stand-in for a controller buffer that only counts the events."""
+
+    def __init__(self):
+        """Create an empty buffer."""
+        self.count = 0
+
+    def put(self, event):  # pylint: disable=unused-argument
+        """Count an event and discard it."""
+        self.count += 1
+
+
+def build_fabric(switches, ports, of_version=0x04):
+    """Return synthetic switches by DPID, each with ``ports`` interfaces.
+
+    The switches are numbered from 1 and their ports from 1 to ``ports``.
+    """
+    fabric = {}
+    for number in range(1, switches + 1):
+        switch = Switch(number, of_version)
+        for port_number in range(1, ports + 1):
+            switch.add_interface(port_number)
+        fabric[switch.dpid] = switch
+    return fabric
+
+
+def connect(switch_a, switch_b):
+    """Link new ports of two switches and return the pair of interfaces."""
+    return switch_a.add_interface(), switch_b.add_interface()
+
+
+def _get_switches(count, of_version):
+    """Return ``count`` switches without interfaces, numbered from 1."""
+    return [Switch(number, of_version) for number in range(1, count + 1)]
+
+
+def _get_topology(switches, links):
+    """Return the switches by DPID and the links."""
+    return {switch.dpid: switch for switch in switches}, links
+
+
+def ring(size, of_version=0x04):
+    """Return a ring of ``size`` switches."""
+    switches = _get_switches(size, of_version)
+    links = [connect(switch, switches[(index + 1) % size])
+             for index, switch in enumerate(switches)]
+    return _get_topology(switches, links)
+
+
+def fat_tree(pods, of_version=0x04):
+    """Return a k-ary fat-tree with ``pods`` pods, k = ``pods``.
+
+    It has ``(k / 2) ** 2`` core switches and k aggregation and k edge
+    switches in each pod. The edge switches also have ``k / 2`` ports to
+    hosts, without links.
+    """
+    if pods < 2 or pods % 2:
+        raise ValueError(f'invalid number of pods {pods}, must be even')
+    half = pods // 2
+    switches = _get_switches(half * half + pods * pods, of_version)
+    cores = switches[:half * half]
+    links = []
+    for pod in range(pods):
+        first = half * half + pod * pods
+        aggregations = switches[first:first + half]
+        edges = switches[first + half:first + pods]
+        for edge in edges:
+            links.extend(connect(edge, aggregation)
+                         for aggregation in aggregations)
+            for _ in range(half):
+                edge.add_interface()
+        for index, aggregation in enumerate(aggregations):
+            links.extend(connect(aggregation, core)
+                         for core in cores[index * half:(index + 1) * half])
+    return _get_topology(switches, links)
+
+
+def random_graph(size, degree=4, seed=None, of_version=0x04):
+    """Return a connected random fabric with about ``degree`` links each.
+
+    The switches are connected in a random ring, so the fabric is connected,
+    and the other links join random pairs of switches that were not linked.
+    """
+    generator = random.Random(seed)
+    switches = _get_switches(size, of_version)
+    order = switches[:]
+    generator.shuffle(order)
+    pairs = {frozenset((switch.number, order[index - 1].number))
+             for index, switch in enumerate(order)}
+    links = [connect(switch, order[index - 1])
+             for index, switch in enumerate(order) if size > 2 or index]
+    target = max(size * degree // 2, len(links))
+    attempts = 0
+    while len(links) < target and attempts < 10 * target:
+        attempts += 1
+        switch_a, switch_b = generator.sample(switches, 2)
+        pair = frozenset((switch_a.number, switch_b.number))
+        if pair not in pairs:
+            pairs.add(pair)
+            links.append(connect(switch_a, switch_b))
+    return _get_topology(switches, links)
@@ -1,8 +1,12 @@
 """Module to help to create tests."""
 from unittest.mock import MagicMock
 
+from pyof.foundation.basic_types import DPID, UBInt16, UBInt32
+from pyof.foundation.network_types import LLDP, VLAN, Ethernet, EtherType
+
 from kytos.lib.helpers import (get_interface_mock, get_link_mock,
                                get_switch_mock)
+from napps.kytos.of_lldp.builder import END_TLV_LEN, pack_probe_tlv
 
 
 def get_topology_mock():
@@ -37,3 +41,26 @@ def get_topology_mock():
                          switch_b.dpid: switch_b,
                          switch_c.dpid: switch_c}
     return topology
+
+
+def get_lldp_frame(dpid, port_number, of_version=0x04, vlan_id=None,
+                   probe=None):
+    """Return a packed Ethernet frame with a LLDP packet.
+
+    If ``probe`` is a ``(timestamp, sequence)`` tuple, the probe TLV is added.
+    """
+    port_type = UBInt16 if of_version == 0x01 else UBInt32
+    lldp = LLDP()
+    lldp.chassis_id.sub_value = DPID(dpid)
+    lldp.port_id.sub_value = port_type(port_number)
+
+    ethernet = Ethernet()
+    ethernet.ether_type = EtherType.LLDP
+    ethernet.source = '00:00:00:00:00:01'
+    ethernet.destination = '01:80:c2:00:00:0e'
+    ethernet.data = lldp.pack()
+    if probe is not None:
+        ethernet.data = (ethernet.data[:-END_TLV_LEN] + pack_probe_tlv(*probe)
+                         + ethernet.data[-END_TLV_LEN:])
+    ethernet.vlans.append(VLAN(vid=vlan_id))
+    return ethernet.pack()
@@ -0,0 +1,84 @@
+"""Test the adaptive probing intervals."""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from napps.kytos.of_lldp.adaptive import ProbeScheduler
+
+
+def get_target(interface_id):
+    """Return a target with a mocked interface."""
+    return (MagicMock(), MagicMock(id=interface_id), 0x04)
+
+
+class TestProbeScheduler(TestCase):
+    """Tests for the ProbeScheduler class."""
+
+    def setUp(self):
+        """Create a scheduler and two eligible targets."""
+        self.scheduler = ProbeScheduler(1, 8, 4)
+        self.target_1 = get_target('00:01:1')
+        self.target_2 = get_target('00:01:2')
+        self.eligible = {'00:01:1': self.target_1, '00:01:2': self.target_2}
+        self.scheduler.due(self.eligible.get, list(self.eligible), 0)
+
+    def due(self, now, added=()):
+        """Return the targets due at a time."""
+        return self.scheduler.due(self.eligible.get, added, now)
+
+    def test_invalid(self):
+        """Test invalid intervals and backoff."""
+        with self.assertRaises(ValueError):
+            ProbeScheduler(0, 8, 4)
+        with self.assertRaises(ValueError):
+            ProbeScheduler(5, 8, 4)
+        with self.assertRaises(ValueError):
+            ProbeScheduler(1, 8, 4, backoff=0.5)
+
+    def test_added(self):
+        """Test interfaces added are probed at once."""
+        scheduler = ProbeScheduler(1, 8, 4)
+        self.assertEqual(scheduler.due(self.eligible.get, [], 0), [])
+        self.assertEqual(scheduler.due(self.eligible.get, ['00:01:1'], 0),
+                         [self.target_1])
+        self.assertEqual(len(scheduler), 1)
+
+    def test_backoff(self):
+        """Test linked interfaces back off to the maximum interval."""
+        probes = [0]
+        self.scheduler.seen('00:01:1')
+        for now in range(1, 40):
+            if self.target_1 in self.due(now):
+                probes.append(now)
+            self.scheduler.seen('00:01:1')
+
+        self.assertEqual(probes, [0, 1, 3, 7, 15, 23, 31, 39])
+        self.assertEqual(self.scheduler.get_interval('00:01:1'), 8)
+        self.assertEqual(self.scheduler.get_interval('00:01:2'), 4)
+
+    def test_edge(self):
+        """Test interfaces without a link back off to the edge interval."""
+        del self.eligible['00:01:1']
+        due = [now for now in range(1, 20) if self.due(now)]
+
+        self.assertEqual(due, [1, 3, 7, 11, 15, 19])
+
+    def test_reset(self):
+        """Test a reset starts probing an interface fast again."""
+        for now in range(1, 20):
+            self.due(now)
+
+        self.scheduler.reset('00:01:2', now=20.5)
+
+        self.assertEqual(self.due(20.5), [])
+        self.assertEqual(self.due(21.5), [self.target_2])
+        self.assertEqual(self.scheduler.get_interval('00:01:2'), 2)
+
+    def test_forget(self):
+        """Test interfaces no longer eligible are forgotten when due."""
+        del self.eligible['00:01:2']
+        self.assertEqual(self.due(1), [self.target_1])
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertIsNone(self.scheduler.get_interval('00:01:2'))
+
+        self.eligible['00:01:2'] = self.target_2
+        self.assertEqual(self.due(1.5, ['00:01:2']), [self.target_2])
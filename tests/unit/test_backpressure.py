@@ -0,0 +1,76 @@
+"""Test the backpressure of the LLDP PacketOuts."""
+import socket
+from types import SimpleNamespace
+from unittest import TestCase, skipIf
+from unittest.mock import MagicMock
+
+from napps.kytos.of_lldp.backpressure import (SIOCOUTQ, Backpressure,
+                                              get_queue_depth,
+                                              get_write_buffer_size)
+
+
+class TestBackpressure(TestCase):
+    """Tests for the Backpressure class."""
+
+    def setUp(self):
+        """Execute steps before each tests."""
+        self.backpressure = Backpressure(high=100, low=10)
+
+    def test_invalid_watermarks(self):
+        """Test the low watermark must be below the high one."""
+        with self.assertRaises(ValueError):
+            Backpressure(high=10, low=10)
+        with self.assertRaises(ValueError):
+            Backpressure(high=10, low=-1)
+
+    def test_budget(self):
+        """Test the budget is the room left below the high watermark."""
+        self.assertIsNone(self.backpressure.budget(99))
+        self.assertFalse(self.backpressure.throttled)
+        self.assertEqual(self.backpressure.budget(100), 0)
+        self.assertTrue(self.backpressure.throttled)
+        self.assertEqual(self.backpressure.budget(1000), 0)
+        self.assertEqual(self.backpressure.budget(60), 40)
+
+    def test_hysteresis(self):
+        """Test the throttling only stops at the low watermark."""
+        self.backpressure.budget(100)
+        self.assertEqual(self.backpressure.budget(11), 89)
+        self.assertTrue(self.backpressure.throttled)
+        self.assertIsNone(self.backpressure.budget(10))
+        self.assertFalse(self.backpressure.throttled)
+        self.assertIsNone(self.backpressure.budget(50))
+
+
+class TestHelpers(TestCase):
+    """Tests for the queue and connection size helpers."""
+
+    def test_get_queue_depth(self):
+        """Test the depth is the size of the queue, if available."""
+        self.assertEqual(get_queue_depth(MagicMock(**{'qsize.return_value':
+                                                      5})), 5)
+        self.assertIsNone(get_queue_depth(object()))
+        buffer = MagicMock(**{'qsize.side_effect': NotImplementedError})
+        self.assertIsNone(get_queue_depth(buffer))
+
+    @skipIf(SIOCOUTQ is None, 'the send queue size is only read on Linux')
+    def test_get_write_buffer_size(self):
+        """Test the size is the send queue of the connection socket."""
+        sock, peer = socket.socketpair()
+        self.addCleanup(sock.close)
+        self.addCleanup(peer.close)
+        connection = SimpleNamespace(socket=sock)
+        self.assertEqual(get_write_buffer_size(connection), 0)
+        sock.sendall(bytes(1000))
+        self.assertGreaterEqual(get_write_buffer_size(connection), 1000)
+        peer.recv(1000)
+        self.assertEqual(get_write_buffer_size(connection), 0)
+
+    def test_get_write_buffer_size_unavailable(self):
+        """Test the size is None without a socket to read it from."""
+        self.assertIsNone(get_write_buffer_size(SimpleNamespace()))
+        self.assertIsNone(get_write_buffer_size(SimpleNamespace(socket=None)))
+        self.assertIsNone(get_write_buffer_size(MagicMock()))
+        sock = socket.socket()
+        sock.close()
+        self.assertIsNone(get_write_buffer_size(SimpleNamespace(socket=sock)))
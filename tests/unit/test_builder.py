@@ -0,0 +1,143 @@
+"""Test the LLDP PacketOut builder."""
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from napps.kytos.of_lldp.builder import (XID, XID_OFFSET, LLDPFrameBuilder,
+                                         LLDPFrameTemplate, PackedPacketOut,
+                                         build_lldp_packet_out,
+                                         pack_lldp_packet_out)
+
+
+class TestBuilder(TestCase):
+    """Tests for the builder module."""
+
+    def setUp(self):
+        """Execute steps before each tests."""
+        self.builder = LLDPFrameBuilder()
+
+    @patch('napps.kytos.of_lldp.builder.PO13')
+    @patch('napps.kytos.of_lldp.builder.PO10')
+    @patch('napps.kytos.of_lldp.builder.AO13')
+    @patch('napps.kytos.of_lldp.builder.AO10')
+    def test_build_lldp_packet_out(self, *args):
+        """Test build_lldp_packet_out function."""
+        (mock_ao10, mock_ao13, mock_po10, mock_po13) = args
+
+        ao10 = MagicMock()
+        ao13 = MagicMock()
+        po10 = MagicMock()
+        po10.actions = []
+        po13 = MagicMock()
+        po13.actions = []
+
+        mock_ao10.return_value = ao10
+        mock_ao13.return_value = ao13
+        mock_po10.return_value = po10
+        mock_po13.return_value = po13
+
+        packet_out10 = build_lldp_packet_out(0x01, 1, 'data1')
+        packet_out13 = build_lldp_packet_out(0x04, 2, 'data2')
+        packet_out14 = build_lldp_packet_out(0x05, 3, 'data3')
+
+        self.assertEqual(packet_out10.data, 'data1')
+        self.assertEqual(packet_out10.actions, [ao10])
+        self.assertEqual(packet_out10.actions[0].port, 1)
+
+        self.assertEqual(packet_out13.data, 'data2')
+        self.assertEqual(packet_out13.actions, [ao13])
+        self.assertEqual(packet_out13.actions[0].port, 2)
+
+        self.assertIsNone(packet_out14)
+
+    def test_template_matches_pyof(self):
+        """Test the templates produce the same bytes as python-openflow."""
+        ports = {0x01: (1, 2, 0xfeff), 0x04: (1, 2, 0xfeff, 0xffffff00)}
+        dpids = ('00:00:00:00:00:00:00:01', 'ff:ee:dd:cc:bb:aa:99:88')
+        addresses = ('00:00:00:00:00:00', 'aa:bb:cc:dd:ee:ff', None)
+        for version, port_numbers in ports.items():
+            for vlan_id in (None, 1, 3799, 4095):
+                template = LLDPFrameTemplate(version, vlan_id)
+                xid = template.header.xid
+                for dpid in dpids:
+                    for port_number in port_numbers:
+                        for address in addresses:
+                            expected = pack_lldp_packet_out(
+                                version, vlan_id, dpid, port_number, address,
+                                xid=xid).pack()
+                            frame = template.pack(dpid, port_number, address)
+                            self.assertEqual(frame, expected)
+
+    def test_template_bytes(self):
+        """Test the packed frames against known OpenFlow messages."""
+        dpid = '00:00:00:00:00:00:00:01'
+        address = 'aa:bb:cc:dd:ee:ff'
+        expected = {
+            (0x01, None): '010d003c00000000ffffffffffff0008000000080005ffff'
+                          '0180c200000eaabbccddeeff88cc0209070000000000000001'
+                          '0403070005060200780000',
+            (0x04, 3799): '040d005200000000fffffffffffffffd0010000000000000'
+                          '0000001000000005ffff0000000000000180c200000eaabb'
+                          'ccddeeff81000ed788cc020907000000000000000104050700'
+                          '000005060200780000'}
+        for (version, vlan_id), packet in expected.items():
+            template = LLDPFrameTemplate(version, vlan_id)
+            frame = bytearray(template.pack(dpid, 5, address))
+            frame[4:8] = bytes(4)  # xid
+            self.assertEqual(frame.hex(), packet)
+
+    def test_template_unsupported_version(self):
+        """Test a template cannot be created for other OpenFlow versions."""
+        with self.assertRaises(ValueError):
+            LLDPFrameTemplate(0x05, None)
+
+    def test_build(self):
+        """Test build method."""
+        packet_out = self.builder.build(0x04, 3799, '00:00:00:00:00:00:00:01',
+                                        1, 'aa:bb:cc:dd:ee:ff')
+        template = self.builder.get_template(0x04, 3799)
+
+        self.assertIsInstance(packet_out, PackedPacketOut)
+        self.assertEqual(packet_out.header.message_type,
+                         template.header.message_type)
+        self.assertEqual(len(packet_out), 82)
+        self.assertIs(self.builder.get_template(0x04, 3799), template)
+        self.assertIsNot(self.builder.get_template(0x04, None), template)
+
+        self.assertIsNone(self.builder.build(0x05, None,
+                                             '00:00:00:00:00:00:00:01', 1,
+                                             'aa:bb:cc:dd:ee:ff'))
+
+    def test_xid(self):
+        """Test each packed message gets a new transaction id."""
+        packet_out = self.builder.build(0x04, 3799, '00:00:00:00:00:00:00:01',
+                                        1, 'aa:bb:cc:dd:ee:ff')
+        first, second = packet_out.pack(), packet_out.pack()
+
+        self.assertNotEqual(first[4:8], second[4:8])
+        self.assertEqual(first[:4] + first[8:], second[:4] + second[8:])
+        self.assertEqual(XID.unpack_from(second, XID_OFFSET)[0],
+                         packet_out.header.xid)
+
+    def test_probe_template(self):
+        """Test the probe TLV is stamped at its offset in the template."""
+        dpid = '00:00:00:00:00:00:00:01'
+        for version in (0x01, 0x04):
+            for vlan_id in (None, 3799):
+                builder = LLDPFrameBuilder(probe=True)
+                packet_out = builder.build(version, vlan_id, dpid, 5,
+                                           'aa:bb:cc:dd:ee:ff')
+                stamped = packet_out.stamp(2 ** 32 + 7)
+                with patch('napps.kytos.of_lldp.builder.monotonic_ns',
+                           return_value=123456789):
+                    packed = stamped.pack()
+                expected = pack_lldp_packet_out(
+                    version, vlan_id, dpid, 5, 'aa:bb:cc:dd:ee:ff',
+                    xid=stamped.header.xid, probe=(123456789, 7)).pack()
+
+                self.assertEqual(packed, expected)
+                self.assertEqual(stamped.probe_offset,
+                                 packet_out.probe_offset)
+                self.assertNotEqual(packet_out.pack(), expected)
+                self.assertIsNone(
+                    self.builder.build(version, vlan_id, dpid, 5,
+                                       None).probe_offset)
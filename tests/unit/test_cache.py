@@ -0,0 +1,61 @@
+"""Test the LLDP frame cache."""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from napps.kytos.of_lldp.cache import LLDPFrameCache
+
+
+class TestLLDPFrameCache(TestCase):
+    """Tests for the LLDPFrameCache class."""
+
+    def setUp(self):
+        """Execute steps before each tests."""
+        self.cache = LLDPFrameCache()
+        self.packet_out = MagicMock()
+        self.args = ('00:00:00:00:00:00:00:01', 1, '00:00:00:00:00:01', 3799,
+                     0x04)
+
+    def test_put_get(self):
+        """Test a stored PacketOut is returned."""
+        self.assertIsNone(self.cache.get(*self.args))
+
+        self.cache.put(*self.args, self.packet_out)
+
+        self.assertIs(self.cache.get(*self.args), self.packet_out)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_get_stale(self):
+        """Test entries built with other values are not returned."""
+        self.cache.put(*self.args, self.packet_out)
+        dpid, port, address, vlan_id, of_version = self.args
+
+        self.assertIsNone(self.cache.get(dpid, port, '00:00:00:00:00:02',
+                                         vlan_id, of_version))
+        self.assertIsNone(self.cache.get(dpid, port, address, None,
+                                         of_version))
+        self.assertIsNone(self.cache.get(dpid, port, address, vlan_id, 0x01))
+
+        self.cache.put(dpid, port, address, None, of_version, self.packet_out)
+        self.assertIsNone(self.cache.get(*self.args))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_discard(self):
+        """Test discard entries of a port and of a switch."""
+        dpid = self.args[0]
+        for port in (1, 2, 3):
+            self.cache.put(dpid, port, *self.args[2:], self.packet_out)
+        self.cache.put('00:00:00:00:00:00:00:02', 1, *self.args[2:],
+                       self.packet_out)
+
+        self.cache.discard(dpid, 1)
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache._switches[dpid], {2, 3})
+        self.cache.discard(dpid)
+        self.assertEqual(len(self.cache), 1)
+        self.assertNotIn(dpid, self.cache._switches)
+        self.cache.discard(dpid)
+        self.cache.discard('00:00:00:00:00:00:00:02', 1)
+        self.assertEqual((len(self.cache), self.cache._switches), (0, {}))
+        self.cache.put(dpid, 1, *self.args[2:], self.packet_out)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
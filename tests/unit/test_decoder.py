@@ -0,0 +1,86 @@
+"""Test the LLDP decoder."""
+from unittest import TestCase
+
+from napps.kytos.of_lldp.decoder import (decode_lldp, decode_probe,
+                                         format_dpid, is_lldp_frame)
+from tests.helpers import get_lldp_frame
+
+ADDRESSES = bytes.fromhex('0180c200000eaabbccddeeff')
+
+
+class TestDecoder(TestCase):
+    """Tests for the decoder module."""
+
+    def test_is_lldp_frame(self):
+        """Test LLDP frames are identified with and without 802.1Q tag."""
+        self.assertTrue(is_lldp_frame(ADDRESSES + b'\x88\xcc'))
+        self.assertTrue(is_lldp_frame(ADDRESSES + b'\x81\x00\x0e\xd7\x88\xcc'))
+
+    def test_is_not_lldp_frame(self):
+        """Test other and truncated frames are discarded."""
+        self.assertFalse(is_lldp_frame(ADDRESSES + b'\x08\x06'))
+        self.assertFalse(is_lldp_frame(ADDRESSES +
+                                       b'\x81\x00\x0e\xd7\x08\x00'))
+        self.assertFalse(is_lldp_frame(ADDRESSES + b'\x81\x00\x0e\xd7'))
+        self.assertFalse(is_lldp_frame(ADDRESSES + b'\x88'))
+        self.assertFalse(is_lldp_frame(b''))
+
+    def test_decode_lldp(self):
+        """Test the DPID and port are decoded for both OpenFlow versions."""
+        dpid = 'ff:ee:dd:cc:bb:aa:99:01'
+        for of_version, port_number in ((0x01, 0xfeff), (0x04, 0xffffff00)):
+            for vlan_id in (None, 3799):
+                frame = get_lldp_frame(dpid, port_number, of_version, vlan_id)
+                self.assertEqual(decode_lldp(frame), (dpid, port_number))
+                self.assertEqual(decode_lldp(memoryview(frame)),
+                                 (dpid, port_number))
+
+    def test_decode_foreign_lldp(self):
+        """Test LLDP packets not sent by of_lldp are discarded."""
+        frame = bytearray(get_lldp_frame('00:00:00:00:00:00:00:01', 1))
+
+        self.assertIsNone(decode_lldp(ADDRESSES + b'\x08\x06'))
+        self.assertIsNone(decode_lldp(frame[:30]))
+        self.assertIsNone(decode_lldp(frame[:14]))
+
+        mac_chassis = ADDRESSES + bytes.fromhex('88cc020704aabbccddeeff')
+        self.assertIsNone(decode_lldp(mac_chassis + frame[25:]))
+
+        frame[16] = 4  # chassis id subtype
+        self.assertIsNone(decode_lldp(frame))
+        frame[16] = 7
+        frame[25] = 3 << 1  # port id TLV type
+        self.assertIsNone(decode_lldp(frame))
+        frame[25] = 2 << 1
+        frame[26] = 4  # port id TLV length
+        self.assertIsNone(decode_lldp(frame))
+        frame[26] = 5
+        frame[27] = 3  # port id subtype
+        self.assertIsNone(decode_lldp(frame))
+        frame[27] = 7
+        self.assertEqual(decode_lldp(frame), ('00:00:00:00:00:00:00:01', 1))
+
+    def test_format_dpid(self):
+        """Test format_dpid function."""
+        self.assertEqual(format_dpid(1), '00:00:00:00:00:00:00:01')
+        self.assertEqual(format_dpid(0xffeeddccbbaa9988),
+                         'ff:ee:dd:cc:bb:aa:99:88')
+
+    def test_decode_probe(self):
+        """Test the send time and sequence of the probe TLV are decoded."""
+        dpid = '00:00:00:00:00:00:00:01'
+        for of_version in (0x01, 0x04):
+            for vlan_id in (None, 3799):
+                frame = get_lldp_frame(dpid, 2, of_version, vlan_id,
+                                       probe=(2 ** 63, 42))
+                self.assertEqual(decode_probe(frame), (dpid, 2, 2 ** 63, 42))
+                self.assertEqual(decode_lldp(frame), (dpid, 2))
+
+        frame = get_lldp_frame(dpid, 2)
+        self.assertEqual(decode_probe(frame), (dpid, 2, None, None))
+        self.assertEqual(decode_probe(frame[:-2]), (dpid, 2, None, None))
+        self.assertIsNone(decode_probe(frame[:20]))
+
+        frame = bytearray(get_lldp_frame(dpid, 2, probe=(1, 1)))
+        frame[-15] = 2  # Subtype
+        self.assertEqual(decode_probe(frame), (dpid, 2, None, None))
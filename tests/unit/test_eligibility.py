@@ -0,0 +1,115 @@
+"""Test the set of interfaces eligible to receive LLDP packets."""
+from unittest import TestCase
+
+from kytos.lib.helpers import get_interface_mock, get_switch_mock
+
+from napps.kytos.of_lldp.eligibility import EligibleInterfaces, is_eligible
+
+
+class TestEligibleInterfaces(TestCase):
+    """Tests for the EligibleInterfaces class."""
+
+    def setUp(self):
+        """Create a switch with two interfaces."""
+        self.switch = get_switch_mock('00:00:00:00:00:00:00:01', 0x04)
+        self.interface_1 = get_interface_mock('s1-eth1', 1, self.switch)
+        self.interface_2 = get_interface_mock('s1-eth2', 2, self.switch)
+        self.switch.interfaces = {self.interface_1.id: self.interface_1,
+                                  self.interface_2.id: self.interface_2}
+        self.eligible = EligibleInterfaces()
+
+    def test_is_eligible(self):
+        """Test the conditions to receive LLDP packets."""
+        self.assertTrue(is_eligible(self.switch, self.interface_1, 0x04))
+        self.assertFalse(is_eligible(self.switch, self.interface_1, 0x05))
+
+        self.interface_1.port_number = 0xfffffffe
+        self.assertFalse(is_eligible(self.switch, self.interface_1, 0x04))
+        self.interface_1.port_number = 1
+        self.interface_1.is_enabled.return_value = False
+        self.assertFalse(is_eligible(self.switch, self.interface_1, 0x04))
+        self.interface_1.is_enabled.return_value = True
+        self.interface_1.lldp = False
+        self.assertFalse(is_eligible(self.switch, self.interface_1, 0x04))
+        self.interface_1.lldp = True
+        self.switch.is_connected.return_value = False
+        self.assertFalse(is_eligible(self.switch, self.interface_1, 0x04))
+
+    def test_update(self):
+        """Test the set is updated by switch and interface."""
+        self.eligible.update_switch(self.switch)
+        self.assertEqual(self.eligible.targets(),
+                         [(self.switch, self.interface_1, 0x04),
+                          (self.switch, self.interface_2, 0x04)])
+
+        self.interface_1.is_active.return_value = False
+        self.eligible.update_interface(self.interface_1)
+        self.assertNotIn(self.interface_1.id, self.eligible)
+        self.interface_1.is_active.return_value = True
+        self.eligible.update_interface(self.interface_1)
+        self.assertIn(self.interface_1.id, self.eligible)
+
+        self.eligible.remove_interface(self.interface_2)
+        self.assertEqual(len(self.eligible), 1)
+        self.eligible.remove_switch(self.switch.dpid)
+        self.assertEqual(len(self.eligible), 0)
+
+    def test_update_interfaces(self):
+        """Test many interfaces are added or removed at once."""
+        self.interface_2.lldp = False
+        self.eligible.update_interfaces([self.interface_1, self.interface_2])
+        self.assertEqual(self.eligible.targets(),
+                         [(self.switch, self.interface_1, 0x04)])
+
+        self.interface_1.lldp = False
+        self.interface_2.lldp = True
+        self.eligible.update_interfaces([self.interface_1, self.interface_2])
+        self.assertEqual(self.eligible.targets(),
+                         [(self.switch, self.interface_2, 0x04)])
+
+    def test_update_switch(self):
+        """Test a switch only adds or removes its own interfaces."""
+        other = get_switch_mock('00:00:00:00:00:00:00:02', 0x04)
+        interface = get_interface_mock('s2-eth1', 1, other)
+        other.interfaces = {interface.id: interface}
+        self.eligible.update_switch(self.switch)
+        self.eligible.update_switch(other)
+        self.assertEqual(len(self.eligible), 3)
+
+        self.interface_2.lldp = False
+        self.eligible.update_switch(self.switch)
+        self.assertEqual(len(self.eligible), 2)
+        self.eligible.remove_switch(self.switch.dpid)
+        self.assertEqual(self.eligible.targets(), [(other, interface, 0x04)])
+        self.eligible.remove_interface(interface)
+        self.eligible.remove_switch(other.dpid)
+        self.assertEqual(len(self.eligible), 0)
+
+    def test_pop_added(self):
+        """Test the interfaces added are kept until popped."""
+        self.assertEqual(self.eligible.pop_added(), set())
+        eligible = EligibleInterfaces(track_added=True)
+        eligible.update_switch(self.switch)
+        eligible.update_switch(self.switch)
+        self.assertEqual(eligible.pop_added(),
+                         {self.interface_1.id, self.interface_2.id})
+        self.assertEqual(eligible.pop_added(), set())
+
+        eligible.remove_interface(self.interface_1)
+        eligible.update_interface(self.interface_1)
+        self.interface_2.lldp = False
+        self.assertEqual(eligible.reconcile([self.switch]), 1)
+        self.interface_2.lldp = True
+        eligible.reconcile([self.switch])
+        self.assertEqual(eligible.pop_added(),
+                         {self.interface_1.id, self.interface_2.id})
+
+    def test_reconcile(self):
+        """Test reconcile rebuilds the set and returns the drift."""
+        self.assertEqual(self.eligible.reconcile([self.switch]), 2)
+        self.assertEqual(self.eligible.reconcile([self.switch]), 0)
+
+        self.interface_1.lldp = False
+        self.assertEqual(self.eligible.reconcile([self.switch]), 1)
+        self.assertEqual(self.eligible.targets(),
+                         [(self.switch, self.interface_2, 0x04)])
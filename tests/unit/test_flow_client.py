@@ -0,0 +1,209 @@
+"""Test the flow_manager client against a local HTTP server."""
+import json
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from concurrent.futures import Future
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import MagicMock, call, patch
+
+from napps.kytos.of_lldp.flow_client import FlowBatcher, FlowManagerClient
+from napps.kytos.of_lldp.metrics import Metrics
+
+
+class FlowManagerHandler(BaseHTTPRequestHandler):
+    """Answer flow_manager requests with the statuses set in the server."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length))
+        self.server.requests.append((self.command, self.path, body))
+        status = (self.server.statuses.pop(0) if self.server.statuses
+                  else 202)
+        data = json.dumps({'response': 'FlowMod Messages Sent'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_POST = _handle
+    do_DELETE = _handle
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Do not log the requests."""
+
+
+class TestFlowManagerClient(TestCase):
+    """Tests for the FlowManagerClient class."""
+
+    def setUp(self):
+        """Start the HTTP server and create the client."""
+        self.server = HTTPServer(('127.0.0.1', 0), FlowManagerHandler)
+        self.server.requests = []
+        self.server.statuses = []
+        thread = Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        url = f'http://127.0.0.1:{self.server.server_port}/flow_manager/v2'
+        self.metrics = Metrics()
+        self.client = FlowManagerClient(url, self.metrics, timeout=2,
+                                        retries=2, backoff=0.01)
+        self.addCleanup(self.client.shutdown)
+        self.flow = {'priority': 1000, 'match': {'dl_type': 0x88cc}}
+
+    def test_install_remove(self):
+        """Test flows are sent to the switch endpoint."""
+        dpid = '00:00:00:00:00:00:00:01'
+
+        response = self.client.install(dpid, [self.flow]).result()
+        self.assertEqual(response.status_code, 202)
+        response = self.client.remove(dpid, [self.flow]).result()
+        self.assertEqual(response.status_code, 202)
+
+        path = f'/flow_manager/v2/flows/{dpid}'
+        self.assertEqual(self.server.requests,
+                         [('POST', path, {'flows': [self.flow]}),
+                          ('DELETE', path, {'flows': [self.flow]})])
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_flow_manager_request_seconds']
+                         ['count'], 2)
+        self.assertEqual(metrics['of_lldp_flow_manager_failures_total'], 0)
+
+    def test_every_switch(self):
+        """Test flows without a dpid are sent to every switch."""
+        response = self.client.install(None, [self.flow]).result()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.server.requests,
+                         [('POST', '/flow_manager/v2/flows',
+                           {'flows': [self.flow]})])
+
+    def test_retry(self):
+        """Test server errors are retried."""
+        self.server.statuses = [500, 503]
+
+        response = self.client.install('00:01', [self.flow]).result()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(self.server.requests), 3)
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_flow_manager_retries_total'], 2)
+
+    def test_failure(self):
+        """Test failures after all the retries and client errors."""
+        self.server.statuses = [500, 500, 500, 400]
+
+        self.assertIsNone(self.client.install('00:01', [self.flow]).result())
+        self.assertIsNone(self.client.install('00:01', [self.flow]).result())
+
+        self.assertEqual(len(self.server.requests), 4)
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_flow_manager_failures_total'], 2)
+
+    def test_connection_error(self):
+        """Test connection errors are retried and reported as failures."""
+        self.client.url = 'http://127.0.0.1:1/flow_manager/v2'
+
+        self.assertIsNone(self.client.install('00:01', [self.flow]).result())
+
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_flow_manager_retries_total'], 2)
+        self.assertEqual(metrics['of_lldp_flow_manager_failures_total'], 1)
+
+
+class TestFlowBatcher(TestCase):
+    """Tests for the FlowBatcher class."""
+
+    def setUp(self):
+        """Create a batcher with a mocked client."""
+        self.client = MagicMock()
+        self.future = Future()
+        self.client.install.return_value = self.future
+        self.metrics = Metrics()
+        self.batcher = FlowBatcher(self.client, self.metrics, window=60)
+        self.addCleanup(self.batcher.shutdown)
+        self.flows = [{'priority': 1000}]
+
+    def test_batch(self):
+        """Test the changes are held until the batch is flushed."""
+        self.batcher.install('00:01', self.flows)
+        self.batcher.install('00:02', self.flows)
+        self.batcher.install('00:02', self.flows)
+        self.batcher.remove('00:03', self.flows)
+        self.assertEqual(len(self.batcher), 3)
+        self.client.install.assert_not_called()
+
+        self.batcher.flush()
+
+        self.assertEqual(len(self.batcher), 0)
+        self.assertEqual(self.client.install.call_count, 2)
+        self.client.remove.assert_called_once_with('00:03', self.flows)
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_flow_batch_size']['count'], 1)
+        self.assertEqual(metrics['of_lldp_flow_batch_size']['sum'], 3)
+
+    @patch('napps.kytos.of_lldp.flow_client.time.monotonic')
+    def test_every_switch(self, mock_monotonic):
+        """Test a batch of every switch is sent in a single request."""
+        mock_monotonic.return_value = 10
+        self.batcher.get_dpids = lambda: ['00:01', '00:02']
+        self.batcher.install('00:01', self.flows, since=4)
+        self.batcher.install('00:02', self.flows, since=8)
+        self.batcher.flush()
+
+        self.client.install.assert_called_once_with(None, self.flows)
+        self.future.set_result(MagicMock())
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_flow_fabric_requests_total'], 1)
+        self.assertEqual(metrics['of_lldp_flow_install_seconds']['count'], 2)
+        self.assertEqual(metrics['of_lldp_flow_install_seconds']['sum'], 8)
+
+        self.batcher.install('00:01', self.flows)
+        self.batcher.install('00:02', [{'priority': 2000}])
+        self.batcher.flush()
+        self.client.install.assert_has_calls(
+            [call('00:01', self.flows), call('00:02', [{'priority': 2000}])])
+
+    def test_cancel(self):
+        """Test opposite changes of a switch cancel out."""
+        self.batcher.install('00:01', self.flows)
+        self.batcher.remove('00:01', self.flows)
+        self.batcher.remove('00:02', self.flows)
+        self.batcher.install('00:02', self.flows)
+
+        self.batcher.flush()
+
+        self.client.install.assert_not_called()
+        self.client.remove.assert_not_called()
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_flow_changes_cancelled_total'], 4)
+        self.assertEqual(metrics['of_lldp_flow_batch_size']['count'], 0)
+
+    @patch('napps.kytos.of_lldp.flow_client.time.monotonic')
+    def test_install_time(self, mock_monotonic):
+        """Test the time from connection to installation is measured."""
+        mock_monotonic.return_value = 10
+        self.batcher.install('00:01', self.flows, since=4)
+        self.batcher.flush()
+
+        self.future.set_result(MagicMock())
+
+        histogram = self.metrics.as_dict()['of_lldp_flow_install_seconds']
+        self.assertEqual(histogram['count'], 1)
+        self.assertEqual(histogram['sum'], 6)
+
+    def test_timer(self):
+        """Test the batch is sent after the window, or at once without it."""
+        self.batcher.window = 0.05
+        self.batcher.install('00:01', self.flows)
+        timer = self.batcher._timer  # pylint: disable=protected-access
+        timer.join()
+        self.client.install.assert_called_once_with('00:01', self.flows)
+
+        self.batcher.window = 0
+        self.batcher.remove('00:01', self.flows)
+        self.client.remove.assert_called_once_with('00:01', self.flows)
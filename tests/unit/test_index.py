@@ -0,0 +1,78 @@
+"""Test the index of interfaces."""
+from unittest import TestCase
+
+from kytos.lib.helpers import get_interface_mock, get_switch_mock
+
+from napps.kytos.of_lldp.index import InterfaceIndex, get_of_version
+from tests.helpers import get_topology_mock
+
+
+class TestInterfaceIndex(TestCase):
+    """Tests for the InterfaceIndex class."""
+
+    def setUp(self):
+        """Execute steps before each tests."""
+        self.topology = get_topology_mock()
+        self.index = InterfaceIndex()
+        self.index.rebuild(self.topology.switches.values())
+
+    def test_rebuild(self):
+        """Test every interface is indexed with its OpenFlow version."""
+        switch = self.topology.switches['00:00:00:00:00:00:00:03']
+        interface = switch.interfaces['00:00:00:00:00:00:00:03:2']
+
+        self.assertEqual(len(self.index), 6)
+        self.assertEqual(self.index.get(switch.dpid, 2), (interface, 0x01))
+        self.assertIsNone(self.index.get(switch.dpid, 3))
+
+    def test_add_remove_interface(self):
+        """Test add_interface and remove_interface methods."""
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        interface = get_interface_mock('s1-eth3', 3, switch)
+
+        self.index.add_interface(interface)
+        self.assertEqual(self.index.get(switch.dpid, 3), (interface, 0x04))
+        self.index.remove_interface(interface)
+        self.index.remove_interface(interface)
+        self.assertIsNone(self.index.get(switch.dpid, 3))
+
+    def test_add_remove_switch(self):
+        """Test add_switch replaces the interfaces of a switch."""
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        del switch.interfaces['00:00:00:00:00:00:00:01:2']
+        switch.connection.protocol.version = 0x01
+
+        self.index.add_switch(switch)
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.index.get(switch.dpid, 1)[1], 0x01)
+
+        self.index.remove_switch(switch.dpid)
+        self.assertEqual(len(self.index), 4)
+
+    def test_get_interfaces(self):
+        """Test the interfaces are found by id, switch and pattern."""
+        switch = self.topology.switches['00:00:00:00:00:00:00:02']
+        interface = switch.interfaces['00:00:00:00:00:00:00:02:1']
+
+        self.assertIs(self.index.get_interface(interface.id), interface)
+        self.assertIsNone(self.index.get_interface('00:00:00:00:00:00:00:02'))
+        self.assertEqual(self.index.get_switch_interfaces(switch.dpid),
+                         list(switch.interfaces.values()))
+        self.assertIsNone(self.index.get_switch_interfaces('00:04'))
+        self.assertEqual(len(self.index.interfaces()), 6)
+
+        self.assertEqual(self.index.match(pattern='*:02:?'),
+                         list(switch.interfaces.values()))
+        self.assertEqual(self.index.match(regex='.*:02:1'), [interface])
+        self.assertEqual(len(self.index.match('*:1', '.*:01:2')), 4)
+        self.assertEqual(self.index.match(regex='.*:02'), [])
+        self.assertEqual(self.index.match(), [])
+
+        self.index.remove_switch(switch.dpid)
+        self.assertIsNone(self.index.get_interface(interface.id))
+
+    def test_get_of_version(self):
+        """Test get_of_version function."""
+        self.assertEqual(get_of_version(get_switch_mock('00:01', 0x04)),
+                         0x04)
+        self.assertIsNone(get_of_version(get_switch_mock('00:01')))
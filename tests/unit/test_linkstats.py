@@ -0,0 +1,108 @@
+"""Test the statistics of the links."""
+from unittest import TestCase
+
+from napps.kytos.of_lldp.linkstats import (LatencyStats, RingBuffer,
+                                           SequenceStats, percentile)
+
+
+class TestRingBuffer(TestCase):
+    """Tests for the RingBuffer class."""
+
+    def test_append(self):
+        """Test only the last values are kept, in order."""
+        ring = RingBuffer(3)
+        self.assertEqual(ring.values(), [])
+
+        ring.append(1)
+        ring.append(2)
+        self.assertEqual(ring.values(), [1, 2])
+        for value in (3, 4, 5):
+            ring.append(value)
+        self.assertEqual(ring.values(), [3, 4, 5])
+        self.assertEqual(len(ring), 3)
+
+    def test_typecode(self):
+        """Test buffers of other types take their item size."""
+        ring = RingBuffer(2, 'L')
+        ring.append(2 ** 32 - 1)
+        self.assertEqual(ring.values(), [2 ** 32 - 1])
+        # pylint: disable=protected-access
+        self.assertEqual(ring._values.buffer_info()[1], 2)
+
+
+class TestLatencyStats(TestCase):
+    """Tests for the LatencyStats class."""
+
+    def test_percentile(self):
+        """Test the nearest-rank percentiles."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.9), 7)
+
+    def test_add(self):
+        """Test the statistics of the samples."""
+        stats = LatencyStats(alpha=0.5, window=4)
+        self.assertEqual(stats.as_dict(),
+                         {'last': None, 'ewma': None, 'min': None,
+                          'max': None, 'count': 0, 'p50': None, 'p90': None,
+                          'p99': None})
+
+        for rtt in (0.004, 0.002, 0.001, 0.008, 0.003):
+            stats.add(rtt)
+
+        self.assertEqual(stats.as_dict(),
+                         {'last': 0.003, 'ewma': 0.004, 'min': 0.001,
+                          'max': 0.008, 'count': 5, 'p50': 0.002,
+                          'p90': 0.008, 'p99': 0.008})
+
+
+class TestSequenceStats(TestCase):
+    """Tests for the SequenceStats class."""
+
+    def test_loss(self):
+        """Test the probes lost are counted from the sequence gaps."""
+        stats = SequenceStats(window=4)
+        self.assertIsNone(stats.window_loss())
+        for sequence in (10, 11, 13, 14, 17, 16):
+            stats.add(sequence, 0.001)
+
+        result = stats.as_dict()
+        self.assertEqual((result['sent'], result['received'],
+                          result['reordered'], result['last_sequence']),
+                         (8, 6, 1, 17))
+        self.assertEqual(result['loss'], 0.25)
+        self.assertAlmostEqual(result['window_loss'], 0.2)
+        self.assertEqual(result['jitter'], 0)
+
+    def test_trailing_loss(self):
+        """Test the probes lost after the last one received are counted."""
+        stats = SequenceStats()
+        for sequence in (1, 2):
+            stats.add(sequence, 0.001)
+
+        self.assertEqual(stats.as_dict()['loss'], 0)
+        result = stats.as_dict(last_sent=4)
+        self.assertEqual((result['sent'], result['received']), (4, 2))
+        self.assertEqual(result['loss'], 0.5)
+        # A sender behind the probes received, e.g. after a restart.
+        self.assertEqual(stats.sent(last_sent=1), 2)
+
+    def test_wrap(self):
+        """Test the sequence numbers wrap around 32 bits."""
+        stats = SequenceStats()
+        for sequence in (2 ** 32 - 2, 2 ** 32 - 1, 1):
+            stats.add(sequence, 0.001)
+
+        self.assertEqual((stats.sent(), stats.received), (4, 3))
+        self.assertEqual(stats.window_loss(), 0.25)
+        self.assertEqual(stats.sent(last_sent=3), 6)
+
+    def test_jitter(self):
+        """Test the jitter follows the round-trip time variation."""
+        stats = SequenceStats()
+        stats.add(1, 0.001)
+        stats.add(2, 0.017)
+        self.assertAlmostEqual(stats.jitter, 0.001)
+        stats.add(3, 0.017)
+        self.assertAlmostEqual(stats.jitter, 0.001 * 15 / 16)
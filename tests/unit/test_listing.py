@@ -0,0 +1,88 @@
+"""Test the pages of the interface ids by LLDP state."""
+import json
+from unittest import TestCase
+
+from kytos.lib.helpers import get_interface_mock, get_switch_mock
+
+from napps.kytos.of_lldp.listing import InterfaceListing
+
+
+class TestInterfaceListing(TestCase):
+    """Tests for the InterfaceListing class."""
+
+    def setUp(self):
+        """Create two switches with three interfaces each."""
+        self.switches = []
+        for number in (2, 1):
+            switch = get_switch_mock(f'00:00:00:00:00:00:00:0{number}', 0x04)
+            interfaces = [get_interface_mock(f's{number}-eth{port}', port,
+                                             switch)
+                          for port in (3, 1, 2)]
+            switch.interfaces = {interface.id: interface
+                                 for interface in interfaces}
+            self.switches.append(switch)
+        self.listing = InterfaceListing()
+
+    def get_page(self, **kwargs):
+        """Return a page decoded from JSON."""
+        return json.loads(self.listing.page(self.switches, **kwargs))
+
+    def test_page(self):
+        """Test the ids are sorted and paginated with a cursor."""
+        page = self.get_page(limit=4)
+        self.assertEqual(page['interfaces'],
+                         ['00:00:00:00:00:00:00:01:1',
+                          '00:00:00:00:00:00:00:01:2',
+                          '00:00:00:00:00:00:00:01:3',
+                          '00:00:00:00:00:00:00:02:1'])
+        self.assertEqual(page['next'], '00:00:00:00:00:00:00:02:1')
+        page = self.get_page(limit=4, cursor=page['next'])
+        self.assertEqual(page, {'interfaces': ['00:00:00:00:00:00:00:02:2',
+                                               '00:00:00:00:00:00:00:02:3'],
+                                'next': None})
+        self.assertEqual(len(self.get_page()['interfaces']), 6)
+
+    def test_filters(self):
+        """Test the ids are filtered by switch and by LLDP state."""
+        switch = self.switches[0]
+        interface = switch.interfaces['00:00:00:00:00:00:00:02:2']
+        interface.lldp = False
+
+        page = self.get_page(dpid=switch.dpid)
+        self.assertEqual(page['interfaces'], ['00:00:00:00:00:00:00:02:1',
+                                              '00:00:00:00:00:00:00:02:3'])
+        page = self.get_page(state='disabled')
+        self.assertEqual(page['interfaces'], [interface.id])
+        page = self.get_page(state='all', dpid=switch.dpid, limit=2)
+        self.assertEqual(page['next'], '00:00:00:00:00:00:00:02:2')
+        page = self.get_page(dpid='00:00:00:00:00:00:00:03')
+        self.assertEqual(page['interfaces'], [])
+
+        with self.assertRaises(ValueError):
+            self.get_page(state='unknown')
+        with self.assertRaises(ValueError):
+            self.get_page(limit=0)
+
+    def test_version(self):
+        """Test the pages are cached until the version changes."""
+        etag = self.listing.etag
+        page = self.listing.page(self.switches)
+        interface = self.switches[0].interfaces['00:00:00:00:00:00:00:02:1']
+        interface.lldp = False
+        self.assertIs(self.listing.page(self.switches), page)
+        self.assertEqual(self.listing.etag, etag)
+
+        self.listing.invalidate()
+        self.assertNotEqual(self.listing.etag, etag)
+        self.assertNotIn(interface.id, self.get_page()['interfaces'])
+
+    def test_reconcile(self):
+        """Test reconcile only starts a new version after a change."""
+        self.listing.page(self.switches)
+        self.assertFalse(self.listing.reconcile(self.switches))
+        version = self.listing.version
+
+        self.switches[1].interfaces['00:00:00:00:00:00:00:01:3'].lldp = False
+        self.assertTrue(self.listing.reconcile(self.switches))
+        self.assertEqual(self.listing.version, version + 1)
+        self.assertEqual(len(self.get_page()['interfaces']), 5)
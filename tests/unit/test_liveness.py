@@ -0,0 +1,142 @@
+"""Test the link liveness tracker."""
+from unittest import TestCase
+
+from kytos.core.link import Link
+from kytos.lib.helpers import get_interface_mock
+
+from napps.kytos.of_lldp.liveness import (LinkLivenessTracker, link_id,
+                                          link_key)
+from tests.helpers import get_topology_mock
+
+
+# pylint: disable=protected-access
+class TestLinkLivenessTracker(TestCase):
+    """Tests for the LinkLivenessTracker class."""
+
+    def setUp(self):
+        """Execute steps before each tests."""
+        self.topology = get_topology_mock()
+        self.links = [(link.endpoint_a, link.endpoint_b)
+                      for link in self.topology.links.values()]
+        self.tracker = LinkLivenessTracker(timeout=9)
+
+    def test_link_key(self):
+        """Test both directions of a link have the same key."""
+        interface_a, interface_b = self.links[0]
+        # pylint: disable=arguments-out-of-order
+        self.assertEqual(link_key(interface_a, interface_b),
+                         link_key(interface_b, interface_a))
+
+    def test_seen(self):
+        """Test seen only reports new links without heartbeat."""
+        interface_a, interface_b = self.links[0]
+        self.tracker.heartbeat = 30
+
+        self.assertTrue(self.tracker.seen(interface_a, interface_b, now=0))
+        self.assertFalse(self.tracker.seen(interface_b, interface_a, now=3))
+
+        link = self.tracker.get(interface_a, interface_b)
+        self.assertEqual((link.first_seen, link.last_seen), (0, 3))
+        self.assertEqual(len(self.tracker), 1)
+
+    def test_seen_heartbeat(self):
+        """Test known links are announced every heartbeat seconds."""
+        self.tracker.heartbeat = 10
+        announced = [now for now in range(0, 30, 3)
+                     if self.tracker.seen(*self.links[0], now=now)]
+        self.assertEqual(announced, [0, 12, 24])
+
+        self.tracker.heartbeat = 0
+        self.assertTrue(self.tracker.seen(*self.links[0], now=27))
+        self.assertTrue(self.tracker.seen(*self.links[0], now=27))
+
+    def test_seen_changed(self):
+        """Test a link is announced when one of its interfaces changes."""
+        interface_a, interface_b = self.links[0]
+        self.tracker.heartbeat = 30
+        self.tracker.seen(interface_a, interface_b, now=0)
+
+        new_interface_b = get_interface_mock(interface_b.name,
+                                             interface_b.port_number,
+                                             interface_b.switch)
+        self.assertTrue(self.tracker.seen(interface_a, new_interface_b,
+                                          now=3))
+        self.assertFalse(self.tracker.seen(new_interface_b, interface_a,
+                                           now=6))
+        link = self.tracker.get(interface_a, interface_b)
+        self.assertIs(link.interface_b, new_interface_b)
+
+    def test_expire(self):
+        """Test only the links not seen within the timeout expire."""
+        for interface_a, interface_b in self.links:
+            self.tracker.seen(interface_a, interface_b, now=0)
+        self.tracker.seen(*self.links[1], now=6)
+
+        self.assertEqual(self.tracker.expire(now=8), [])
+        expired = self.tracker.expire(now=9)
+        self.assertEqual([(link.interface_a, link.interface_b)
+                          for link in expired],
+                         [self.links[0], self.links[2]])
+        self.assertEqual(len(self.tracker), 1)
+        self.assertFalse(self.tracker.has_link(self.links[0][0].id))
+        self.assertTrue(self.tracker.has_link(self.links[1][1].id))
+
+        self.assertEqual(self.tracker.expire(now=14), [])
+        self.assertEqual(len(self.tracker.expire(now=15)), 1)
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_expire_only_due_deadlines(self):
+        """Test links seen again are pushed back once per timeout."""
+        self.tracker.seen(*self.links[0], now=0)
+        for now in range(1, 30):
+            self.tracker.seen(*self.links[0], now=now)
+            self.assertEqual(self.tracker.expire(now=now), [])
+            self.assertEqual(len(self.tracker._deadlines), 1)
+
+    def test_remove(self):
+        """Test removed links do not expire and can be seen again."""
+        self.tracker.seen(*self.links[0], now=0)
+        self.assertTrue(self.tracker.has_link(self.links[0][1].id))
+        self.tracker.remove(*self.links[0])
+        self.assertFalse(self.tracker.has_link(self.links[0][1].id))
+        self.assertEqual(self.tracker.expire(now=10), [])
+
+        self.tracker.seen(*self.links[0], now=0)
+        self.tracker.remove(*self.links[0])
+        self.tracker.seen(*self.links[0], now=5)
+        self.assertEqual(self.tracker.expire(now=10), [])
+        self.assertEqual(len(self.tracker._deadlines), 1)
+        self.assertEqual(len(self.tracker.expire(now=14)), 1)
+
+    def test_remove_interface(self):
+        """Test the link of an interface is forgotten and announced again."""
+        tracker = LinkLivenessTracker(timeout=9, heartbeat=60)
+        interface_a, interface_b = self.links[0]
+        tracker.seen(interface_a, interface_b, now=0)
+        link = tracker.get(interface_a, interface_b)
+        self.assertFalse(tracker.seen(interface_a, interface_b, now=1))
+
+        self.assertIs(tracker.remove_interface(interface_b.id), link)
+        self.assertIsNone(tracker.remove_interface(interface_b.id))
+        self.assertFalse(tracker.has_link(interface_a.id))
+        self.assertEqual(len(tracker), 0)
+        self.assertTrue(tracker.seen(interface_a, interface_b, now=2))
+
+    def test_link_id(self):
+        """Test the link ids are the ones of kytos.core."""
+        for interface_a, interface_b in self.links:
+            # pylint: disable=arguments-out-of-order
+            self.assertEqual(link_id(interface_a, interface_b),
+                             Link(interface_a, interface_b).id)
+            self.assertEqual(link_id(interface_b, interface_a),
+                             Link(interface_a, interface_b).id)
+
+        self.tracker.seen(*self.links[0], now=0)
+        link = self.tracker.get(*self.links[0])
+        self.assertEqual(link.id, Link(*self.links[0]).id)
+        self.assertEqual(self.tracker.links(), [link])
+        self.assertIs(self.tracker.find(link.id), link)
+        self.assertIsNone(self.tracker.find('unknown'))
+        self.tracker.remove(*self.links[0])
+        self.assertIsNone(self.tracker.find(link.id))
+        self.assertEqual(self.tracker._ids, {})
@@ -1,14 +1,25 @@
 """Test Main methods."""
+import tempfile
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import MagicMock, call, patch
 
-from kytos.lib.helpers import (get_controller_mock, get_kytos_event_mock,
-                               get_switch_mock, get_test_client)
+from kytos.lib.helpers import (get_controller_mock, get_interface_mock,
+                               get_kytos_event_mock, get_switch_mock,
+                               get_test_client)
 
-from tests.helpers import get_topology_mock
+from napps.kytos.of_lldp import settings
+from napps.kytos.of_lldp.adaptive import ProbeScheduler
+from napps.kytos.of_lldp.backpressure import Backpressure
+from napps.kytos.of_lldp.builder import LLDPFrameBuilder
+from napps.kytos.of_lldp.decoder import decode_probe
+from napps.kytos.of_lldp.pacing import SendPacer
+from napps.kytos.of_lldp.persistence import StateStore, open_store
+from napps.kytos.of_lldp.ratelimit import GlobalRateLimiter, RateLimiter
+from tests.helpers import get_lldp_frame, get_topology_mock
 
 
-# pylint: disable=protected-access
+# pylint: disable=protected-access, too-many-public-methods
 class TestMain(TestCase):
     """Tests for the Main class."""
 
@@ -27,6 +38,50 @@ class TestMain(TestCase):
 
         self.napp = Main(controller)
 
+    def test_warm_start(self):
+        """Test the LLDP state saved is restored and its links probed."""
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        path = Path(folder.name) / 'of_lldp.sqlite3'
+        store = StateStore(path)
+        store.save_lldp(['00:00:00:00:00:00:00:01:2'], False)
+        store.save_setting('polling_time', 5)
+        store.save_links([('00:00:00:00:00:00:00:02:2',
+                           '00:00:00:00:00:00:00:03:1')])
+        store.close()
+
+        with patch.object(settings, 'STATE_FILE', path):
+            napp = type(self.napp)(self.napp.controller)
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        self.assertFalse(switch.interfaces['00:00:00:00:00:00:00:01:2'].lldp)
+        self.assertEqual(napp.polling_time, 5)
+
+        with patch.object(napp, '_send_lldp_packet_outs') as mock_send:
+            mock_send.return_value = 0
+            napp.execute()
+            targets = mock_send.call_args[0][0]
+            self.assertCountEqual([target[1].id for target in targets[:2]],
+                                  ['00:00:00:00:00:00:00:02:2',
+                                   '00:00:00:00:00:00:00:03:1'])
+            self.assertEqual(napp._warm_interfaces, set())
+
+        api = get_test_client(napp.controller, napp)
+        api.open(f'{self.server_name_url}/v1/interfaces/enable',
+                 method='POST', json={'switches': [switch.dpid]})
+        api.open(f'{self.server_name_url}/v1/polling_time', method='POST',
+                 json={'polling_time': 4})
+        interface_a = switch.interfaces['00:00:00:00:00:00:00:01:1']
+        interface_b = self.topology.switches[
+            '00:00:00:00:00:00:00:02'].interfaces['00:00:00:00:00:00:00:02:1']
+        napp.link_tracker.seen(interface_a, interface_b)
+        napp.shutdown()
+
+        _, state = open_store(path)
+        self.assertEqual(state.lldp, {'00:00:00:00:00:00:00:01:1': True,
+                                      '00:00:00:00:00:00:00:01:2': True})
+        self.assertEqual(state.settings, {'polling_time': 4})
+        self.assertEqual(state.links, [(interface_a.id, interface_b.id)])
+
     def get_topology_interfaces(self):
         """Return interfaces present in topology."""
         interfaces = []
@@ -35,39 +90,452 @@ class TestMain(TestCase):
         return interfaces
 
     @patch('kytos.core.buffers.KytosEventBuffer.put')
-    @patch('napps.kytos.of_lldp.main.Main._build_lldp_packet_out')
+    @patch('napps.kytos.of_lldp.main.LLDPFrameBuilder.build')
     @patch('napps.kytos.of_lldp.main.KytosEvent')
-    @patch('napps.kytos.of_lldp.main.VLAN')
-    @patch('napps.kytos.of_lldp.main.Ethernet')
-    @patch('napps.kytos.of_lldp.main.DPID')
-    @patch('napps.kytos.of_lldp.main.LLDP')
     def test_execute(self, *args):
         """Test execute method."""
-        (_, _, mock_ethernet, _, mock_kytos_event, mock_build_lldp_packet_out,
-         mock_buffer_put) = args
+        (mock_kytos_event, mock_build, mock_buffer_put) = args
 
-        ethernet = MagicMock()
-        ethernet.pack.return_value = 'pack'
         interfaces = self.get_topology_interfaces()
-        po_args = [(interface.switch.connection.protocol.version,
-                    interface.port_number, 'pack') for interface in interfaces]
+        build_args = [(interface.switch.connection.protocol.version,
+                       self.napp.vlan_id, interface.switch.dpid,
+                       interface.port_number, interface.address)
+                      for interface in interfaces]
 
-        mock_ethernet.return_value = ethernet
-        mock_kytos_event.side_effect = po_args
+        mock_kytos_event.side_effect = build_args
 
-        self.napp.execute()
+        for _ in range(self.napp.pacer.slots):
+            self.napp.execute()
 
-        mock_build_lldp_packet_out.assert_has_calls([call(*(arg))
-                                                     for arg in po_args])
+        mock_build.assert_has_calls([call(*(arg)) for arg in build_args],
+                                    any_order=True)
+        self.assertEqual(mock_build.call_count, len(build_args))
         mock_buffer_put.assert_has_calls([call(arg)
-                                          for arg in po_args])
+                                          for arg in build_args],
+                                         any_order=True)
+        metrics = self.napp.metrics.as_dict()
+        self.assertEqual(metrics['of_lldp_packet_out_built_total'],
+                         len(build_args))
+        self.assertEqual(metrics['of_lldp_packet_out_sent_total'],
+                         len(build_args))
+        self.assertEqual(metrics['of_lldp_packet_out_per_cycle']['sum'],
+                         len(build_args))
+        self.assertEqual(metrics['of_lldp_execute_seconds']['count'],
+                         self.napp.pacer.slots)
+
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_execute_slots(self, mock_send):
+        """Test execute spreads the interfaces across the slots."""
+        mock_send.return_value = True
+        interfaces = self.get_topology_interfaces()
+        self.napp.pacer = SendPacer(3)
+
+        self.napp.execute()
+        self.assertEqual(mock_send.call_count, 2)
+        self.napp.execute()
+        self.napp.execute()
+        self.assertEqual(mock_send.call_count, len(interfaces))
+
+        self.napp.pacer = SendPacer(1)
+        self.napp.execute()
+        self.assertEqual(mock_send.call_count, 2 * len(interfaces))
+
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_execute_max_batch(self, mock_send):
+        """Test the link timeout follows rounds longer than the interval."""
+        mock_send.return_value = True
+        interfaces = self.get_topology_interfaces()
+        # More targets than slots * max_batch: the round needs 6 slots.
+        self.napp.pacer = SendPacer(2, max_batch=1)
+        timeout = self.napp.polling_time * settings.LINK_TIMEOUT_INTERVALS
+
+        self.napp.execute()
+        self.assertEqual(self.napp.link_tracker.timeout, 3 * timeout)
+        for _ in range(len(interfaces) - 1):
+            self.napp.execute()
+        self.assertEqual(mock_send.call_count, len(interfaces))
+
+        self.napp.pacer = SendPacer(2, max_batch=10)
+        self.napp.execute()
+        self.assertEqual(self.napp.link_tracker.timeout, timeout)
+
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_execute_adaptive(self, mock_send):
+        """Test execute only probes the interfaces whose interval elapsed."""
+        mock_send.return_value = True
+        interfaces = self.get_topology_interfaces()
+        with patch.multiple(settings, ADAPTIVE_PROBING=True,
+                            PROBE_MIN_INTERVAL=1, PROBE_MAX_INTERVAL=30,
+                            PROBE_EDGE_INTERVAL=120):
+            self.napp = type(self.napp)(self.napp.controller)
+        self.assertIsInstance(self.napp.probe_scheduler, ProbeScheduler)
+        self.assertEqual(self.napp._get_link_timeout(),
+                         30 * settings.LINK_TIMEOUT_INTERVALS)
+
+        self.napp.execute()
+        self.assertEqual(mock_send.call_count, len(interfaces))
+        self.napp.execute()
+        self.assertEqual(mock_send.call_count, len(interfaces))
 
-    @patch('requests.delete')
-    @patch('requests.post')
-    def test_handle_lldp_flows(self, mock_post, mock_delete):
+        event = get_kytos_event_mock(
+            name='kytos/of_core.switch.interface.modified',
+            content={'interface': interfaces[0]})
+        self.napp.handle_interface_changed(event)
+        self.napp.execute()
+        self.assertEqual(mock_send.call_count, len(interfaces) + 1)
+        mock_send.assert_called_with(interfaces[0].switch, interfaces[0],
+                                     0x04)
+
+    @patch('napps.kytos.of_lldp.main.settings')
+    @patch('napps.kytos.of_lldp.main.time.monotonic')
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_execute_overrun(self, *args):
+        """Test slow executions are counted and defer their PacketOuts."""
+        (mock_send, mock_monotonic, mock_settings) = args
+        mock_send.return_value = True
+        mock_settings.EXECUTE_DEFER = True
+        mock_settings.EXECUTE_BUDGET = 0.8
+        mock_settings.ELIGIBILITY_RECONCILE_ROUNDS = 10
+        interfaces = self.get_topology_interfaces()
+        self.napp.pacer = SendPacer(1)
+        interval = self.napp.polling_time
+        # The time runs out after sending two PacketOuts.
+        mock_monotonic.side_effect = lambda: (2 * interval
+                                              if mock_send.call_count >= 2
+                                              else 0)
+
+        self.napp.execute()
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(self.napp.execute_overrun_counter.value, 1)
+        self.assertEqual(self.napp.packet_out_deferred_counter.value,
+                         len(interfaces) - 2)
+
+        mock_settings.EXECUTE_DEFER = False
+        mock_monotonic.side_effect = None
+        mock_monotonic.return_value = 0
+        self.napp.execute()
+
+        self.assertEqual(mock_send.call_count, 2 + len(interfaces))
+        self.assertEqual(self.napp.execute_overrun_counter.value, 1)
+
+    @patch('napps.kytos.of_lldp.main.time.monotonic')
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_packet_out_rate_limit(self, mock_send, mock_monotonic):
+        """Test the PacketOuts over the rate limits are deferred once."""
+        mock_send.return_value = True
+        mock_monotonic.return_value = 0
+        self.napp.packet_out_limiter = GlobalRateLimiter(key_rate=1,
+                                                         key_burst=1)
+        targets = [target for target in self.napp._get_lldp_targets()
+                   if target[0].dpid == '00:00:00:00:00:00:00:01']
+
+        self.assertEqual(self.napp._send_lldp_packet_outs(targets), 1)
+        self.assertEqual(self.napp._deferred, targets[1:])
+        self.assertEqual(self.napp.packet_out_limited_counter.value, 1)
+
+        targets_deferred, deferred = self.napp._merge_deferred([])
+        self.assertEqual(self.napp._send_lldp_packet_outs(
+            targets_deferred, deferred=deferred), 0)
+        self.assertEqual(self.napp._deferred, [])
+        self.assertEqual(self.napp.packet_out_dropped_counter.value, 1)
+
+        mock_monotonic.return_value = 1
+        self.assertEqual(self.napp._send_lldp_packet_outs(targets[1:]), 1)
+        mock_send.assert_called_with(*targets[1])
+
+    @patch('napps.kytos.of_lldp.main.time.monotonic')
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_packet_out_rate_limit_rotation(self, mock_send, mock_monotonic):
+        """Test every target is eventually sent under the rate limits."""
+        mock_send.return_value = True
+        mock_monotonic.return_value = 0
+        self.napp.packet_out_limiter = GlobalRateLimiter(rate=1, burst=1)
+        targets = self.napp._get_lldp_targets()
+
+        for tick in range(len(targets)):
+            mock_monotonic.return_value = tick
+            # Each round sends its targets and the deferred ones next.
+            merged, deferred = self.napp._merge_deferred(
+                targets if tick % 2 == 0 else [])
+            self.napp._send_lldp_packet_outs(merged, deferred=deferred)
+
+        sent = [call_args[0][1] for call_args in mock_send.call_args_list]
+        self.assertCountEqual(sent, [target[1] for target in targets])
+
+    def test_backpressure(self):
+        """Test the PacketOuts are throttled by the msg_out depth."""
+        self.napp.backpressure = Backpressure(high=10, low=2)
+        targets = self.napp._get_lldp_targets()
+        interface_a, interface_b = targets[0][1], targets[-1][1]
+        self.napp.link_tracker.seen(interface_a, interface_b)
+        msg_out = MagicMock(**{'qsize.return_value': 1})
+        self.napp.controller.buffers.msg_out = msg_out
+
+        self.assertEqual(self.napp._apply_backpressure(targets), targets)
+        self.assertEqual(self.napp.throttled_cycles_counter.value, 0)
+
+        msg_out.qsize.return_value = 12
+        self.assertEqual(self.napp._apply_backpressure(targets), [])
+        msg_out.qsize.return_value = 6
+        allowed = self.napp._apply_backpressure(targets)
+        self.assertEqual(allowed, targets[1:-1][:4])
+        self.assertEqual(self.napp.throttled_cycles_counter.value, 2)
+        self.assertEqual(self.napp.throttled_counter.value,
+                         2 * len(targets) - 4)
+
+    def test_backpressure_deferred(self):
+        """Test the deferred targets count against the budget."""
+        self.napp.backpressure = Backpressure(high=10, low=2)
+        self.napp.pacer = SendPacer(1)
+        targets = self.napp._get_lldp_targets()
+        self.napp._deferred = targets[:4]
+        self.napp.controller.buffers.msg_out = MagicMock(
+            **{'qsize.return_value': 12})
+        self.napp.backpressure.budget(12)
+
+        with patch.object(self.napp, '_send_lldp_packet_out') as mock_send:
+            mock_send.return_value = True
+            self.napp.controller.buffers.msg_out.qsize.return_value = 7
+            self.napp.execute()
+            self.assertEqual(mock_send.call_count, 3)
+            self.assertEqual(self.napp._deferred, targets[3:])
+
+            self.napp.controller.buffers.msg_out.qsize.return_value = 0
+            self.napp.execute()
+            self.assertEqual(mock_send.call_count, 3 + len(targets))
+            self.assertEqual(self.napp._deferred, [])
+
+    def test_backpressure_connection(self):
+        """Test the switches with a full write buffer are skipped."""
+        self.napp.backpressure = Backpressure(high=10, low=2)
+        targets = self.napp._get_lldp_targets()
+        switch = targets[0][0]
+        switch.connection = MagicMock()
+        self.napp.controller.buffers.msg_out = MagicMock(
+            **{'qsize.return_value': 0})
+
+        with patch('napps.kytos.of_lldp.main.get_write_buffer_size') as size:
+            size.side_effect = lambda connection: (
+                settings.BACKPRESSURE_CONNECTION_HIGH + 1
+                if connection is switch.connection else 0)
+            allowed = self.napp._apply_backpressure(targets)
+        self.assertEqual(allowed, [target for target in targets
+                                   if target[0] is not switch])
+
+    def test_profile(self):
+        """Test the next cycles are profiled on demand."""
+        api = get_test_client(self.napp.controller, self.napp)
+        url = f'{self.server_name_url}/v1/profile'
+
+        response = api.open(url, method='POST', json={'cycles': 1})
+        self.assertEqual(response.status_code, 200)
+        self.napp.execute()
+        self.napp.execute()
+
+        response = api.open(f'{url}?limit=1000', method='GET')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['cycles'], 1)
+        self.assertEqual(response.json['remaining'], 0)
+        self.assertIn('_send_lldp_packet_outs', response.json['stats'])
+
+        response = api.open(url, method='POST', json={'cycles': 0})
+        self.assertEqual(response.status_code, 400)
+        response = api.open(f'{url}?sort=unknown', method='GET')
+        self.assertEqual(response.status_code, 400)
+
+    @patch('napps.kytos.of_lldp.main.time.monotonic')
+    @patch('kytos.core.buffers.KytosEventBuffer.put')
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_probe_interfaces(self, *args):
+        """Test the immediate probes are rate limited and measured."""
+        (mock_send, _, mock_monotonic) = args
+        mock_monotonic.return_value = 1
+        self.napp.probe_limiter = RateLimiter(1, 1)
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        interfaces = list(switch.interfaces.values())
+        other = self.topology.switches['00:00:00:00:00:00:00:02']
+        interfaces[1].lldp = False
+        self.napp.eligible_interfaces.update_interface(interfaces[1])
+
+        event = get_kytos_event_mock(
+            name='kytos/of_core.switch.interface.link_up',
+            content={'interface': interfaces[1]})
+        self.napp.handle_interface_changed(event)
+        mock_send.assert_not_called()
+
+        event.content['interface'] = interfaces[0]
+        self.napp.handle_interface_changed(event)
+        self.napp.handle_interface_changed(event)
+        mock_send.assert_called_once_with(switch, interfaces[0], 0x04)
+        self.assertEqual(self.napp.probe_limited_counter.value, 1)
+
+        mock_monotonic.return_value = 1.25
+        self.napp.interface_index.rebuild([switch, other])
+        other_interface = list(other.interfaces.values())[0]
+        frame = get_lldp_frame(switch.dpid, interfaces[0].port_number)
+        message = MagicMock(in_port=other_interface.port_number, data=frame)
+        event = get_kytos_event_mock(name='kytos/of_core.v0x04.messages.in.'
+                                     'ofpt_packet_in',
+                                     content={'source': other.connection,
+                                              'message': message})
+        self.napp.notify_uplink_detected(event)
+
+        histogram = self.napp.discovery_histogram.value
+        self.assertEqual((histogram['count'], histogram['sum']), (1, 0.25))
+        self.assertEqual(self.napp._probed_at, {})
+
+    @patch('napps.kytos.of_lldp.main.time.monotonic')
+    @patch('napps.kytos.of_lldp.main.Main._send_lldp_packet_out')
+    def test_probe_interfaces_packet_out_limit(self, mock_send,
+                                               mock_monotonic):
+        """Test no probe token is taken if the PacketOut limit rejects it."""
+        mock_monotonic.return_value = 0
+        self.napp.probe_limiter = RateLimiter(1, 1)
+        self.napp.packet_out_limiter = GlobalRateLimiter(rate=1, burst=1)
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        interfaces = list(switch.interfaces.values())
+        self.napp.packet_out_limiter.allow('other')
+
+        self.napp._probe_interfaces(switch, interfaces[:1])
+        mock_send.assert_not_called()
+        self.assertTrue(self.napp.probe_limiter.check(switch.dpid))
+
+        mock_monotonic.return_value = 1
+        self.napp._probe_interfaces(switch, interfaces[:1])
+        mock_send.assert_called_once()
+        self.assertFalse(self.napp.probe_limiter.check(switch.dpid))
+
+    @patch('napps.kytos.of_lldp.main.time.monotonic')
+    def test_prune_probed_at(self, mock_monotonic):
+        """Test the immediate probes older than the link timeout are pruned."""
+        timeout = self.napp.link_tracker.timeout
+        self.napp._probed_at = {'a': 0, 'b': 1, 'c': 5}
+        self.napp._prune_probed_at(timeout + 1)
+        self.assertEqual(self.napp._probed_at, {'b': 1, 'c': 5})
+
+        # An old probe answered is not measured.
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        other = self.topology.switches['00:00:00:00:00:00:00:02']
+        interface = list(switch.interfaces.values())[0]
+        other_interface = list(other.interfaces.values())[0]
+        self.napp.interface_index.rebuild([switch, other])
+        self.napp._probed_at[interface.id] = 0
+        mock_monotonic.return_value = timeout + 1
+        frame = get_lldp_frame(switch.dpid, interface.port_number)
+        message = MagicMock(in_port=other_interface.port_number, data=frame)
+        event = get_kytos_event_mock(name='kytos/of_core.v0x04.messages.in.'
+                                     'ofpt_packet_in',
+                                     content={'source': other.connection,
+                                              'message': message})
+        self.napp.notify_uplink_detected(event)
+        self.assertEqual(self.napp.discovery_histogram.value['count'], 0)
+        self.assertNotIn(interface.id, self.napp._probed_at)
+
+    def test_get_lldp_targets(self):
+        """Test the eligible interfaces are reconciled from time to time."""
+        interfaces = self.get_topology_interfaces()
+        self.assertEqual(len(self.napp._get_lldp_targets()), len(interfaces))
+
+        interfaces[0].lldp = False
+        interfaces[1].is_active.return_value = False
+        interfaces[2].port_number = 0xfffffffe
+        switch = self.topology.switches['00:00:00:00:00:00:00:03']
+        switch.is_connected.return_value = False
+        self.assertEqual(len(self.napp._get_lldp_targets()), len(interfaces))
+
+        ticks = settings.ELIGIBILITY_RECONCILE_ROUNDS * self.napp.pacer.slots
+        self.napp._ticks = ticks - 1
+        self.napp._reconcile_eligible_interfaces()
+        targets = self.napp._get_lldp_targets()
+
+        self.assertEqual(targets, [(interfaces[3].switch, interfaces[3],
+                                    0x04)])
+        drift = len(interfaces) - 1
+        self.assertEqual(self.napp.eligibility_drift_counter.value, drift)
+
+    def test_handle_eligibility_events(self):
+        """Test the eligible interfaces are updated from events."""
+        interfaces = self.get_topology_interfaces()
+        eligible = self.napp.eligible_interfaces
+        switch = interfaces[0].switch
+
+        switch.is_connected.return_value = False
+        connection = MagicMock(switch=switch)
+        event = get_kytos_event_mock(
+            name='kytos/core.openflow.connection.lost',
+            content={'source': connection})
+        self.napp.handle_connection_lost(event)
+        self.assertNotIn(interfaces[0].id, eligible)
+
+        switch.is_connected.return_value = True
+        event = get_kytos_event_mock(name='kytos/of_core.handshake.completed',
+                                     content={'switch': switch})
+        self.napp.handle_switch_connected(event)
+        self.assertIn(interfaces[0].id, eligible)
+
+        interfaces[0].is_active.return_value = False
+        event = get_kytos_event_mock(
+            name='kytos/of_core.switch.interface.link_down',
+            content={'interface': interfaces[0]})
+        self.napp.handle_interface_changed(event)
+        self.assertNotIn(interfaces[0].id, eligible)
+
+        interfaces[0].is_active.return_value = True
+        event = get_kytos_event_mock(name='kytos/topology.interface.enabled',
+                                     content={'interface': interfaces[0]})
+        self.napp.handle_admin_status_changed(event)
+        self.assertIn(interfaces[0].id, eligible)
+
+        switch.is_connected.return_value = False
+        event = get_kytos_event_mock(name='kytos/topology.switch.disabled',
+                                     content={'dpid': switch.dpid})
+        self.napp.handle_admin_status_changed(event)
+        self.assertNotIn(interfaces[0].id, eligible)
+
+    @patch('napps.kytos.of_lldp.main.LLDPFrameBuilder.build')
+    def test_execute_frame_cache(self, mock_build):
+        """Test execute only builds the LLDP frames once."""
+        interfaces = self.get_topology_interfaces()
+        self.napp.pacer = SendPacer(1)
+
+        self.napp.execute()
+        self.napp.execute()
+
+        self.assertEqual(mock_build.call_count, len(interfaces))
+        self.assertEqual(len(self.napp.frame_cache), len(interfaces))
+
+    @patch('napps.kytos.of_lldp.main.LLDPFrameBuilder.build')
+    def test_get_lldp_packet_out(self, mock_build):
+        """Test _get_lldp_packet_out invalidates stale frames."""
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        interface = switch.interfaces['00:00:00:00:00:00:00:01:1']
+
+        packet_out = self.napp._get_lldp_packet_out(switch, interface, 0x04)
+        self.assertEqual(packet_out, mock_build.return_value)
+        self.napp._get_lldp_packet_out(switch, interface, 0x04)
+        self.assertEqual(mock_build.call_count, 1)
+
+        interface.address = '00:00:00:00:00:01'
+        self.napp._get_lldp_packet_out(switch, interface, 0x04)
+        self.assertEqual(mock_build.call_count, 2)
+
+        self.napp.vlan_id = 10
+        self.napp._get_lldp_packet_out(switch, interface, 0x04)
+        self.assertEqual(mock_build.call_count, 3)
+
+        mock_build.return_value = None
+        packet_out = self.napp._get_lldp_packet_out(switch, interface, 0x05)
+        self.assertIsNone(packet_out)
+
+    @patch('napps.kytos.of_lldp.main.time.monotonic', return_value=5)
+    @patch('napps.kytos.of_lldp.main.FlowBatcher.remove')
+    @patch('napps.kytos.of_lldp.main.FlowBatcher.install')
+    def test_handle_lldp_flows(self, mock_install, mock_remove, *_):
         """Test handle_lldp_flow method."""
         dpid = "00:00:00:00:00:00:00:01"
         switch = get_switch_mock("00:00:00:00:00:00:00:01", 0x04)
+        switch.interfaces = {}
         self.napp.controller.switches = {dpid: switch}
         event_post = get_kytos_event_mock(name='kytos/topology.switch.enabled',
                                           content={'dpid': dpid})
@@ -75,92 +543,279 @@ class TestMain(TestCase):
         event_del = get_kytos_event_mock(name='kytos/topology.switch.disabled',
                                          content={'dpid': dpid})
 
+        flow = self.napp._build_lldp_flow(0x04)
+        self.napp.handle_lldp_flows(event_post)
+        mock_install.assert_called_with(switch.id, [flow], None)
+
+        event = get_kytos_event_mock(name='kytos/of_core.handshake.completed',
+                                     content={'switch': switch})
+        switch.is_enabled.return_value = False
+        self.napp.handle_switch_connected(event)
+        self.assertEqual(self.napp._connected_at, {switch.id: 5})
         self.napp.handle_lldp_flows(event_post)
-        mock_post.assert_called()
+        mock_install.assert_called_with(switch.id, [flow], 5)
+        self.assertEqual(self.napp._connected_at, {})
+
+        switch.is_enabled.return_value = True
+        mock_install.reset_mock()
+        self.napp.handle_switch_connected(event)
+        mock_install.assert_called_once_with(switch.id, [flow], 5)
 
         self.napp.handle_lldp_flows(event_del)
-        mock_delete.assert_called()
+        mock_remove.assert_called_with(switch.id, [flow])
 
     @patch('kytos.core.buffers.KytosEventBuffer.put')
     @patch('napps.kytos.of_lldp.main.KytosEvent')
-    @patch('kytos.core.controller.Controller.get_switch_by_dpid')
-    @patch('napps.kytos.of_lldp.main.Main._unpack_non_empty')
-    @patch('napps.kytos.of_lldp.main.UBInt32')
-    @patch('napps.kytos.of_lldp.main.DPID')
-    @patch('napps.kytos.of_lldp.main.LLDP')
-    @patch('napps.kytos.of_lldp.main.Ethernet')
     def test_notify_uplink_detected(self, *args):
         """Test notify_uplink_detected method."""
-        (mock_ethernet, mock_lldp, mock_dpid, mock_ubint32,
-         mock_unpack_non_empty, mock_get_switch_by_dpid, mock_kytos_event,
-         mock_buffer_put) = args
+        (mock_kytos_event, mock_buffer_put) = args
 
-        switch = get_switch_mock("00:00:00:00:00:00:00:01", 0x04)
+        switch_a = self.topology.switches['00:00:00:00:00:00:00:01']
+        switch_b = self.topology.switches['00:00:00:00:00:00:00:03']
         message = MagicMock()
         message.in_port = 1
-        message.data = 'data'
+        message.data = get_lldp_frame(switch_b.dpid, 2, 0x01, 3799)
         event = get_kytos_event_mock(name='kytos/of_core.v0x0[14].messages.in.'
                                           'ofpt_packet_in',
-                                     content={'source': switch.connection,
+                                     content={'source': switch_a.connection,
                                               'message': message})
-
-        ethernet = MagicMock()
-        ethernet.ether_type = 0x88CC
-        ethernet.data = 'eth_data'
-        lldp = MagicMock()
-        lldp.chassis_id.sub_value = 'chassis_id'
-        lldp.port_id.sub_value = 'port_id'
-        dpid = MagicMock()
-        dpid.value = "00:00:00:00:00:00:00:02"
-        port_b = MagicMock()
-
-        mock_unpack_non_empty.side_effect = [ethernet, lldp, dpid, port_b]
-        mock_get_switch_by_dpid.return_value = get_switch_mock(dpid.value,
-                                                               0x04)
         mock_kytos_event.return_value = 'nni'
 
         self.napp.notify_uplink_detected(event)
 
-        calls = [call(mock_ethernet, message.data),
-                 call(mock_lldp, ethernet.data),
-                 call(mock_dpid, lldp.chassis_id.sub_value),
-                 call(mock_ubint32, lldp.port_id.sub_value)]
-        mock_unpack_non_empty.assert_has_calls(calls)
+        switch_a.get_interface_by_port_no.assert_not_called()
+        switch_b.get_interface_by_port_no.assert_not_called()
+        content = {
+            'interface_a': switch_a.interfaces['00:00:00:00:00:00:00:01:1'],
+            'interface_b': switch_b.interfaces['00:00:00:00:00:00:00:03:2']}
+        mock_kytos_event.assert_called_with(
+            name='kytos/of_lldp.interface.is.nni', content=content)
         mock_buffer_put.assert_called_with('nni')
+        self.assertEqual(len(self.napp.link_tracker), 1)
 
-    @patch('napps.kytos.of_lldp.main.PO13')
-    @patch('napps.kytos.of_lldp.main.PO10')
-    @patch('napps.kytos.of_lldp.main.AO13')
-    @patch('napps.kytos.of_lldp.main.AO10')
-    def test_build_lldp_packet_out(self, *args):
-        """Test _build_lldp_packet_out method."""
-        (mock_ao10, mock_ao13, mock_po10, mock_po13) = args
+        self.napp.notify_uplink_detected(event)
+        self.assertEqual(mock_buffer_put.call_count, 1)
+        self.assertEqual(self.napp.nni_counter.value, 1)
+        self.assertEqual(self.napp.nni_suppressed_counter.value, 1)
 
-        ao10 = MagicMock()
-        ao13 = MagicMock()
-        po10 = MagicMock()
-        po10.actions = []
-        po13 = MagicMock()
-        po13.actions = []
+    @patch('kytos.core.buffers.KytosEventBuffer.put')
+    def test_notify_uplink_detected_discarded(self, mock_buffer_put):
+        """Test notify_uplink_detected ignores foreign and unknown LLDPs."""
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        message = MagicMock()
+        message.in_port = 1
+        event = get_kytos_event_mock(name='kytos/of_core.v0x04.messages.in.'
+                                          'ofpt_packet_in',
+                                     content={'source': switch.connection,
+                                              'message': message})
 
-        mock_ao10.return_value = ao10
-        mock_ao13.return_value = ao13
-        mock_po10.return_value = po10
-        mock_po13.return_value = po13
+        message.data = get_lldp_frame('00:00:00:00:00:00:00:04', 1)
+        self.napp.notify_uplink_detected(event)
 
-        packet_out10 = self.napp._build_lldp_packet_out(0x01, 1, 'data1')
-        packet_out13 = self.napp._build_lldp_packet_out(0x04, 2, 'data2')
-        packet_out14 = self.napp._build_lldp_packet_out(0x05, 3, 'data3')
+        message.data = get_lldp_frame('00:00:00:00:00:00:00:02', 1)[:-8]
+        self.napp.notify_uplink_detected(event)
 
-        self.assertEqual(packet_out10.data, 'data1')
-        self.assertEqual(packet_out10.actions, [ao10])
-        self.assertEqual(packet_out10.actions[0].port, 1)
+        message.data = get_lldp_frame('00:00:00:00:00:00:00:02', 1)
+        message.data = message.data[:14] + b'\x02\x07\x04' + message.data[17:]
+        self.napp.notify_uplink_detected(event)
 
-        self.assertEqual(packet_out13.data, 'data2')
-        self.assertEqual(packet_out13.actions, [ao13])
-        self.assertEqual(packet_out13.actions[0].port, 2)
+        mock_buffer_put.assert_not_called()
+        self.assertEqual(self.napp.lldp_rejected_counter.value, 1)
+        self.assertEqual(self.napp.lldp_malformed_counter.value, 1)
+        self.assertEqual(self.napp.unknown_dpid_counter.value, 1)
 
-        self.assertIsNone(packet_out14)
+    @patch('kytos.core.buffers.KytosEventBuffer.put')
+    @patch('napps.kytos.of_lldp.main.KytosEvent')
+    def test_notify_expired_links(self, *args):
+        """Test a link down event is dispatched for the expired links."""
+        (mock_kytos_event, mock_buffer_put) = args
+        link = self.topology.links['1']
+        self.napp.link_tracker.seen(link.endpoint_a, link.endpoint_b, now=0)
+
+        self.napp.notify_expired_links()
+
+        mock_kytos_event.assert_called_with(
+            name='kytos/of_lldp.link.down',
+            content={'interface_a': link.endpoint_a,
+                     'interface_b': link.endpoint_b})
+        mock_buffer_put.assert_called_with(mock_kytos_event.return_value)
+        self.assertEqual(len(self.napp.link_tracker), 0)
+
+    def test_get_interface(self):
+        """Test _get_interface falls back to the controller switches."""
+        switch = self.topology.switches['00:00:00:00:00:00:00:01']
+        interface = switch.interfaces['00:00:00:00:00:00:00:01:1']
+        self.napp.interface_index.remove_interface(interface)
+        switch.get_interface_by_port_no.return_value = interface
+
+        self.assertIs(self.napp._get_interface(switch.dpid, 1), interface)
+        self.assertIs(self.napp._get_interface(switch.dpid, 1), interface)
+        switch.get_interface_by_port_no.assert_called_once_with(1)
+
+        self.assertIsNone(self.napp._get_interface('00:00:00:00:00:00:00:04',
+                                                   1))
+        switch.get_interface_by_port_no.return_value = None
+        self.assertIsNone(self.napp._get_interface(switch.dpid, 3))
+
+    def test_handle_index_events(self):
+        """Test the interface index is updated from switch events."""
+        switch = get_switch_mock('00:00:00:00:00:00:00:04', 0x01)
+        interface = get_interface_mock('s4-eth1', 1, switch)
+        switch.interfaces = {interface.id: interface}
+        event = get_kytos_event_mock(name='kytos/of_core.handshake.completed',
+                                     content={'switch': switch})
+
+        self.napp.handle_switch_connected(event)
+        self.assertEqual(self.napp.interface_index.get(switch.dpid, 1),
+                         (interface, 0x01))
+
+        interface_2 = get_interface_mock('s4-eth2', 2, switch)
+        event = get_kytos_event_mock(
+            name='kytos/of_core.switch.interface.created',
+            content={'interface': interface_2})
+        self.napp.handle_interface_changed(event)
+        self.assertEqual(self.napp.interface_index.get(switch.dpid, 2),
+                         (interface_2, 0x01))
+
+        event.name = 'kytos/of_core.switch.interface.deleted'
+        self.napp.handle_interface_changed(event)
+        self.assertIsNone(self.napp.interface_index.get(switch.dpid, 2))
+
+    def test_frame_cache_discard(self):
+        """Test the cached PacketOuts and sequences of removed ports go."""
+        interfaces = self.get_topology_interfaces()
+        switch = interfaces[0].switch
+        for interface in switch.interfaces.values():
+            self.napp._get_lldp_packet_out(switch, interface, 0x04)
+        cache = self.napp.frame_cache
+        self.assertEqual(len(cache), len(switch.interfaces))
+
+        self.napp._sequences[interfaces[0].id] = 7
+        event = get_kytos_event_mock(
+            name='kytos/of_core.switch.interface.deleted',
+            content={'interface': interfaces[0]})
+        self.napp.handle_interface_changed(event)
+        self.assertEqual(len(cache), len(switch.interfaces) - 1)
+        self.assertNotIn(interfaces[0].id, self.napp._sequences)
+
+        event = get_kytos_event_mock(
+            name='kytos/core.openflow.connection.lost',
+            content={'source': MagicMock(switch=switch)})
+        self.napp.handle_connection_lost(event)
+        self.assertEqual(len(cache), 0)
+
+    def test_link_down_forgets_link(self):
+        """Test the link of an interface down or deleted is forgotten."""
+        interfaces = self.get_topology_interfaces()
+        tracker = self.napp.link_tracker
+        for name in ('link_down', 'deleted'):
+            tracker.seen(interfaces[0], interfaces[2])
+            event = get_kytos_event_mock(
+                name=f'kytos/of_core.switch.interface.{name}',
+                content={'interface': interfaces[2]})
+            self.napp.handle_interface_changed(event)
+            self.assertIsNone(tracker.get(interfaces[0], interfaces[2]))
+
+    @patch('napps.kytos.of_lldp.main.decode_lldp')
+    def test_notify_uplink_detected_not_lldp(self, mock_decode_lldp):
+        """Test notify_uplink_detected discards other ethertypes early."""
+        switch = get_switch_mock("00:00:00:00:00:00:00:01", 0x04)
+        message = MagicMock()
+        message.data.value = bytes(12) + b'\x08\x06'
+        event = get_kytos_event_mock(name='kytos/of_core.v0x04.messages.in.'
+                                          'ofpt_packet_in',
+                                     content={'source': switch.connection,
+                                              'message': message})
+
+        self.napp.notify_uplink_detected(event)
+
+        mock_decode_lldp.assert_not_called()
+        self.assertEqual(self.napp.packet_in_counter.value, 1)
+        self.assertEqual(self.napp.not_lldp_counter.value, 1)
+
+    @patch('napps.kytos.of_lldp.builder.monotonic_ns')
+    @patch('napps.kytos.of_lldp.main.monotonic_ns')
+    @patch('kytos.core.buffers.KytosEventBuffer.put')
+    def test_probe_latency(self, *args):
+        """Test the probes are stamped and their round-trip time recorded."""
+        (mock_buffer_put, mock_monotonic_ns, mock_pack_ns) = args
+        self.napp.frame_builder = LLDPFrameBuilder(probe=True)
+        switch_a = self.topology.switches['00:00:00:00:00:00:00:01']
+        switch_b = self.topology.switches['00:00:00:00:00:00:00:02']
+        interface_a = switch_a.interfaces['00:00:00:00:00:00:00:01:1']
+        interface_b = switch_b.interfaces['00:00:00:00:00:00:00:02:1']
+        self.napp._send_lldp_packet_out(switch_b, interface_b, 0x04)
+        self.napp._send_lldp_packet_out(switch_b, interface_b, 0x04)
+
+        # The send time is the time kytos.core packs the message.
+        mock_pack_ns.return_value = 1000
+        sent = mock_buffer_put.call_args[0][0].content['message'].pack()
+        self.assertEqual(decode_probe(sent[40:])[2:], (1000, 2))
+        cached = self.napp.frame_cache.get(switch_b.dpid, 1,
+                                           interface_b.address,
+                                           self.napp.vlan_id, 0x04)
+        self.assertEqual(decode_probe(cached.pack()[40:])[2:], (0, 0))
+
+        mock_monotonic_ns.return_value = 2000000
+        message = MagicMock(in_port=1, data=sent[40:])
+        event = get_kytos_event_mock(name='kytos/of_core.v0x04.messages.in.'
+                                     'ofpt_packet_in',
+                                     content={'source': switch_a.connection,
+                                              'message': message})
+        self.napp.notify_uplink_detected(event)
+
+        content = mock_buffer_put.call_args[0][0].content
+        self.assertEqual(content['latency']['last'], 0.001999)
+        self.assertEqual(content['latency']['count'], 1)
+
+        api = get_test_client(self.napp.controller, self.napp)
+        url = f'{self.server_name_url}/v1/links/latency'
+        response = api.open(url, method='GET')
+        link = self.napp.link_tracker.get(interface_a, interface_b)
+        self.assertEqual(response.json, {'links': {link.id: {
+            'interface_a': interface_a.id, 'interface_b': interface_b.id,
+            'latency': content['latency']}}})
+
+        url = f'{self.server_name_url}/v1/links/{link.id}/stats'
+        response = api.open(url, method='GET')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['latency'], content['latency'])
+        probes = response.json['probes'][interface_b.id]
+        self.assertEqual((probes['sent'], probes['received'],
+                          probes['last_sequence']), (1, 1, 2))
+
+        # The probes sent after the last one received are lost so far.
+        self.napp._send_lldp_packet_out(switch_b, interface_b, 0x04)
+        response = api.open(url, method='GET')
+        probes = response.json['probes'][interface_b.id]
+        self.assertEqual((probes['sent'], probes['received'],
+                          probes['loss']), (2, 1, 0.5))
+
+        url = f'{self.server_name_url}/v1/links/unknown/stats'
+        response = api.open(url, method='GET')
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_metrics(self):
+        """Test get_metrics method."""
+        self.napp.packet_in_counter.inc(3)
+        api = get_test_client(self.napp.controller, self.napp)
+        url = f'{self.server_name_url}/v1/metrics'
+
+        response = api.open(url, method='GET')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertIn('# TYPE of_lldp_packet_in_total counter', lines)
+        self.assertIn('of_lldp_packet_in_total 3', lines)
+        self.assertIn('of_lldp_execute_seconds_count 0', lines)
+
+        response = api.open(url, method='GET',
+                            headers={'Accept': 'application/json'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['of_lldp_packet_in_total'], 3)
+        self.assertEqual(response.json['of_lldp_packet_in_not_lldp_total'], 0)
 
     @patch('napps.kytos.of_lldp.main.settings')
     @patch('napps.kytos.of_lldp.main.EtherType')
@@ -201,56 +856,6 @@ class TestMain(TestCase):
         self.assertDictEqual(flow_mod10, expected_flow_v0x01)
         self.assertDictEqual(flow_mod13, expected_flow_v0x04)
 
-    def test_unpack_non_empty(self):
-        """Test _unpack_non_empty method."""
-        desired_class = MagicMock()
-        data = MagicMock()
-        data.value = 'data'
-
-        obj = self.napp._unpack_non_empty(desired_class, data)
-
-        obj.unpack.assert_called_with('data')
-
-    def test_get_data(self):
-        """Test _get_data method."""
-        req = MagicMock()
-        interfaces = ['00:00:00:00:00:00:00:01:1', '00:00:00:00:00:00:00:01:2']
-        req.get_json.return_value = {'interfaces': interfaces}
-
-        data = self.napp._get_data(req)
-
-        self.assertEqual(data, interfaces)
-
-    def test_get_interfaces(self):
-        """Test _get_interfaces method."""
-        expected_interfaces = self.get_topology_interfaces()
-
-        interfaces = self.napp._get_interfaces()
-
-        self.assertEqual(interfaces, expected_interfaces)
-
-    def test_get_interfaces_dict(self):
-        """Test _get_interfaces_dict method."""
-        interfaces = self.napp._get_interfaces()
-        expected_interfaces = {inter.id: inter for inter in interfaces}
-
-        interfaces_dict = self.napp._get_interfaces_dict(interfaces)
-
-        self.assertEqual(interfaces_dict, expected_interfaces)
-
-    def test_get_lldp_interfaces(self):
-        """Test _get_lldp_interfaces method."""
-        lldp_interfaces = self.napp._get_lldp_interfaces()
-
-        expected_interfaces = ['00:00:00:00:00:00:00:01:1',
-                               '00:00:00:00:00:00:00:01:2',
-                               '00:00:00:00:00:00:00:02:1',
-                               '00:00:00:00:00:00:00:02:2',
-                               '00:00:00:00:00:00:00:03:1',
-                               '00:00:00:00:00:00:00:03:2']
-
-        self.assertEqual(lldp_interfaces, expected_interfaces)
-
     def test_rest_get_lldp_interfaces(self):
         """Test get_lldp_interfaces method."""
         api = get_test_client(self.napp.controller, self.napp)
@@ -266,6 +871,36 @@ class TestMain(TestCase):
         self.assertEqual(response.json, expected_data)
         self.assertEqual(response.status_code, 200)
 
+    def test_rest_get_lldp_interfaces_page(self):
+        """Test get_lldp_interfaces pages, filters and ETag."""
+        api = get_test_client(self.napp.controller, self.napp)
+        url = f'{self.server_name_url}/v1/interfaces'
+        response = api.open(f'{url}?dpid=00:00:00:00:00:00:00:02&limit=1',
+                            method='GET')
+        self.assertEqual(response.json,
+                         {'interfaces': ['00:00:00:00:00:00:00:02:1'],
+                          'next': '00:00:00:00:00:00:00:02:1'})
+        etag = response.headers['ETag']
+
+        response = api.open(url, method='GET',
+                            headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        api.open(f'{url}/disable', method='POST',
+                 json={'interfaces': ['00:00:00:00:00:00:00:01:1']})
+        response = api.open(f'{url}?lldp=disabled', method='GET',
+                            headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json,
+                         {'interfaces': ['00:00:00:00:00:00:00:01:1']})
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+        response = api.open(f'{url}?limit=none', method='GET')
+        self.assertEqual(response.status_code, 400)
+        response = api.open(f'{url}?lldp=unknown', method='GET')
+        self.assertEqual(response.status_code, 400)
+
     def test_enable_disable_lldp_200(self):
         """Test 200 response for enable_lldp and disable_lldp methods."""
         data = {"interfaces": ['00:00:00:00:00:00:00:01:1',
@@ -279,13 +914,54 @@ class TestMain(TestCase):
 
         url = f'{self.server_name_url}/v1/interfaces/disable'
         disable_response = api.open(url, method='POST', json=data)
+        self.assertEqual(len(self.napp.eligible_interfaces), 0)
 
         url = f'{self.server_name_url}/v1/interfaces/enable'
         enable_response = api.open(url, method='POST', json=data)
+        self.assertEqual(len(self.napp.eligible_interfaces), 6)
 
         self.assertEqual(disable_response.status_code, 200)
         self.assertEqual(enable_response.status_code, 200)
 
+    @patch('napps.kytos.of_lldp.main.Main.notify_lldp_change')
+    def test_enable_disable_lldp_bulk(self, mock_notify):
+        """Test LLDP is changed by switch, pattern, regex or for all."""
+        api = get_test_client(self.napp.controller, self.napp)
+        url = f'{self.server_name_url}/v1/interfaces'
+
+        data = {'switches': ['00:00:00:00:00:00:00:01'],
+                'pattern': '*:02:1', 'regex': '.*:03:[2-9]'}
+        response = api.open(f'{url}/disable', method='POST', json=data)
+        self.assertEqual(response.status_code, 200)
+        mock_notify.assert_called_once_with(
+            'disabled', ['00:00:00:00:00:00:00:01:1',
+                         '00:00:00:00:00:00:00:01:2',
+                         '00:00:00:00:00:00:00:02:1',
+                         '00:00:00:00:00:00:00:03:2'])
+        self.assertEqual(len(self.napp.eligible_interfaces), 2)
+
+        response = api.open(f'{url}/enable', method='POST',
+                            json={'all': True})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mock_notify.call_args[0][1]), 6)
+        self.assertEqual(len(self.napp.eligible_interfaces), 6)
+
+        data = {'switches': ['00:00:00:00:00:00:00:04'], 'regex': '(.*'}
+        response = api.open(f'{url}/enable', method='POST', json=data)
+        self.assertEqual(response.status_code, 400)
+        del data['regex']
+        response = api.open(f'{url}/enable', method='POST', json=data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(mock_notify.call_count, 2)
+
+        # Selectors that match nothing are reported, the others applied.
+        data = {'pattern': '*:9', 'regex': '.*:01:1'}
+        response = api.open(f'{url}/disable', method='POST', json=data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json.values()), [['*:9']])
+        mock_notify.assert_called_with('disabled',
+                                       ['00:00:00:00:00:00:00:01:1'])
+
     def test_enable_disable_lldp_404(self):
         """Test 404 response for enable_lldp and disable_lldp methods."""
         data = {"interfaces": []}
@@ -323,6 +999,26 @@ class TestMain(TestCase):
         self.assertEqual(disable_response.status_code, 400)
         self.assertEqual(enable_response.status_code, 400)
 
+    def test_tracing(self):
+        """Test the tracing options are read and set at runtime."""
+        api = get_test_client(self.napp.controller, self.napp)
+        url = f'{self.server_name_url}/v1/tracing'
+
+        response = api.open(url, method='POST',
+                            json={'sample_rate': 0.5, 'summary': False})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.napp.tracer.sampling)
+        self.assertFalse(self.napp.tracer.summary)
+        response = api.open(url, method='GET')
+        self.assertEqual(response.json, {'sample_rate': 0.5,
+                                         'summary': False})
+
+        for payload in ({'sample_rate': 2}, {'sample_rate': 'all'},
+                        {'summary': 'yes'}, [0.5]):
+            response = api.open(url, method='POST', json=payload)
+            self.assertEqual(response.status_code, 400)
+
     def test_get_time(self):
         """Test get polling time."""
         api = get_test_client(self.napp.controller, self.napp)
@@ -343,6 +1039,7 @@ class TestMain(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(self.napp.polling_time, data['polling_time'])
+        self.assertEqual(self.napp.link_tracker.timeout, 15)
 
     def test_set_time_400(self):
         """Test fail case the update polling time."""
@@ -0,0 +1,54 @@
+"""Test the NApp metrics."""
+from unittest import TestCase
+
+from napps.kytos.of_lldp.metrics import Metrics
+
+
+class TestMetrics(TestCase):
+    """Tests for the Metrics class."""
+
+    def test_counter(self):
+        """Test counters are registered once and incremented."""
+        metrics = Metrics()
+        counter = metrics.counter('packets_total', 'Packets.')
+
+        counter.inc()
+        counter.inc(2)
+
+        self.assertIs(metrics.counter('packets_total', 'Packets.'), counter)
+        self.assertEqual(metrics.as_dict(), {'packets_total': 3})
+
+    def test_histogram(self):
+        """Test histograms count the values in cumulative buckets."""
+        metrics = Metrics()
+        histogram = metrics.histogram('latency_seconds', 'Latency.',
+                                      (0.1, 1))
+
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+
+        self.assertIs(metrics.histogram('latency_seconds', 'Latency.'),
+                      histogram)
+        self.assertEqual(metrics.as_dict()['latency_seconds'],
+                         {'count': 4, 'sum': 2.65,
+                          'buckets': {'0.1': 2, '1': 3, '+Inf': 4}})
+
+    def test_as_text(self):
+        """Test the metrics are written in the Prometheus text format."""
+        metrics = Metrics()
+        metrics.counter('packets_total', 'Packets\nreceived.').inc(3)
+        histogram = metrics.histogram('latency_seconds', 'Latency.', (0.1, 1))
+        histogram.observe(0.5)
+        histogram.observe(2)
+
+        self.assertEqual(metrics.as_text(),
+                         '# HELP packets_total Packets\\nreceived.\n'
+                         '# TYPE packets_total counter\n'
+                         'packets_total 3\n'
+                         '# HELP latency_seconds Latency.\n'
+                         '# TYPE latency_seconds histogram\n'
+                         'latency_seconds_bucket{le="0.1"} 0\n'
+                         'latency_seconds_bucket{le="1"} 1\n'
+                         'latency_seconds_bucket{le="+Inf"} 2\n'
+                         'latency_seconds_sum 2.5\n'
+                         'latency_seconds_count 2\n')
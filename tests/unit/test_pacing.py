@@ -0,0 +1,90 @@
+"""Test the LLDP PacketOut pacing."""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from napps.kytos.of_lldp.pacing import DPID_HASH, SendPacer
+
+
+class TestSendPacer(TestCase):
+    """Tests for the SendPacer class."""
+
+    def setUp(self):
+        """Execute steps before each tests."""
+        self.switches = []
+        self.targets = []
+        for index in range(4):
+            switch = MagicMock()
+            switch.dpid = f'00:00:00:00:00:00:00:0{index + 1}'
+            self.switches.append(switch)
+            for port in range(5):
+                self.targets.append((switch, port, 0x04))
+        self.get_targets = MagicMock(return_value=self.targets)
+
+    def test_invalid_arguments(self):
+        """Test the number of slots and mode are validated."""
+        with self.assertRaises(ValueError):
+            SendPacer(0)
+        with self.assertRaises(ValueError):
+            SendPacer(2, 'random')
+        with self.assertRaises(ValueError):
+            SendPacer(2, max_batch=0)
+
+    def test_interval(self):
+        """Test the interval between executions."""
+        self.assertEqual(SendPacer(1).interval(3), 3)
+        self.assertEqual(SendPacer(10).interval(3), 0.3)
+        self.assertEqual(SendPacer(10).round_time(3), 3)
+
+    def test_burst(self):
+        """Test a single slot sends every target at once."""
+        pacer = SendPacer(1)
+
+        self.assertEqual(pacer.next_batch(self.get_targets), self.targets)
+        self.assertEqual(pacer.next_batch(self.get_targets), self.targets)
+        self.assertEqual(self.get_targets.call_count, 2)
+
+    def test_even(self):
+        """Test the targets are spread evenly, once per round."""
+        pacer = SendPacer(3)
+
+        batches = [pacer.next_batch(self.get_targets) for _ in range(3)]
+
+        self.assertEqual(self.get_targets.call_count, 1)
+        self.assertEqual([len(batch) for batch in batches], [7, 7, 6])
+        self.assertCountEqual(sum(batches, []), self.targets)
+
+        pacer.next_batch(self.get_targets)
+        self.assertEqual(self.get_targets.call_count, 2)
+
+    def test_dpid_hash(self):
+        """Test all the targets of a switch are sent in the same slot."""
+        pacer = SendPacer(3, DPID_HASH)
+
+        batches = [pacer.next_batch(self.get_targets) for _ in range(3)]
+
+        self.assertCountEqual(sum(batches, []), self.targets)
+        for batch in batches:
+            self.assertEqual(len(batch) % 5, 0)
+
+    def test_max_batch_spill(self):
+        """Test the targets over the maximum batch go to the next slots."""
+        pacer = SendPacer(3, DPID_HASH, max_batch=8)
+
+        batches = [pacer.next_batch(self.get_targets) for _ in range(3)]
+
+        self.assertCountEqual(sum(batches, []), self.targets)
+        self.assertEqual(max(len(batch) for batch in batches), 8)
+
+    def test_max_batch_extra_slots(self):
+        """Test the round gets extra slots if every slot is full."""
+        pacer = SendPacer(3, max_batch=4)
+
+        batches = [pacer.next_batch(self.get_targets) for _ in range(5)]
+
+        self.assertEqual(self.get_targets.call_count, 1)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 4, 4, 4])
+        self.assertEqual(pacer.round_time(3), 5)
+        self.assertCountEqual(sum(batches, []), self.targets)
+
+        pacer.next_batch(self.get_targets)
+        self.assertEqual(self.get_targets.call_count, 2)
@@ -0,0 +1,46 @@
+"""Test the LLDP state kept across restarts."""
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from napps.kytos.of_lldp.persistence import StateStore, open_store
+
+
+class TestStateStore(TestCase):
+    """Tests for the StateStore class."""
+
+    def setUp(self):
+        """Create a store in a temporary folder."""
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = Path(folder.name) / 'of_lldp.sqlite3'
+        self.store = StateStore(self.path)
+        self.addCleanup(self.store.close)
+
+    def test_load_empty(self):
+        """Test a new file has no state."""
+        state = self.store.load()
+        self.assertEqual(state.lldp, {})
+        self.assertEqual(state.settings, {})
+        self.assertEqual(state.links, [])
+
+    def test_save_load(self):
+        """Test the state saved is loaded from the file."""
+        self.store.save_lldp(['00:01:1', '00:01:2'], False)
+        self.store.save_lldp(['00:01:2'], True)
+        self.store.save_setting('polling_time', 5)
+        self.store.save_links({('00:01:1', '00:02:1')})
+        self.store.save_links({('00:01:2', '00:02:2')})
+        self.store.close()
+
+        store, state = open_store(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual(state.lldp, {'00:01:1': False, '00:01:2': True})
+        self.assertEqual(state.settings, {'polling_time': 5})
+        self.assertEqual(state.links, [('00:01:2', '00:02:2')])
+
+    def test_open_store_error(self):
+        """Test a file that cannot be opened has no store."""
+        store, state = open_store(self.path.parent)
+        self.assertIsNone(store)
+        self.assertEqual(state.links, [])
@@ -0,0 +1,32 @@
+"""Test the on demand profiling."""
+from unittest import TestCase
+
+from napps.kytos.of_lldp.profiling import NOT_PROFILING, Profiler
+
+
+class TestProfiler(TestCase):
+    """Tests for the Profiler class."""
+
+    def test_profile(self):
+        """Test the stats of the next cycles and other blocks are added."""
+        profiler = Profiler()
+        self.assertIs(profiler.profile(), NOT_PROFILING)
+        self.assertIsNone(profiler.report())
+        with self.assertRaises(ValueError):
+            profiler.start(0)
+
+        profiler.start(2)
+        for _ in range(3):
+            with profiler.profile():
+                sorted(range(10))
+            with profiler.profile(cycle=True):
+                sum(range(10))
+
+        self.assertEqual(profiler.as_dict()['cycles'], 2)
+        self.assertEqual(profiler.remaining, 0)
+        self.assertIs(profiler.profile(cycle=True), NOT_PROFILING)
+        report = profiler.report('calls', 10)
+        self.assertIn('sorted', report)
+        self.assertIn('sum', report)
+        with self.assertRaises(KeyError):
+            profiler.report('unknown')
@@ -0,0 +1,86 @@
+"""Test the token bucket rate limiting."""
+from unittest import TestCase
+
+from napps.kytos.of_lldp.ratelimit import (GlobalRateLimiter, RateLimiter,
+                                           TokenBucket)
+
+
+class TestTokenBucket(TestCase):
+    """Tests for the TokenBucket class."""
+
+    def test_consume(self):
+        """Test tokens are taken up to the capacity and refilled."""
+        bucket = TokenBucket(rate=2, capacity=3, now=0)
+
+        self.assertEqual([bucket.consume(now=0) for _ in range(4)],
+                         [True, True, True, False])
+        self.assertTrue(bucket.consume(now=0.5))
+        self.assertFalse(bucket.consume(now=0.5))
+        self.assertFalse(bucket.consume(tokens=4, now=100))
+        self.assertEqual(bucket.tokens, 3)
+
+
+class TestRateLimiter(TestCase):
+    """Tests for the RateLimiter class."""
+
+    def test_invalid(self):
+        """Test the rate and the burst must be positive."""
+        with self.assertRaises(ValueError):
+            RateLimiter(0, 1)
+        with self.assertRaises(ValueError):
+            RateLimiter(1, 0)
+
+    def test_allow(self):
+        """Test each key has its own bucket."""
+        limiter = RateLimiter(rate=1, burst=1)
+
+        self.assertTrue(limiter.allow('00:01', now=0))
+        self.assertFalse(limiter.allow('00:01', now=0))
+        self.assertTrue(limiter.allow('00:02', now=0))
+        self.assertTrue(limiter.allow('00:01', now=1))
+        self.assertEqual(len(limiter), 2)
+        self.assertTrue(limiter.check('00:01', now=2))
+        self.assertTrue(limiter.check('00:01', now=2))
+        self.assertTrue(limiter.allow('00:01', now=2))
+        self.assertFalse(limiter.check('00:01', now=2))
+
+        limiter.remove('00:01')
+        self.assertEqual(len(limiter), 1)
+
+
+class TestGlobalRateLimiter(TestCase):
+    """Tests for the GlobalRateLimiter class."""
+
+    def test_invalid(self):
+        """Test the rates and the bursts must be positive."""
+        with self.assertRaises(ValueError):
+            GlobalRateLimiter(0, 1)
+        with self.assertRaises(ValueError):
+            GlobalRateLimiter(1, None)
+        with self.assertRaises(ValueError):
+            GlobalRateLimiter(key_rate=1, key_burst=0)
+
+    def test_allow(self):
+        """Test both the global and the key limits apply."""
+        limiter = GlobalRateLimiter(rate=3, burst=3, key_rate=1, key_burst=2)
+
+        self.assertEqual([limiter.allow('00:01', now=0) for _ in range(3)],
+                         [True, True, False])
+        self.assertTrue(limiter.allow('00:02', now=0))
+        # The global bucket is empty, and no token of 00:03 is taken.
+        self.assertFalse(limiter.allow('00:03', now=0))
+        self.assertTrue(limiter.allow('00:03', now=1))
+        self.assertTrue(limiter.allow('00:03', now=1))
+        self.assertEqual(len(limiter), 3)
+
+        limiter.remove('00:01')
+        self.assertEqual(len(limiter), 2)
+
+    def test_no_limits(self):
+        """Test either limit can be turned off."""
+        self.assertTrue(all(GlobalRateLimiter().allow('00:01', now=0)
+                            for _ in range(100)))
+        limiter = GlobalRateLimiter(rate=1, burst=1)
+        self.assertTrue(limiter.allow('00:01', now=0))
+        self.assertFalse(limiter.allow('00:02', now=0))
+        self.assertEqual(len(limiter), 0)
@@ -0,0 +1,37 @@
+"""Test the tracing of the LLDP PacketOuts."""
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from napps.kytos.of_lldp.tracing import Tracer
+
+
+@patch('napps.kytos.of_lldp.tracing.log')
+class TestTracer(TestCase):
+    """Tests for the Tracer class."""
+
+    def test_sample_rate(self, mock_log):
+        """Test one of every 1 / sample_rate PacketOuts is logged."""
+        tracer = Tracer(0.25)
+        self.assertTrue(tracer.sampling)
+
+        for _ in range(8):
+            tracer.packet_out(MagicMock(), MagicMock(), None, 1)
+
+        self.assertEqual(mock_log.info.call_count, 2)
+
+        tracer.set_sample_rate(0)
+        self.assertFalse(tracer.sampling)
+        with self.assertRaises(ValueError):
+            tracer.set_sample_rate(1.5)
+        self.assertEqual(tracer.as_dict(), {'sample_rate': 0,
+                                            'summary': True})
+
+    def test_cycle(self, mock_log):
+        """Test the summary of each polling loop can be turned off."""
+        tracer = Tracer()
+        tracer.cycle(10, 9, 0.01)
+        self.assertEqual(mock_log.debug.call_count, 1)
+
+        tracer.summary = False
+        tracer.cycle(10, 9, 0.01)
+        self.assertEqual(mock_log.debug.call_count, 1)
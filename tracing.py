@@ -0,0 +1,68 @@
+"""Low overhead tracing of the LLDP PacketOuts sent by the NApp."""
+from kytos.core import log
+
+
+class Tracer:
+    """Log a summary of each polling loop and a sample of the PacketOuts.
+
+    The summary is a single debug message per execution of the polling loop.
+    Sampled PacketOuts are logged at the info level, so they are shown
+    without enabling debug logging. The callers check :attr:`sampling`
+    before calling :meth:`packet_out`, so with sampling off each PacketOut
+    only costs that attribute check.
+    """
+
+    def __init__(self, sample_rate=0.0, summary=True):
+        """Create a tracer.
+
+        Args:
+            sample_rate (float): Fraction of the PacketOuts to be logged,
+                from 0 (none) to 1 (all).
+            summary (bool): Whether to log a summary of each polling loop.
+
+        Raises:
+            ValueError: If the sample rate is invalid.
+
+        """
+        self.summary = summary
+        self.sample_rate = 0.0
+        #: Whether any PacketOut is to be logged.
+        self.sampling = False
+        self._every = 0
+        self._count = 0
+        self.set_sample_rate(sample_rate)
+
+    def set_sample_rate(self, sample_rate):
+        """Log one of every ``1 / sample_rate`` PacketOuts.
+
+        Raises:
+            ValueError: If the sample rate is not between 0 and 1.
+
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f'invalid sample rate {sample_rate}, '
+                             'must be between 0 and 1')
+        self.sample_rate = sample_rate
+        self._every = round(1 / sample_rate) if sample_rate else 0
+        self._count = 0
+        self.sampling = bool(self._every)
+
+    def cycle(self, targets, sent, duration):
+        """Log the summary of an execution of the polling loop."""
+        if self.summary:
+            log.debug('LLDP polling loop sent %s PacketOuts to %s interfaces '
+                      'in %.6f seconds.', sent, targets, duration)
+
+    def packet_out(self, switch, interface, vlan_id, sequence=None):
+        """Log a PacketOut, if it is sampled."""
+        self._count += 1
+        if self._count < self._every:
+            return
+        self._count = 0
+        log.info('LLDP PacketOut to switch %s (%s) port %s: src %s, vlan %s, '
+                 'sequence %s', switch.dpid, switch.connection.address,
+                 interface.port_number, interface.address, vlan_id, sequence)
+
+    def as_dict(self):
+        """Return the tracing options."""
+        return {'sample_rate': self.sample_rate, 'summary': self.summary}